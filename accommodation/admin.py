@@ -27,25 +27,25 @@ class ExternalSourceInline(admin.TabularInline):
 
 @admin.action(description=gettext_lazy("Unpublish selected accommodations"))
 def unpublish_accommodations(modeladmin, request, queryset):
-    updated_count = queryset.update(published=False)
+    updated_count = queryset.update(published=False, touch=True)
     modeladmin.message_user(request, f"{updated_count} accommodation(s) have been unpublished.")
 
 
 @admin.action(description=gettext_lazy("Publish selected accommodations"))
 def publish_accommodations(modeladmin, request, queryset):
-    updated_count = queryset.update(published=True)
+    updated_count = queryset.update(published=True, touch=True)
     modeladmin.message_user(request, f"{updated_count} accommodation(s) have been published.")
 
 
 @admin.action(description=gettext_lazy("Make unavailable selected accommodations"))
 def unavailable_accommodations(modeladmin, request, queryset):
-    updated_count = queryset.update(available=False)
+    updated_count = queryset.update(available=False, touch=True)
     modeladmin.message_user(request, f"{updated_count} accommodation(s) have been made unavailable.")
 
 
 @admin.action(description=gettext_lazy("Make available selected accommodations"))
 def available_accommodations(modeladmin, request, queryset):
-    updated_count = queryset.update(available=True)
+    updated_count = queryset.update(available=True, touch=True)
     modeladmin.message_user(request, f"{updated_count} accommodation(s) have been made available.")
 
 
@@ -0,0 +1,32 @@
+from django.contrib.gis.db.models import Collect
+from django.contrib.gis.db.models.functions import Centroid, SnapToGrid
+from django.db.models import Count, Min
+
+# grid cells per 256px map tile width, i.e. one cluster per 64px square at most
+CLUSTER_CELLS_PER_TILE = 4
+MAX_CLUSTER_ZOOM = 22
+
+
+def get_cluster_grid_size(zoom):
+    """
+    Size in degrees of the clustering grid cells at the given map zoom level.
+    """
+    return 360.0 / (2**zoom) / CLUSTER_CELLS_PER_TILE
+
+
+def cluster_accommodations(queryset, zoom):
+    """
+    Group the accommodations of the (already filtered) queryset on a grid snapped with ST_SnapToGrid,
+    returning one dict per non-empty cell with its count, centroid and min price.
+    """
+    rows = (
+        queryset.order_by()
+        .annotate(cell=SnapToGrid("geom", get_cluster_grid_size(zoom)))
+        .values("cell")
+        .annotate(count=Count("id"), centroid=Centroid(Collect("geom")), min_price=Min("price_min"))
+        .values_list("count", "centroid", "min_price")
+    )
+    return [
+        {"count": count, "longitude": centroid.x, "latitude": centroid.y, "min_price": min_price}
+        for count, centroid, min_price in rows
+    ]
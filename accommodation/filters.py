@@ -4,8 +4,6 @@ from django_filters.rest_framework import filters
 from accommodation.models import Accommodation
 from common.filters import BaseFilter
 
-from territories.models import Academy
-
 
 class AccommodationFilter(BaseFilter):
     is_accessible = filters.BooleanFilter(method="filter_is_accessible", label="Only accessible accommodations")
@@ -56,13 +54,8 @@ class AccommodationFilter(BaseFilter):
     def filter_academy_id(self, queryset, name, value):
         if value is None:
             return queryset
-        try:
-            academy = Academy.objects.get(id=value)
-        except Academy.DoesNotExist:
-            return queryset
-        if academy.boundary is None:
-            return queryset
-        return queryset.filter(geom__within=academy.boundary)
+        # academy is precomputed from the academy boundaries containing geom
+        return queryset.filter(academy_id=value)
 
     class Meta:
         model = Accommodation
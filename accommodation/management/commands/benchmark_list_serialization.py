@@ -0,0 +1,35 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from accommodation.models import Accommodation
+from accommodation.serializers import AccommodationGeoSerializer
+from accommodation.slim import SLIM_FIELDS, slim_feature_collection, slim_values
+
+
+class Command(BaseCommand):
+    help = "Benchmark the per-row cost of the accommodation list serialization, full serializer vs slim view"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=1000, help="Number of accommodations serialized per run")
+        parser.add_argument("--runs", type=int, default=5, help="Number of timed runs")
+
+    def handle(self, *args, **options):
+        queryset = Accommodation.objects.online_with_availibility_first()[: options["limit"]]
+        benchmarks = [
+            ("full", lambda: AccommodationGeoSerializer(queryset.all(), many=True).data),
+            ("slim", lambda: slim_feature_collection(slim_values(queryset.all(), SLIM_FIELDS), SLIM_FIELDS)),
+        ]
+
+        for name, serialize in benchmarks:
+            durations = []
+            for _ in range(max(options["runs"], 1)):
+                start = perf_counter()
+                data = serialize()
+                durations.append((perf_counter() - start) * 1000)
+            durations.sort()
+
+            count = len(data["features"])
+            median = durations[len(durations) // 2]
+            per_row = median * 1000 / count if count else 0
+            self.stdout.write(f"{name}: {count} rows, median {median:.1f} ms, {per_row:.1f} µs per row")
@@ -0,0 +1,46 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from accommodation.filters import AccommodationFilter
+from accommodation.models import Accommodation
+from institution.filters import EducationalInstitutionFilter
+from institution.models import EducationalInstitution
+
+
+class Command(BaseCommand):
+    help = "Benchmark the center/radius search filter and check that the geography GiST indexes are used"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--center", default="2.3522,48.8566", help="Center point (lon,lat), defaults to Paris")
+        parser.add_argument("--radius", type=float, default=10, help="Radius in kilometers")
+        parser.add_argument("--runs", type=int, default=10, help="Number of timed runs")
+
+    def handle(self, *args, **options):
+        data = {"center": options["center"], "radius": options["radius"], "order_by_distance": True}
+        benchmarks = [
+            ("accommodation_geog_idx", AccommodationFilter, Accommodation.objects.online_with_availibility_first()),
+            ("institution_geog_idx", EducationalInstitutionFilter, EducationalInstitution.objects.all()),
+        ]
+
+        for index_name, filterset_class, queryset in benchmarks:
+            filtered = filterset_class(data=data, queryset=queryset).qs
+            self.stdout.write(f"--- {queryset.model.__name__} ({queryset.model.objects.count()} rows)")
+
+            plan = filtered.explain(analyze=True)
+            self.stdout.write(plan)
+
+            durations = []
+            for _ in range(max(options["runs"], 1)):
+                start = perf_counter()
+                count = len(filtered.all())
+                durations.append((perf_counter() - start) * 1000)
+            durations.sort()
+            self.stdout.write(
+                f"{count} results, median {durations[len(durations) // 2]:.1f} ms, max {durations[-1]:.1f} ms"
+            )
+
+            if index_name in plan:
+                self.stdout.write(self.style.SUCCESS(f"✅ {index_name} is used"))
+            else:
+                self.stdout.write(self.style.WARNING(f"⚠️ {index_name} is not used, check the plan above"))
@@ -30,8 +30,10 @@ class Command(GeoBaseCommand):
         self.skip_cities = options["skip_cities"]
 
         with open(self.input_file, "r") as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=",")
-            for i, row in enumerate(reader):
+            rows = list(csv.DictReader(csvfile, delimiter=","))
+            if not self.skip_cities:
+                self._prefetch_communes(row.get("Code postal") for row in rows)
+            for i, row in enumerate(rows):
                 if (name := row["Nom de la résidence"]) == "Nom de la résidence":
                     # header is repeated in the file, ignoring the line
                     continue
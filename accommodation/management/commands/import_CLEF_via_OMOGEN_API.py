@@ -1,9 +1,6 @@
 import requests
 from django.conf import settings
 from django.contrib.gis.geos import Point
-from geopy.adapters import AdapterHTTPError
-from geopy.exc import GeocoderTimedOut
-from geopy.geocoders import BANFrance
 
 from accommodation.models import ExternalSource
 from accommodation.serializers import AccommodationImportSerializer
@@ -30,11 +27,6 @@ class Command(GeoBaseCommand):
     auth_url = f"{root_url}/{settings.OMOGEN_API_AUTH_PATH}"
     access_token = None
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        self.geolocator = BANFrance(timeout=10)
-
     def do_request(self, url):
         if not self.access_token:
             self.refresh_access_token()
@@ -101,6 +93,15 @@ class Command(GeoBaseCommand):
         residences = response.get("content", [])
         results = []
 
+        # the addresses of the residences kept by the type and status checks below are geocoded together
+        locations = self._geocode_many(
+            [
+                residence.get("adresseGeolocalisee")
+                for residence in residences
+                if residence.get("idTypeResidence") == 2 and residence.get("idStatutResidence") == 3
+            ]
+        )
+
         for residence in residences:
             images = self._get_images_data(image_ids=residence.get("images"))
 
@@ -118,11 +119,7 @@ class Command(GeoBaseCommand):
                 self.stdout.write(self.style.NOTICE(f"Skipping TMC accommodation {name}, created for tests."))
                 continue
 
-            try:
-                location = self.geolocator.geocode(residence.get("adresseGeolocalisee"))
-            except (AdapterHTTPError, GeocoderTimedOut):
-                location = None
-
+            location = locations.get(residence.get("adresseGeolocalisee"))
             if not location:
                 self.stderr.write(f"Could not geocode address: {residence.get('adresseGeolocalisee')}")
                 continue
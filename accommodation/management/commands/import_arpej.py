@@ -4,12 +4,11 @@ import re
 
 from django.contrib.gis.geos import Point
 from django.core.management.base import BaseCommand
-from geopy.exc import GeocoderQueryError
-from geopy.geocoders import BANFrance
 
 from accommodation.models import ExternalSource
 from accommodation.serializers import AccommodationImportSerializer
 from account.models import Owner
+from territories.geocoding import get_geocoding_service
 
 
 class Command(BaseCommand):
@@ -21,7 +20,7 @@ class Command(BaseCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.geolocator = BANFrance(timeout=10)
+        self.geocoding_service = get_geocoding_service()
 
     def handle(self, *args, **options):
         csv_file_path = options["file"]
@@ -32,7 +31,7 @@ class Command(BaseCommand):
             return
 
         with open(csv_file_path, newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=",")
+            rows = list(csv.DictReader(csvfile, delimiter=","))
             total_imported = 0
 
             def to_digit(value):
@@ -48,13 +47,14 @@ class Command(BaseCommand):
                     return
                 return value.strip().lower() in ("oui", "vrai", "true", "1", "yes")
 
+            def get_full_address(row):
+                return f"{row.get('post_address')}, {row.get('post_zipcode')} {row.get('post_city')}"
+
             owner = Owner.get_or_create({"name": "ARPEJ", "url": "https://www.arpej.fr/fr/"})
-            for row in reader:
-                full_address = f"{row.get('post_address')}, {row.get('post_zipcode')} {row.get('post_city')}"
-                try:
-                    location = self.geolocator.geocode(full_address)
-                except GeocoderQueryError:
-                    location = None
+            locations = self.geocoding_service.geocode_many([get_full_address(row) for row in rows])
+            for row in rows:
+                full_address = get_full_address(row)
+                location = locations.get(full_address)
 
                 if not location:
                     self.stderr.write(f"Could not geocode address: {full_address}")
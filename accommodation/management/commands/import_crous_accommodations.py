@@ -7,7 +7,6 @@ from accommodation.models import ExternalSource
 from accommodation.serializers import AccommodationImportSerializer
 from account.models import Owner
 from territories.management.commands.geo_base_command import GeoBaseCommand
-import geopy
 
 
 class Command(GeoBaseCommand):
@@ -60,8 +59,12 @@ class Command(GeoBaseCommand):
         )
 
         with open(csv_file_path, newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=",")
-            for row in reader:
+            rows = list(csv.DictReader(csvfile, delimiter=","))
+            locations = self._geocode_many([row["adresse_residence"] for row in rows])
+            self._prefetch_communes(
+                location.raw["properties"]["postcode"] for location in locations.values() if location
+            )
+            for row in rows:
                 try:
                     lon = float(row["longitude"].replace(",", "."))
                     lat = float(row["latitude"].replace(",", "."))
@@ -71,10 +74,7 @@ class Command(GeoBaseCommand):
 
                 geom = Point(lon, lat, srid=4326)
 
-                try:
-                    location = self._geocode(row["adresse_residence"])
-                except geopy.exc.GeocoderTimedOut:
-                    location = None
+                location = locations.get(row["adresse_residence"])
                 if not location:
                     self.stderr.write(f"Could not geocode address: {row['adresse_residence']}")
                     continue
@@ -123,15 +123,19 @@ class Command(GeoBaseCommand):
             return "La Valette-du-Var"
         return city_name
 
-    def _build_payload(self, item, owner):
+    def _get_full_address(self, item):
+        return f"{item['address']}, {self._fix_city_name(item['city'])}, {item['postal_code']}"
+
+    def _build_payload(self, item, owner, locations):
         external_reference = str(item["id"])
 
+        full_address = self._get_full_address(item)
         item["city"] = self._fix_city_name(item["city"])
 
-        point = self._geocode(f"{item['address']}, {item['city']}, {item['postal_code']}")
+        point = locations.get(full_address)
 
         if not point:
-            self.stderr.write(f"Could not geocode address: {item['address']}, {item['city']}, {item['postal_code']}")
+            self.stderr.write(f"Could not geocode address: {full_address}")
             return None
 
         geom = Point(point.longitude, point.latitude, srid=4326)
@@ -202,9 +206,11 @@ class Command(GeoBaseCommand):
         created_count = 0
         updated_count = 0
 
+        locations = self._geocode_many([self._get_full_address(item) for item in records])
+        self._prefetch_communes(str(item["postal_code"]) for item in records)
         for item in records:
             owner = self._get_owner(item.get("marque"))
-            payload = self._build_payload(item, owner)
+            payload = self._build_payload(item, owner, locations)
             if not payload:
                 continue
             accommodation = Accommodation.objects.filter(
@@ -48,11 +48,12 @@ class Command(GeoBaseCommand):
             return
 
         with open(csv_file_path, newline="", encoding="utf-8-sig") as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=";")
+            rows = list(csv.DictReader(csvfile, delimiter=";"))
+            self._prefetch_communes(row["postal_code"] for row in rows)
             total_imported = 0
 
             owner = None
-            for row in reader:
+            for row in rows:
                 if not owner:
                     parsed_url = urlparse(row["owner_url"])
                     owner_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
@@ -1,8 +1,6 @@
 import requests
 from django.conf import settings
 from django.contrib.gis.geos import Point
-from geopy.exc import GeocoderUnavailable
-from geopy.geocoders import BANFrance
 
 from accommodation.models import ExternalSource
 from accommodation.serializers import AccommodationImportSerializer
@@ -14,10 +12,12 @@ class Command(GeoBaseCommand):
     help = "Import iBAIL (arpej) data"
     root_url = settings.IBAIL_API_HOST
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        self.geolocator = BANFrance(timeout=10)
+    @staticmethod
+    def _get_full_address(residence):
+        return (
+            f"{residence.get('address')} {residence.get('address_completement')}, "
+            f"{residence.get('zip_code')} {residence.get('city')}"
+        )
 
     def _get_images_data(self, images):
         images_results = []
@@ -77,10 +77,11 @@ class Command(GeoBaseCommand):
 
             self.stdout.write(f"Processing page {response_page} of {total_pages} (Total items: {total_items})")
 
+            locations = self._geocode_many([self._get_full_address(residence) for residence in residences])
             for residence in residences:
                 try:
-                    full_address = f"{residence.get('address')} {residence.get('address_completement')}, {residence.get('zip_code')} {residence.get('city')}"
-                    location = self.geolocator.geocode(full_address)
+                    full_address = self._get_full_address(residence)
+                    location = locations.get(full_address)
 
                     if not location:
                         self.stderr.write(f"Could not geocode address: {full_address}")
@@ -124,9 +125,6 @@ class Command(GeoBaseCommand):
                         )
                         continue
 
-                except GeocoderUnavailable as e:
-                    self.stderr.write(f"Geocoding error for address {full_address}: {str(e)}")
-                    continue
                 except Exception as e:
                     self.stderr.write(f"Unexpected error processing residence: {str(e)}")
                     continue
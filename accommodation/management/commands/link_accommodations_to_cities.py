@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from accommodation.models import Accommodation
+from territories.services import get_city_manager_service
+
+
+class Command(BaseCommand):
+    help = "Fill city_fk, department and academy of accommodations from their city and postal code"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true", help="Relink all accommodations, not only the ones without city"
+        )
+        parser.add_argument(
+            "--create-missing",
+            action="store_true",
+            help="Create the cities not found in database from geo.api.gouv.fr",
+        )
+
+    def handle(self, *args, **options):
+        city_manager_service = get_city_manager_service()
+
+        queryset = Accommodation.objects.all()
+        if not options["all"]:
+            queryset = queryset.filter(city_fk__isnull=True)
+
+        nb_linked = 0
+        addresses = queryset.order_by().values_list("city", "postal_code").distinct()
+        for city_name, postal_code in addresses:
+            city = city_manager_service.find_city(city_name, postal_code)
+            if not city and options["create_missing"] and city_name and postal_code:
+                city = city_manager_service.get_or_create_city(city_name, postal_code)
+            if not city:
+                self.stdout.write(self.style.WARNING(f"⚠️ No city found for {city_name} ({postal_code})"))
+                continue
+
+            nb_linked += queryset.filter(city=city_name, postal_code=postal_code).update(
+                **Accommodation.get_territory_fields(city), touch=True
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Linked {nb_linked} accommodations to their city"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accommodation.models import Accommodation
+
+
+class Command(BaseCommand):
+    help = "Backfill the denormalized total_available, unknown_availibility, priority and price_max columns"
+
+    def handle(self, *args, **options):
+        updated_count = Accommodation.objects.all().refresh_denormalized_fields()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed denormalized fields of {updated_count} accommodations"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accommodation.models import Accommodation
+
+
+class Command(BaseCommand):
+    help = "Recompute the city, department and academy of accommodations from the territory boundaries"
+
+    def handle(self, *args, **options):
+        updated_count = Accommodation.objects.all().refresh_territories()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed territories of {updated_count} accommodations"))
@@ -4,11 +4,11 @@ import requests
 from bs4 import BeautifulSoup
 from django.contrib.gis.geos import Point
 from django.core.management.base import BaseCommand
-from geopy.geocoders import BANFrance
 
 from accommodation.models import ExternalSource
 from accommodation.serializers import AccommodationImportSerializer
 from account.models import Owner
+from territories.geocoding import get_geocoding_service
 
 
 class Command(BaseCommand):
@@ -111,8 +111,7 @@ class Command(BaseCommand):
         onglet_text = soup.find("div", class_="onglet-text")
         address = onglet_text.find_all("p")[-1].text.strip() if onglet_text and onglet_text.find_all("p") else None
 
-        geolocator = BANFrance()
-        location = geolocator.geocode(address)
+        location = get_geocoding_service().geocode(address)
 
         city = location.raw["properties"]["city"]
         address = location.raw["properties"]["name"]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.27 on 2026-10-17 20:46
+
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Coalesce
+
+AVAILABILITY_FIELDS = [
+    "nb_t1_available",
+    "nb_t1_bis_available",
+    "nb_t2_available",
+    "nb_t3_available",
+    "nb_t4_available",
+    "nb_t5_available",
+    "nb_t6_available",
+    "nb_t7_more_available",
+]
+
+
+def populate_availability(apps, schema_editor):
+    if settings.TEST:
+        return
+    Accommodation = apps.get_model("accommodation", "Accommodation")
+
+    # same expressions as accommodation.queryset.availability_expressions() at the time of this migration
+    has_available_q = reduce(or_, (Q(**{f"{field}__gt": 0}) for field in AVAILABILITY_FIELDS))
+    unknown_q = reduce(and_, (Q(**{f"{field}__isnull": True}) for field in AVAILABILITY_FIELDS))
+    Accommodation.objects.update(
+        total_available=sum(
+            (Coalesce(F(field), 0) for field in AVAILABILITY_FIELDS[1:]), Coalesce(F(AVAILABILITY_FIELDS[0]), 0)
+        ),
+        unknown_availibility=Case(
+            When(unknown_q, then=Value(True)), default=Value(False), output_field=models.BooleanField()
+        ),
+        priority=Case(
+            When(has_available_q, then=Value(1)),
+            When(~unknown_q & Q(accept_waiting_list=True), then=Value(2)),
+            When(unknown_q & Q(accept_waiting_list=True), then=Value(3)),
+            When(unknown_q & Q(accept_waiting_list=False), then=Value(4)),
+            When(~unknown_q & Q(accept_waiting_list=False), then=Value(5)),
+            default=Value(6),
+            output_field=models.IntegerField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accommodation", "0058_alter_externalsource_source"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accommodation",
+            name="priority",
+            field=models.PositiveSmallIntegerField(default=6, editable=False),
+        ),
+        migrations.AddField(
+            model_name="accommodation",
+            name="total_available",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="accommodation",
+            name="unknown_availibility",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="accommodation",
+            index=models.Index(
+                fields=["published", "priority", "-total_available"], name="accommodati_publish_ebf5f5_idx"
+            ),
+        ),
+        migrations.RunPython(populate_availability, reverse_code=migrations.RunPython.noop),
+    ]
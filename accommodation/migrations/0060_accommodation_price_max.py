@@ -0,0 +1,58 @@
+# Generated by Django 4.2.27 on 2026-10-17 20:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest, NullIf
+
+PRICE_FIELDS = [
+    "price_min_t1",
+    "price_min_t1_bis",
+    "price_min_t2",
+    "price_min_t3",
+    "price_min_t4",
+    "price_min_t5",
+    "price_min_t6",
+    "price_min_t7_more",
+    "price_max_t1",
+    "price_max_t1_bis",
+    "price_max_t2",
+    "price_max_t3",
+    "price_max_t4",
+    "price_max_t5",
+    "price_max_t6",
+    "price_max_t7_more",
+]
+
+
+def populate_price_max(apps, schema_editor):
+    if settings.TEST:
+        return
+    Accommodation = apps.get_model("accommodation", "Accommodation")
+
+    # same expression as accommodation.pricing.price_max_expression() at the time of this migration: highest price,
+    # ignoring zeros and nulls
+    prices = [
+        Case(When(**{f"{field}__gt": 0}, then=F(field)), default=Value(0), output_field=models.IntegerField())
+        for field in PRICE_FIELDS
+    ]
+    Accommodation.objects.update(price_max=NullIf(Greatest(*prices, output_field=models.IntegerField()), Value(0)))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accommodation", "0059_availability_priority"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accommodation",
+            name="price_max",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name="Maximum price"),
+        ),
+        migrations.AddIndex(
+            model_name="accommodation",
+            index=models.Index(fields=["price_min", "price_max"], name="accommodati_price_m_920f85_idx"),
+        ),
+        migrations.RunPython(populate_price_max, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.27 on 2026-10-17 20:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("territories", "0015_city_accommodation_stats"),
+        ("accommodation", "0060_accommodation_price_max"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accommodation",
+            name="academy",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="accommodations",
+                to="territories.academy",
+            ),
+        ),
+        migrations.AddField(
+            model_name="accommodation",
+            name="city_fk",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="accommodations",
+                to="territories.city",
+            ),
+        ),
+        migrations.AddField(
+            model_name="accommodation",
+            name="department",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="accommodations",
+                to="territories.department",
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:05
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_territories(apps, schema_editor):
+    if settings.TEST:
+        return
+    Accommodation = apps.get_model("accommodation", "Accommodation")
+    City = apps.get_model("territories", "City")
+    Department = apps.get_model("territories", "Department")
+    Academy = apps.get_model("territories", "Academy")
+
+    # same expressions as accommodation.queryset.territory_expressions(), on the models of this migration state
+    def containing(model):
+        return Subquery(model.objects.filter(boundary__contains=OuterRef("geom")).values("pk")[:1])
+
+    city_department = City.objects.filter(pk=OuterRef("city_fk_id")).values("department_id")[:1]
+    city_academy = City.objects.filter(pk=OuterRef("city_fk_id")).values("department__academy_id")[:1]
+
+    Accommodation.objects.update(
+        city_fk_id=Coalesce(F("city_fk_id"), containing(City)),
+        department_id=Coalesce(containing(Department), Subquery(city_department)),
+        academy_id=Coalesce(containing(Academy), Subquery(city_academy)),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accommodation", "0061_accommodation_city_fk"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_territories, reverse_code=migrations.RunPython.noop),
+    ]
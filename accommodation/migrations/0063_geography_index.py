@@ -0,0 +1,24 @@
+# Generated by Django 4.2.27 on 2026-10-17 20:55
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accommodation", "0062_populate_accommodation_territories"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="accommodation",
+            index=django.contrib.postgres.indexes.GistIndex(
+                django.db.models.functions.comparison.Cast(
+                    "geom", output_field=django.contrib.gis.db.models.fields.PointField(geography=True, srid=4326)
+                ),
+                name="accommodation_geog_idx",
+            ),
+        ),
+    ]
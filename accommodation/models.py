@@ -2,15 +2,21 @@ from autoslug import AutoSlugField
 from django.conf import settings
 from django.contrib.gis.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GistIndex
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.template.defaultfilters import slugify
 from django.urls import reverse
 from django.utils.translation import gettext, gettext_lazy
 
 from account.models import Owner
+from common.cache import ACCOMMODATIONS_NAMESPACE, invalidate_namespace_on_commit
+from common.expressions import as_geography
 from account.models import Student
 
 from .managers import AccommodationManager
+from .pricing import ALL_PRICE_FIELDS
+from .queryset import AVAILABILITY_FIELDS, TERRITORY_DEPENDENCIES, compute_availability
 
 
 class Accommodation(models.Model):
@@ -55,6 +61,32 @@ class Accommodation(models.Model):
     address = models.CharField(max_length=255, verbose_name=gettext_lazy("Address"))
     city = models.CharField(max_length=150, verbose_name=gettext_lazy("City"))
     postal_code = models.CharField(max_length=5, verbose_name=gettext_lazy("Postal code"))
+    # city_fk is resolved from city and postal_code, see set_city(), department and academy from the boundaries
+    # containing geom, see AccommodationQuerySet.refresh_territories()
+    city_fk = models.ForeignKey(
+        "territories.City",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="accommodations",
+    )
+    department = models.ForeignKey(
+        "territories.Department",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="accommodations",
+    )
+    academy = models.ForeignKey(
+        "territories.Academy",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="accommodations",
+    )
     residence_type = models.CharField(
         max_length=100,
         choices=RESIDENCE_TYPE_CHOICES,
@@ -114,6 +146,9 @@ class Accommodation(models.Model):
     price_min = models.PositiveIntegerField(
         null=True, blank=True, db_index=True, verbose_name=gettext_lazy("Minimum price")
     )
+    price_max = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, verbose_name=gettext_lazy("Maximum price")
+    )
     price_min_t1 = models.PositiveIntegerField(null=True, blank=True, verbose_name=gettext_lazy("Minimum price for T1"))
     price_max_t1 = models.PositiveIntegerField(null=True, blank=True, verbose_name=gettext_lazy("Maximum price for T1"))
     price_min_t1_bis = models.PositiveIntegerField(
@@ -175,6 +210,11 @@ class Accommodation(models.Model):
     published = models.BooleanField(default=True, verbose_name=gettext_lazy("Published"))
     available = models.BooleanField(default=True, verbose_name=gettext_lazy("Available"))
 
+    # denormalized from nb_*_available and accept_waiting_list in save(), used to sort the public search
+    total_available = models.PositiveIntegerField(default=0, editable=False)
+    unknown_availibility = models.BooleanField(default=True, editable=False)
+    priority = models.PositiveSmallIntegerField(default=6, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -183,6 +223,9 @@ class Accommodation(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["published", "-images_count"]),
+            models.Index(fields=["published", "priority", "-total_available"]),
+            models.Index(fields=["price_min", "price_max"]),
+            GistIndex(as_geography("geom"), name="accommodation_geog_idx"),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -229,6 +272,18 @@ class Accommodation(models.Model):
         if self.slug in reserved_slugs:
             raise ValidationError({"slug": f"Reserved slug '{self.slug}'."})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_territory_keys = instance._get_territory_keys()
+        return instance
+
+    def _get_territory_keys(self):
+        return self.__dict__.get("geom"), self.__dict__.get("city_fk_id")
+
+    # atomic so that the on_commit callbacks of post_save, e.g. the alert matching, also run after the territories
+    # are refreshed when there is no transaction open yet
+    @transaction.atomic
     def save(self, *args, **kwargs):
         self.clean()
         self.images_count = len(self.images_urls or [])
@@ -244,6 +299,8 @@ class Accommodation(models.Model):
         ]
         non_null_prices = [p for p in price_min_fields if p is not None]
         self.price_min = min(non_null_prices) if non_null_prices else None
+        positive_prices = [p for p in (getattr(self, field) for field in ALL_PRICE_FIELDS) if p]
+        self.price_max = max(positive_prices) if positive_prices else None
 
         self.nb_total_apartments = sum(
             [
@@ -257,7 +314,41 @@ class Accommodation(models.Model):
                 int(self.nb_t7_more or 0),
             ]
         )
+
+        self.total_available, self.unknown_availibility, self.priority = compute_availability(
+            [getattr(self, field) for field in AVAILABILITY_FIELDS], self.accept_waiting_list
+        )
         super().save(*args, **kwargs)
+        invalidate_namespace_on_commit(ACCOMMODATIONS_NAMESPACE)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not TERRITORY_DEPENDENCIES.intersection(update_fields):
+            return
+        if self._get_territory_keys() != getattr(self, "_loaded_territory_keys", None):
+            self.refresh_territories()
+
+    def refresh_territories(self):
+        queryset = Accommodation.objects.filter(pk=self.pk)
+        queryset.refresh_territories()
+        self.city_fk_id, self.department_id, self.academy_id = queryset.values_list(
+            "city_fk_id", "department_id", "academy_id"
+        ).get()
+        self._loaded_territory_keys = self._get_territory_keys()
+
+    @staticmethod
+    def get_territory_fields(city):
+        """
+        Values of city_fk, department and academy for the given City (or None).
+        """
+        return {
+            "city_fk": city,
+            "department_id": city.department_id if city else None,
+            "academy_id": city.department.academy_id if city else None,
+        }
+
+    def set_city(self, city):
+        for field_name, value in self.get_territory_fields(city).items():
+            setattr(self, field_name, value)
 
     def get_number_of_appartment_by_type(self, appartment_type: APARTMENT_TYPE_CHOICES) -> int:
         field_by_type = {
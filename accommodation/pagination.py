@@ -1,23 +1,62 @@
+from functools import cached_property, partial
+
+from django.conf import settings
+from django.core.paginator import Paginator
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 from accommodation.pricing import PricingAggregates
+from common.cache import ACCOMMODATIONS_NAMESPACE, get_or_set_namespaced, query_params_digest
+
+
+class PrecountedPaginator(Paginator):
+    """
+    Paginator using a count computed beforehand instead of running its own COUNT(*) query.
+    """
+
+    def __init__(self, object_list, per_page, *, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._precomputed_count = count
+
+    @cached_property
+    def count(self):
+        return self._precomputed_count
 
 
 class AccommodationSearchListPagination(PageNumberPagination):
     page_size = 30
     page_size_query_param = "page_size"
+    cache_key_prefix = "accommodation-search-summary"
+
+    def get_search_cache_key_parts(self, request):
+        ignored_params = {self.page_query_param, self.page_size_query_param}
+        return (self.cache_key_prefix, query_params_digest(request.query_params, ignored=ignored_params))
+
+    def get_search_summary(self, queryset, request):
+        """
+        Count and price bounds of the whole filtered queryset, computed in one query and shared
+        between the pages of a same search for ACCOMMODATION_SEARCH_SUMMARY_CACHE_TTL seconds,
+        or until an accommodation is written.
+        """
+        return get_or_set_namespaced(
+            ACCOMMODATIONS_NAMESPACE,
+            self.get_search_cache_key_parts(request),
+            lambda: PricingAggregates(queryset).price_bounds_with_count(),
+            settings.ACCOMMODATION_SEARCH_SUMMARY_CACHE_TTL,
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.search_summary = self.get_search_summary(queryset, request)
+        self.django_paginator_class = partial(PrecountedPaginator, count=self.search_summary["count"])
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
-        queryset = self.page.paginator.object_list
-        pricing_aggregates = PricingAggregates(queryset)
-        price_bounds = pricing_aggregates.price_bounds()
         return Response(
             {
                 "count": self.page.paginator.count,
                 "page_size": self.get_page_size(self.request),
-                "max_price": price_bounds["max_price"],
-                "min_price": price_bounds["min_price"],
+                "max_price": self.search_summary["max_price"],
+                "min_price": self.search_summary["min_price"],
                 "next": self.get_next_link(),
                 "previous": self.get_previous_link(),
                 "results": data,
@@ -1,7 +1,5 @@
-from functools import reduce
-from operator import or_
-from django.db.models import Case, Max, IntegerField, Min, Q, F, When, Value
-from django.db.models.functions import Greatest, Least
+from django.db.models import Case, Count, Max, IntegerField, Min, Q, F, When, Value
+from django.db.models.functions import Greatest, Least, NullIf
 
 
 PRICE_MIN_FIELDS = [
@@ -29,13 +27,6 @@ PRICE_MAX_FIELDS = [
 ALL_PRICE_FIELDS = PRICE_MIN_FIELDS + PRICE_MAX_FIELDS
 
 
-def _has_any_price_q():
-    return reduce(
-        or_,
-        (Q(**{f"{field}__isnull": False}) & Q(**{f"{field}__gt": 0}) for field in ALL_PRICE_FIELDS),
-    )
-
-
 SENTINEL_MAX = 0
 SENTINEL_MIN = 10**9
 
@@ -68,15 +59,42 @@ def _least_price_expr(fields):
     )
 
 
+def price_max_expression():
+    """
+    SQL counterpart of the price_max computed in Accommodation.save(): highest price, ignoring zeros and nulls.
+    """
+    return NullIf(_greatest_price_expr(ALL_PRICE_FIELDS), Value(0))
+
+
+def price_min_expression():
+    """
+    SQL counterpart of the price_min computed in Accommodation.save(): lowest price_min_*, LEAST ignoring nulls.
+    """
+    return Least(*[F(field) for field in PRICE_MIN_FIELDS], output_field=IntegerField())
+
+
 class PricingAggregates:
     def __init__(self, queryset):
-        self.queryset = queryset.filter(_has_any_price_q()).only(*ALL_PRICE_FIELDS)
+        self.base_queryset = queryset
+        self.queryset = queryset.filter(price_max__isnull=False)
 
     def price_bounds(self):
         """
         Returns global min and max price across all accommodations.
         """
         return self.queryset.aggregate(
-            max_price=Max(_greatest_price_expr(ALL_PRICE_FIELDS)),
+            max_price=Max("price_max"),
             min_price=Min(_least_price_expr(ALL_PRICE_FIELDS)),
         )
+
+    def price_bounds_with_count(self):
+        """
+        Returns the same bounds as price_bounds(), plus the number of accommodations
+        (with or without prices), in a single aggregate query.
+        """
+        has_any_price = Q(price_max__isnull=False)
+        return self.base_queryset.aggregate(
+            count=Count("pk"),
+            max_price=Max("price_max"),
+            min_price=Min(_least_price_expr(ALL_PRICE_FIELDS), filter=has_any_price),
+        )
@@ -1,50 +1,159 @@
+from functools import reduce
+from operator import and_, or_
+
 from django.db import models
-from django.db.models import BooleanField, Case, F, IntegerField, Q, Value, When
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, Value, When
 from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from common.cache import ACCOMMODATIONS_NAMESPACE, invalidate_namespace_on_commit
+from territories.models import Academy, City, Department
+
+from .pricing import ALL_PRICE_FIELDS, price_max_expression, price_min_expression
+from .signals import accommodations_bulk_updated, bulk_update_dependencies
+
+AVAILABILITY_FIELDS = [
+    "nb_t1_available",
+    "nb_t1_bis_available",
+    "nb_t2_available",
+    "nb_t3_available",
+    "nb_t4_available",
+    "nb_t5_available",
+    "nb_t6_available",
+    "nb_t7_more_available",
+]
+
+AVAILABILITY_DEPENDENCIES = set(AVAILABILITY_FIELDS) | {"accept_waiting_list"}
+
+DENORMALIZED_DEPENDENCIES = AVAILABILITY_DEPENDENCIES | set(ALL_PRICE_FIELDS)
+
+TERRITORY_DEPENDENCIES = {"geom", "city_fk", "city_fk_id"}
+
+
+def compute_availability(values, accept_waiting_list):
+    """
+    Python counterpart of `availability_expressions`, used by `Accommodation.save()`.
+    Returns (total_available, unknown_availibility, priority).
+    """
+    values = list(values)
+    total_available = sum(int(value or 0) for value in values)
+    unknown_availibility = all(value is None for value in values)
+
+    if total_available > 0:
+        priority = 1
+    elif accept_waiting_list is True and not unknown_availibility:
+        priority = 2
+    elif accept_waiting_list is True and unknown_availibility:
+        priority = 3
+    elif accept_waiting_list is False and unknown_availibility:
+        priority = 4
+    elif accept_waiting_list is False and not unknown_availibility:
+        priority = 5
+    else:
+        priority = 6
+
+    return total_available, unknown_availibility, priority
+
+
+def territory_expressions():
+    """
+    SQL expressions of the city_fk, department and academy columns: the department and academy whose boundary
+    contains geom, falling back to the ones of city_fk. city_fk itself falls back to the city containing geom.
+    """
+
+    def containing(model):
+        return Subquery(model.objects.filter(boundary__contains=OuterRef("geom")).values("pk")[:1])
+
+    city_department = City.objects.filter(pk=OuterRef("city_fk_id")).values("department_id")[:1]
+    city_academy = City.objects.filter(pk=OuterRef("city_fk_id")).values("department__academy_id")[:1]
+
+    return {
+        "city_fk_id": Coalesce(F("city_fk_id"), containing(City)),
+        "department_id": Coalesce(containing(Department), Subquery(city_department)),
+        "academy_id": Coalesce(containing(Academy), Subquery(city_academy)),
+    }
+
+
+def availability_expressions():
+    """
+    SQL expressions of the denormalized availability columns, only built from raw columns
+    so they can be used in a single UPDATE statement.
+    """
+    has_available_q = reduce(or_, (Q(**{f"{field}__gt": 0}) for field in AVAILABILITY_FIELDS))
+    unknown_q = reduce(and_, (Q(**{f"{field}__isnull": True}) for field in AVAILABILITY_FIELDS))
+
+    return {
+        "total_available": sum(
+            (Coalesce(F(field), 0) for field in AVAILABILITY_FIELDS[1:]), Coalesce(F(AVAILABILITY_FIELDS[0]), 0)
+        ),
+        "unknown_availibility": Case(
+            When(unknown_q, then=Value(True)),
+            default=Value(False),
+            output_field=models.BooleanField(),
+        ),
+        "priority": Case(
+            When(has_available_q, then=Value(1)),
+            When(~unknown_q & Q(accept_waiting_list=True), then=Value(2)),
+            When(unknown_q & Q(accept_waiting_list=True), then=Value(3)),
+            When(unknown_q & Q(accept_waiting_list=False), then=Value(4)),
+            When(~unknown_q & Q(accept_waiting_list=False), then=Value(5)),
+            default=Value(6),
+            output_field=IntegerField(),
+        ),
+    }
 
 
 class AccommodationQuerySet(models.QuerySet):
     def online_with_availibility_first(self):
-        return (
-            self.filter(published=True)
-            .exclude(geom=None)
-            .annotate(
-                total_available=(
-                    Coalesce(F("nb_t1_available"), 0)
-                    + Coalesce(F("nb_t1_bis_available"), 0)
-                    + Coalesce(F("nb_t2_available"), 0)
-                    + Coalesce(F("nb_t3_available"), 0)
-                    + Coalesce(F("nb_t4_available"), 0)
-                    + Coalesce(F("nb_t5_available"), 0)
-                    + Coalesce(F("nb_t6_available"), 0)
-                    + Coalesce(F("nb_t7_more_available"), 0)
-                ),
-                unknown_availibility=Case(
-                    When(
-                        Q(nb_t1_available__isnull=True)
-                        & Q(nb_t1_bis_available__isnull=True)
-                        & Q(nb_t2_available__isnull=True)
-                        & Q(nb_t3_available__isnull=True)
-                        & Q(nb_t4_available__isnull=True)
-                        & Q(nb_t5_available__isnull=True)
-                        & Q(nb_t6_available__isnull=True)
-                        & Q(nb_t7_more_available__isnull=True),
-                        then=Value(True),
-                    ),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                ),
-            )
-            .annotate(
-                priority=Case(
-                    When(total_available__gt=0, then=Value(1)),
-                    When(total_available=0, accept_waiting_list=True, unknown_availibility=False, then=Value(2)),
-                    When(unknown_availibility=True, accept_waiting_list=True, then=Value(3)),
-                    When(unknown_availibility=True, accept_waiting_list=False, then=Value(4)),
-                    When(total_available=0, accept_waiting_list=False, unknown_availibility=False, then=Value(5)),
-                    default=Value(6),
-                    output_field=IntegerField(),
-                )
-            )
-            .order_by("priority", "-total_available")
+        return self.filter(published=True).exclude(geom=None).order_by("priority", "-total_available")
+
+    def refresh_denormalized_fields(self):
+        """
+        Recompute total_available, unknown_availibility, priority, price_min and price_max in one UPDATE.
+        """
+        updated_count = super().update(
+            **availability_expressions(), price_min=price_min_expression(), price_max=price_max_expression()
+        )
+        invalidate_namespace_on_commit(ACCOMMODATIONS_NAMESPACE)
+        return updated_count
+
+    def refresh_territories(self):
+        """
+        Recompute city_fk, department and academy from geom in one UPDATE, to run when boundaries change.
+        """
+        updated_count = super().update(**territory_expressions())
+        invalidate_namespace_on_commit(ACCOMMODATIONS_NAMESPACE)
+        return updated_count
+
+    def update(self, *, touch=False, **kwargs):
+        # auto_now is only applied by save(), the callers changing the served content pass touch=True, the
+        # conditional GET of the detail relies on updated_at
+        if touch:
+            kwargs.setdefault("updated_at", timezone.now())
+        refresh_needed = bool(DENORMALIZED_DEPENDENCIES.intersection(kwargs))
+        territories_refresh_needed = bool(TERRITORY_DEPENDENCIES.intersection(kwargs))
+        notify = bool(bulk_update_dependencies.intersection(kwargs)) and accommodations_bulk_updated.has_listeners(
+            self.model
         )
+        if not refresh_needed and not territories_refresh_needed and not notify:
+            updated_count = super().update(**kwargs)
+            invalidate_namespace_on_commit(ACCOMMODATIONS_NAMESPACE)
+            return updated_count
+
+        # the update may change which rows match the current filters, so keep track of them first
+        rows = list(self.values_list("pk", "city_fk_id")) if notify else []
+        pks = [pk for pk, _ in rows] if notify else list(self.values_list("pk", flat=True))
+        updated_count = super().update(**kwargs)
+        invalidate_namespace_on_commit(ACCOMMODATIONS_NAMESPACE)
+        if refresh_needed:
+            self.model.objects.filter(pk__in=pks).refresh_denormalized_fields()
+        if territories_refresh_needed:
+            self.model.objects.filter(pk__in=pks).refresh_territories()
+        if notify:
+            accommodations_bulk_updated.send(
+                sender=self.model,
+                pks=pks,
+                fields=set(kwargs),
+                previous_city_ids={city_id for _, city_id in rows},
+            )
+        return updated_count
@@ -1,5 +1,6 @@
 import requests
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils.translation import gettext
 from drf_spectacular.utils import OpenApiTypes, extend_schema_field
 from rest_framework import serializers
@@ -12,15 +13,17 @@ from common.serializers import BinaryToBase64Field
 
 from .models import Accommodation, AccommodationApplication, ExternalSource, FavoriteAccommodation
 from .utils import get_geolocator, upload_image_to_s3
+from territories.models import City
 from territories.services import get_city_manager_service
 
 
 class AccommodationAddressMixin:
-    def _ensure_city_exists(self, city_name: str, postal_code: str) -> None:
+    def _ensure_city_exists(self, city_name: str, postal_code: str) -> City:
         city_manager_service = get_city_manager_service()
         city = city_manager_service.get_or_create_city(city_name, postal_code)
         if not city:
             raise serializers.ValidationError({"city": "City not found"})
+        return city
 
     def _get_address_components(self, validated_data):
         address = validated_data.get("address", getattr(self.instance, "address", None))
@@ -33,7 +36,8 @@ class AccommodationAddressMixin:
         if not address or not city or not postal_code:
             return
 
-        self._ensure_city_exists(city, postal_code)
+        city_db = self._ensure_city_exists(city, postal_code)
+        validated_data.update(Accommodation.get_territory_fields(city_db))
 
         geolocator = get_geolocator()
         full_address = f"{address}, {city}, {postal_code}"
@@ -129,6 +133,13 @@ class AccommodationImportSerializer(serializers.ModelSerializer):
                 setattr(accommodation, field_name, field_value)
         return accommodation
 
+    def _set_city(self, accommodation, validated_data):
+        if accommodation.city_fk_id and not {"city", "postal_code"}.intersection(validated_data):
+            return accommodation
+        city = get_city_manager_service().find_city(accommodation.city, accommodation.postal_code)
+        accommodation.set_city(city)
+        return accommodation
+
     def _manage_images(self, accommodation, images_content, images_urls):
         image_urls = []
         if images_content is not None or images_urls is not None:
@@ -140,6 +151,8 @@ class AccommodationImportSerializer(serializers.ModelSerializer):
             accommodation.images_urls = image_urls
         return accommodation
 
+    # the source is part of the created accommodation for the on commit hooks, e.g. the alert matching
+    @transaction.atomic
     def create(self, validated_data):
         source_id = validated_data.pop("source_id")
         source = validated_data.pop("source")
@@ -167,6 +180,7 @@ class AccommodationImportSerializer(serializers.ModelSerializer):
             )
 
         accommodation = self._update_fields(accommodation, validated_data)
+        accommodation = self._set_city(accommodation, validated_data)
 
         if owner_id:
             owner = Owner.objects.get(pk=owner_id)
@@ -190,6 +204,7 @@ class AccommodationImportSerializer(serializers.ModelSerializer):
         owner_id = validated_data.pop("owner_id", None)
 
         instance = self._update_fields(instance, validated_data)
+        instance = self._set_city(instance, validated_data)
 
         if owner_id:
             owner = Owner.objects.get(pk=owner_id)
@@ -201,36 +216,9 @@ class AccommodationImportSerializer(serializers.ModelSerializer):
 
 
 class BaseAccommodationSerialiser(serializers.Serializer):
-    price_min = serializers.SerializerMethodField()
-    price_max = serializers.SerializerMethodField()
-
-    def get_price_min(self, obj) -> int:
-        prices = [
-            obj.price_min_t1,
-            obj.price_min_t1_bis,
-            obj.price_min_t2,
-            obj.price_min_t3,
-            obj.price_min_t4,
-            obj.price_min_t5,
-            obj.price_min_t6,
-            obj.price_min_t7_more,
-        ]
-        prices = [p for p in prices if p is not None]
-        return min(prices) if prices else None
-
-    def get_price_max(self, obj) -> int:
-        prices = [
-            obj.price_max_t1,
-            obj.price_max_t1_bis,
-            obj.price_max_t2,
-            obj.price_max_t3,
-            obj.price_max_t4,
-            obj.price_max_t5,
-            obj.price_max_t6,
-            obj.price_max_t7_more,
-        ]
-        prices = [p for p in prices if p is not None]
-        return max(prices) if prices else None
+    # denormalized by Accommodation.save() and AccommodationQuerySet.update()
+    price_min = serializers.IntegerField(read_only=True, allow_null=True)
+    price_max = serializers.IntegerField(read_only=True, allow_null=True)
 
     def validate(self, data):
         pairs = [
@@ -588,6 +576,13 @@ class FavoriteAccommodationGeoSerializer(serializers.ModelSerializer):
         return favorite
 
 
+class AccommodationClusterSerializer(serializers.Serializer):
+    count = serializers.IntegerField(help_text="Number of accommodations in the cluster")
+    longitude = serializers.FloatField(help_text="Longitude of the cluster centroid")
+    latitude = serializers.FloatField(help_text="Latitude of the cluster centroid")
+    min_price = serializers.IntegerField(allow_null=True, help_text="Minimum price among the cluster accommodations")
+
+
 class AccommodationApplicationSerializer(serializers.ModelSerializer):
     accommodation_slug = serializers.CharField(source="accommodation.slug", read_only=True)
 
@@ -4,9 +4,6 @@ from dataclasses import dataclass
 from io import BytesIO
 from typing import Iterable, Optional
 
-from django.db.models import F, IntegerField
-from django.db.models.functions import Coalesce, Greatest
-
 from accommodation.models import Accommodation
 from territories.models import City, Department
 
@@ -238,38 +235,22 @@ def build_rows_for_export() -> list[AccommodationExportRow]:
     # IMPORTANT:
     # - évite sources__source ici: ça duplique les lignes si plusieurs sources
     # - si tu veux le type de résidence: utilise residence_type (déjà présent)
-    raw_rows: Iterable[AccommodationRawRow] = (
-        Accommodation.objects.annotate(
-            price_max=Greatest(
-                Coalesce(F("price_max_t1"), 0),
-                Coalesce(F("price_max_t1_bis"), 0),
-                Coalesce(F("price_max_t2"), 0),
-                Coalesce(F("price_max_t3"), 0),
-                Coalesce(F("price_max_t4"), 0),
-                Coalesce(F("price_max_t5"), 0),
-                Coalesce(F("price_max_t6"), 0),
-                Coalesce(F("price_max_t7_more"), 0),
-                output_field=IntegerField(),
-            )
-        )
-        .order_by("id")
-        .values_list(
-            "name",
-            "owner__name",
-            "nb_total_apartments",
-            "postal_code",
-            "nb_t1_available",
-            "nb_t1_bis_available",
-            "nb_t2_available",
-            "nb_t3_available",
-            "nb_t4_available",
-            "nb_t5_available",
-            "nb_t6_available",
-            "nb_t7_more_available",
-            "residence_type",
-            "price_min",
-            "price_max",
-        )
+    raw_rows: Iterable[AccommodationRawRow] = Accommodation.objects.order_by("id").values_list(
+        "name",
+        "owner__name",
+        "nb_total_apartments",
+        "postal_code",
+        "nb_t1_available",
+        "nb_t1_bis_available",
+        "nb_t2_available",
+        "nb_t3_available",
+        "nb_t4_available",
+        "nb_t5_available",
+        "nb_t6_available",
+        "nb_t7_more_available",
+        "residence_type",
+        "price_min",
+        "price_max",
     )
 
     return build_accommodation_export_rows(
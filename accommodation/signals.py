@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete
+from django.dispatch import Signal, receiver
+
+from common.cache import ACCOMMODATIONS_NAMESPACE, invalidate_namespace_on_commit
+
+# Sent by AccommodationQuerySet.update() with the `pks` of the updated rows, the updated `fields`
+# and the `previous_city_ids` (city_fk) of these rows before the update,
+# since queryset updates do not send pre_save/post_save.
+accommodations_bulk_updated = Signal()
+
+# Fields the receivers of accommodations_bulk_updated depend on, the updates of other fields don't send it
+bulk_update_dependencies = set()
+
+
+def register_bulk_update_dependencies(fields):
+    bulk_update_dependencies.update(fields)
+
+
+@receiver(post_delete, sender="accommodation.Accommodation")
+def invalidate_accommodations_cache_on_delete(sender, **kwargs):
+    invalidate_namespace_on_commit(ACCOMMODATIONS_NAMESPACE)
@@ -0,0 +1,92 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+SLIM_VIEW = "slim"
+
+# columns that can be requested with `fields=`, all of them are returned by `view=slim`
+SLIM_FIELDS = (
+    "id",
+    "name",
+    "slug",
+    "city",
+    "postal_code",
+    "target_audience",
+    "residence_type",
+    "nb_total_apartments",
+    "nb_accessible_apartments",
+    "nb_coliving_apartments",
+    "price_min",
+    "price_max",
+    "total_available",
+    "images_urls",
+    "available",
+    "published",
+    "accept_waiting_list",
+    "scholarship_holders_priority",
+)
+
+
+def get_slim_fields(query_params):
+    """
+    Fields of the slim representation requested with `view=slim` or `fields=a,b,c`, None for the full one.
+    """
+    requested = query_params.get("fields")
+    if not requested:
+        return SLIM_FIELDS if query_params.get("view") == SLIM_VIEW else None
+
+    fields = [field.strip() for field in requested.split(",") if field.strip()]
+    unknown = sorted(set(fields) - set(SLIM_FIELDS))
+    if unknown:
+        raise ValidationError({"fields": f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(SLIM_FIELDS)}."})
+    return tuple(dict.fromkeys(["id", *fields]))
+
+
+def slim_values(queryset, fields, prefix="", extra=()):
+    """
+    `.values()` queryset of the given fields and of the geometry, the rows are turned into features by slim_feature.
+    """
+    return queryset.values(*extra, *(f"{prefix}{field}" for field in fields), f"{prefix}geom")
+
+
+def slim_feature(row, fields, prefix=""):
+    """
+    GeoJSON feature of a slim_values row, with the same layout as AccommodationGeoSerializer.
+    """
+    geom = row[f"{prefix}geom"]
+    return {
+        "id": row[f"{prefix}id"],
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [geom.x, geom.y]} if geom else None,
+        "properties": {field: row[f"{prefix}{field}"] for field in fields if field != "id"},
+    }
+
+
+def slim_feature_collection(rows, fields):
+    return {"type": "FeatureCollection", "features": [slim_feature(row, fields) for row in rows]}
+
+
+class SlimListMixin:
+    """
+    Serve `view=slim` / `fields=` list requests from a `.values()` query, without building model instances
+    nor going through the serializer. Prices come from the stored price_min and price_max columns.
+    """
+
+    def get_slim_fields(self):
+        return get_slim_fields(self.request.query_params)
+
+    def get_slim_queryset(self, fields):
+        return slim_values(self.filter_queryset(self.get_queryset()), fields)
+
+    def get_slim_data(self, rows, fields):
+        return slim_feature_collection(rows, fields)
+
+    def list(self, request, *args, **kwargs):
+        fields = self.get_slim_fields()
+        if fields is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.get_slim_queryset(fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.get_slim_data(page, fields))
+        return Response(self.get_slim_data(rows, fields))
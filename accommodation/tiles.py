@@ -0,0 +1,71 @@
+import math
+
+from django.contrib.gis.geos import Polygon
+from django.db import connection
+from django.db.models import BinaryField, F, Func, Value
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+TILE_LAYER_NAME = "accommodations"
+MAX_ZOOM = 22
+
+# the only attributes the map markers need, the detail comes from the accommodation detail endpoint
+TILE_FIELDS = ("id", "slug", "name", "price_min", "total_available", "priority")
+
+
+def tile_bounds(z, x, y, buffer=0):
+    """
+    WGS84 (xmin, ymin, xmax, ymax) of the given XYZ tile, extended by `buffer` tile units on each side.
+    """
+    n = 2**z
+    margin = buffer / TILE_EXTENT
+
+    def lon(tile_x):
+        return tile_x / n * 360.0 - 180.0
+
+    def lat(tile_y):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return (
+        lon(x - margin),
+        max(lat(y + 1 + margin), -85.0511),
+        lon(x + 1 + margin),
+        min(lat(y - margin), 85.0511),
+    )
+
+
+def is_valid_tile(z, x, y):
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def build_accommodation_tile(queryset, z, x, y):
+    """
+    Encode the accommodations of the (already filtered) queryset located in the tile as a Mapbox Vector Tile,
+    with ST_AsMVT. Returns the tile bytes, empty when there is no accommodation in the tile.
+    """
+    envelope = Polygon.from_bbox(tile_bounds(z, x, y, buffer=TILE_BUFFER))
+    envelope.srid = 4326
+    mvt_geom = Func(
+        Func(F("geom"), Value(3857), function="ST_Transform"),
+        Func(Value(z), Value(x), Value(y), function="ST_TileEnvelope"),
+        Value(TILE_EXTENT),
+        Value(TILE_BUFFER),
+        Value(True),
+        function="ST_AsMVTGeom",
+        output_field=BinaryField(),
+    )
+    features_sql, features_params = (
+        queryset.filter(geom__intersects=envelope)
+        .order_by()
+        .annotate(mvt_geom=mvt_geom)
+        .values(*TILE_FIELDS, "mvt_geom")
+        .query.sql_with_params()
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT ST_AsMVT(features.*, %s, %s, 'mvt_geom') FROM ({features_sql}) AS features",
+            (TILE_LAYER_NAME, TILE_EXTENT, *features_params),
+        )
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] else b""
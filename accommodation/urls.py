@@ -2,8 +2,10 @@ from django.urls import path
 
 from .views import (
     AccommodationApplicationCreateView,
+    AccommodationClusterView,
     AccommodationDetailView,
     AccommodationListView,
+    AccommodationTileView,
     FavoriteAccommodationViewSet,
     MyAccommodationApplicationListView,
     MyAccommodationDetailView,
@@ -12,6 +14,8 @@ from .views import (
 )
 
 urlpatterns = [
+    path("clusters/", AccommodationClusterView.as_view(), name="accommodation-clusters"),
+    path("tiles/<int:z>/<int:x>/<int:y>.mvt", AccommodationTileView.as_view(), name="accommodation-tile"),
     path("my/", MyAccommodationListView.as_view(), name="my-accommodation-list"),
     path("my/applications/", MyAccommodationApplicationListView.as_view(), name="my-accommodation-applications"),
     path("my/<slug:slug>/", MyAccommodationDetailView.as_view(), name="my-accommodation-detail"),
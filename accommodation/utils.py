@@ -4,15 +4,17 @@ import uuid
 import boto3
 from botocore.config import Config
 from django.conf import settings
-from geopy.geocoders import BANFrance
 
+from territories.geocoding import get_geocoding_service
 
-def upload_image_to_s3(binary_data: bytes, file_extension: str = ".jpg") -> str:
+
+def upload_image_to_s3(binary_data: bytes, file_extension: str = ".jpg", prefix: str = "accommodations") -> str:
     """
     Upload binary image data to S3.
 
     :param binary_data: Raw binary content (bytes-like)
     :param file_extension: File extension including dot (e.g. ".jpg")
+    :param prefix: Directory of the file in the bucket
     :raises TypeError: if binary_data is not bytes-like
     """
 
@@ -32,7 +34,7 @@ def upload_image_to_s3(binary_data: bytes, file_extension: str = ".jpg") -> str:
     bucket_name = settings.AWS_STORAGE_BUCKET_NAME
 
     unique_filename = f"{uuid.uuid4().hex}{file_extension}"
-    file_key = f"accommodations{settings.AWS_SUFFIX_DIR}/{unique_filename}"
+    file_key = f"{prefix}{settings.AWS_SUFFIX_DIR}/{unique_filename}"
 
     mime_type = mimetypes.guess_type(unique_filename)[0] or "image/jpeg"
 
@@ -84,4 +86,4 @@ def compute_model_diff(instance, old_data, *, fields):
 
 
 def get_geolocator():
-    return BANFrance(timeout=10)
+    return get_geocoding_service()
@@ -1,5 +1,11 @@
+import hashlib
+
+from django.conf import settings
 from django.db.models import Q
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import (
     OpenApiExample,
@@ -10,13 +16,17 @@ from drf_spectacular.utils import (
     extend_schema_view,
 )
 from rest_framework import filters, generics, mixins, permissions, status, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accommodation.events.bus import accommodation_event_bus
 from accommodation.events.events import AccommodationCreatedEvent, AccommodationUpdatedEvent
 from accommodation.pagination import AccommodationSearchListPagination
+from common.cache import ACCOMMODATIONS_NAMESPACE, get_or_set_namespaced, query_params_digest
+from common.views import ConditionalGetMixin, IgnoreClientContentNegotiation, queryset_version
 
 from .filters import AccommodationFilter
 from account.models import Student
@@ -25,12 +35,16 @@ from .models import Accommodation, AccommodationApplication, FavoriteAccommodati
 from .serializers import (
     AccommodationDetailSerializer,
     AccommodationApplicationSerializer,
+    AccommodationClusterSerializer,
     AccommodationGeoSerializer,
     FavoriteAccommodationGeoSerializer,
     MyAccommodationGeoSerializer,
     MyAccommodationSerializer,
     OwnerAccommodationApplicationSerializer,
 )
+from .clusters import MAX_CLUSTER_ZOOM, cluster_accommodations
+from .slim import SLIM_FIELDS, SlimListMixin, slim_feature, slim_values
+from .tiles import build_accommodation_tile, is_valid_tile
 from .utils import compute_model_diff, snapshot_model, upload_image_to_s3
 
 
@@ -39,75 +53,108 @@ from .utils import compute_model_diff, snapshot_model, upload_image_to_s3
     description="Return detailed information about a published accommodation identified by its slug.",
     responses=AccommodationDetailSerializer,
 )
-class AccommodationDetailView(generics.RetrieveAPIView):
+class AccommodationDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     queryset = Accommodation.objects.online()
     serializer_class = AccommodationDetailSerializer
     lookup_field = "slug"
 
+    def get_content_version(self):
+        accommodation = self.get_queryset().filter(slug=self.kwargs[self.lookup_field])
+        return queryset_version(accommodation, "updated_at", "owner__updated_at")
+
+
+ACCOMMODATION_FILTER_PARAMETERS = [
+    OpenApiParameter(
+        "bbox",
+        OpenApiTypes.STR,
+        description="Bounding box for geographic filtering. Format: xmin,ymin,xmax,ymax.",
+        required=False,
+    ),
+    OpenApiParameter(
+        "is_accessible",
+        OpenApiTypes.BOOL,
+        description="Return only accommodations with accessible apartments (nb_accessible_apartments > 0).",
+        required=False,
+    ),
+    OpenApiParameter(
+        "only_with_availibility",
+        OpenApiTypes.BOOL,
+        description="Return only accommodations with available apartments (nb_t1_available > 0 | "
+        "nb_t1_bis_available > 0 | nb_t2_available > 0 | nb_t3_available > 0 | nb_t4_available > 0 | "
+        "nb_t5_available > 0 | nb_t6_available > 0 | nb_t7_more_available > 0).",
+        required=False,
+    ),
+    OpenApiParameter(
+        "has_coliving",
+        OpenApiTypes.BOOL,
+        description="Return only accommodations offering coliving options (nb_coliving_apartments > 0).",
+        required=False,
+    ),
+    OpenApiParameter(
+        "center",
+        OpenApiTypes.STR,
+        description="Center point for radius filtering. Format: longitude,latitude.",
+        required=False,
+    ),
+    OpenApiParameter(
+        "radius",
+        OpenApiTypes.NUMBER,
+        description="Radius in kilometers for filtering accommodations around the center point.",
+        required=False,
+    ),
+    OpenApiParameter(
+        "order_by_distance",
+        OpenApiTypes.BOOL,
+        description="If true, order the accommodations by distance to the center point.",
+        required=False,
+    ),
+    OpenApiParameter(
+        "price_max",
+        OpenApiTypes.NUMBER,
+        description="Maximum price (in euros) for filtering accommodations below the given value.",
+        required=False,
+    ),
+    OpenApiParameter(
+        "view_crous",
+        OpenApiTypes.BOOL,
+        description="If true, only CROUS accommodations will be returned, if false, only non CROUS accommodations "
+        "will be returned.",
+        required=False,
+        default=False,
+    ),
+    OpenApiParameter(
+        "academy_id",
+        OpenApiTypes.NUMBER,
+        description="Academy ID for filtering accommodations within the given academy.",
+        required=False,
+    ),
+]
+
+
+SLIM_PARAMETERS = [
+    OpenApiParameter(
+        "view",
+        OpenApiTypes.STR,
+        description="Use 'slim' for a lighter representation of the accommodations, built without the serializer.",
+        required=False,
+        enum=["slim"],
+    ),
+    OpenApiParameter(
+        "fields",
+        OpenApiTypes.STR,
+        description=f"Comma separated fields of the slim representation, among: {', '.join(SLIM_FIELDS)}.",
+        required=False,
+    ),
+]
+
 
 @extend_schema(
     summary="List all published accommodations",
     description="Return a list of all published accommodations, supporting filters such as bbox, accessibility, coliving, price, etc.",
-    parameters=[
-        OpenApiParameter(
-            "bbox",
-            OpenApiTypes.STR,
-            description="Bounding box for geographic filtering. Format: xmin,ymin,xmax,ymax.",
-            required=False,
-        ),
-        OpenApiParameter(
-            "is_accessible",
-            OpenApiTypes.BOOL,
-            description="Return only accommodations with accessible apartments (nb_accessible_apartments > 0).",
-            required=False,
-        ),
-        OpenApiParameter(
-            "only_with_availibility",
-            OpenApiTypes.BOOL,
-            description="Return only accommodations with available apartments (nb_t1_available > 0 | nb_t1_bis_available > 0 | nb_t2_available > 0 | nb_t3_available > 0 | nb_t4_available > 0 | nb_t5_available > 0 | nb_t6_available > 0 | nb_t7_more_available > 0).",
-            required=False,
-        ),
-        OpenApiParameter(
-            "has_coliving",
-            OpenApiTypes.BOOL,
-            description="Return only accommodations offering coliving options (nb_coliving_apartments > 0).",
-            required=False,
-        ),
-        OpenApiParameter(
-            "center",
-            OpenApiTypes.STR,
-            description="Center point for radius filtering. Format: longitude,latitude.",
-            required=False,
-        ),
-        OpenApiParameter(
-            "radius",
-            OpenApiTypes.NUMBER,
-            description="Radius in kilometers for filtering accommodations around the center point.",
-            required=False,
-        ),
-        OpenApiParameter(
-            "price_max",
-            OpenApiTypes.NUMBER,
-            description="Maximum price (in euros) for filtering accommodations below the given value.",
-            required=False,
-        ),
-        OpenApiParameter(
-            "view_crous",
-            OpenApiTypes.BOOL,
-            description="If true, only CROUS accommodations will be returned, if false, only non CROUS accommodations will be returned.",
-            required=False,
-            default=False,
-        ),
-        OpenApiParameter(
-            "academy_id",
-            OpenApiTypes.NUMBER,
-            description="Academy ID for filtering accommodations within the given academy.",
-            required=False,
-        ),
-    ],
+    parameters=ACCOMMODATION_FILTER_PARAMETERS + SLIM_PARAMETERS,
     responses=AccommodationGeoSerializer,
 )
-class AccommodationListView(generics.ListAPIView):
+class AccommodationListView(SlimListMixin, generics.ListAPIView):
     queryset = Accommodation.objects.online_with_availibility_first()
     serializer_class = AccommodationGeoSerializer
     filter_backends = [DjangoFilterBackend]
@@ -115,6 +162,76 @@ class AccommodationListView(generics.ListAPIView):
     pagination_class = AccommodationSearchListPagination
 
 
+@extend_schema(
+    summary="Cluster published accommodations",
+    description="Group the published accommodations of a bounding box on a grid adapted to the map zoom level, "
+    "returning the count, centroid and minimum price of each cluster. Supports the same filters as the list.",
+    parameters=[
+        OpenApiParameter(
+            "zoom",
+            OpenApiTypes.INT,
+            description=f"Map zoom level (0 to {MAX_CLUSTER_ZOOM}), the higher the zoom the smaller the clusters.",
+            required=True,
+        ),
+        *ACCOMMODATION_FILTER_PARAMETERS,
+    ],
+    responses=AccommodationClusterSerializer(many=True),
+)
+class AccommodationClusterView(generics.GenericAPIView):
+    queryset = Accommodation.objects.online().exclude(geom=None)
+    serializer_class = AccommodationClusterSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = AccommodationFilter
+
+    def get(self, request, *args, **kwargs):
+        if not request.query_params.get("bbox"):
+            raise ValidationError({"bbox": "This parameter is required."})
+        try:
+            zoom = int(request.query_params["zoom"])
+        except (KeyError, ValueError):
+            raise ValidationError({"zoom": "A valid integer is required."})
+        if not 0 <= zoom <= MAX_CLUSTER_ZOOM:
+            raise ValidationError({"zoom": f"Should be between 0 and {MAX_CLUSTER_ZOOM}."})
+
+        clusters = cluster_accommodations(self.filter_queryset(self.get_queryset()), zoom)
+        return Response(self.get_serializer(clusters, many=True).data)
+
+
+@extend_schema(
+    summary="Accommodations vector tile",
+    description="Return the published accommodations of an XYZ tile as a Mapbox Vector Tile (layer 'accommodations'), "
+    "supporting the same filters as the accommodation list.",
+    parameters=ACCOMMODATION_FILTER_PARAMETERS,
+    responses={(200, "application/vnd.mapbox-vector-tile"): OpenApiTypes.BINARY},
+)
+class AccommodationTileView(generics.GenericAPIView):
+    queryset = Accommodation.objects.online()
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = AccommodationFilter
+    renderer_classes = [JSONRenderer]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, z, x, y):
+        if not is_valid_tile(z, x, y):
+            raise NotFound("Invalid tile coordinates.")
+
+        queryset = self.filter_queryset(self.get_queryset())
+        tile = get_or_set_namespaced(
+            ACCOMMODATIONS_NAMESPACE,
+            ("tile", z, x, y, query_params_digest(request.query_params)),
+            lambda: build_accommodation_tile(queryset, z, x, y),
+            settings.ACCOMMODATION_TILE_CACHE_TTL,
+        )
+
+        etag = quote_etag(hashlib.md5(tile).hexdigest())
+        response = get_conditional_response(request, etag=etag) or HttpResponse(
+            tile, content_type="application/vnd.mapbox-vector-tile"
+        )
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.ACCOMMODATION_TILE_CACHE_MAX_AGE)
+        return response
+
+
 @extend_schema(
     summary="List or create accommodations owned by the authenticated owner",
     description="Allows an authenticated owner to list and create accommodations linked to their owner account.",
@@ -133,9 +250,10 @@ class AccommodationListView(generics.ListAPIView):
             description="Search accommodations by name.",
             required=False,
         ),
+        *SLIM_PARAMETERS,
     ],
 )
-class MyAccommodationListView(generics.ListCreateAPIView):
+class MyAccommodationListView(SlimListMixin, generics.ListCreateAPIView):
     serializer_class = AccommodationGeoSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -300,6 +418,7 @@ class MyAccommodationImageUploadView(APIView):
             "authenticated user. Results are automatically filtered based on "
             "`request.user`."
         ),
+        parameters=SLIM_PARAMETERS,
         responses={
             200: FavoriteAccommodationGeoSerializer(many=True),
             401: OpenApiResponse(description="Authentication required"),
@@ -342,7 +461,7 @@ class MyAccommodationImageUploadView(APIView):
     ),
 )
 class FavoriteAccommodationViewSet(
-    mixins.ListModelMixin, mixins.CreateModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet
+    SlimListMixin, mixins.ListModelMixin, mixins.CreateModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet
 ):
     serializer_class = FavoriteAccommodationGeoSerializer
     permission_classes = [IsAuthenticated]
@@ -352,6 +471,23 @@ class FavoriteAccommodationViewSet(
             return FavoriteAccommodation.objects.none()
         return FavoriteAccommodation.objects.filter(user=self.request.user)
 
+    def get_slim_queryset(self, fields):
+        return slim_values(self.get_queryset(), fields, prefix="accommodation__", extra=("id", "created_at"))
+
+    def get_slim_data(self, rows, fields):
+        favorites = []
+        for row in rows:
+            accommodation = slim_feature(row, fields, prefix="accommodation__")
+            favorites.append(
+                {
+                    "id": row["id"],
+                    "accommodation": accommodation,
+                    "created_at": row["created_at"],
+                    "geom": accommodation["geometry"],
+                }
+            )
+        return favorites
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
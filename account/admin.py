@@ -1,5 +1,3 @@
-import base64
-
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy
@@ -26,9 +24,8 @@ class OwnerAdmin(admin.ModelAdmin):
     exclude = ("users",)
 
     def image_preview(self, obj):
-        if obj.image:
-            image_base64 = base64.b64encode(obj.image).decode("utf-8")
-            return format_html(f'<img src="data:image/png;base64,{image_base64}" width="100" height="45"/>')
+        if image_url := obj.get_image_url("small"):
+            return format_html('<img src="{}" width="100" height="45"/>', image_url)
         return "No Image"
 
     image_preview.short_description = "Image"
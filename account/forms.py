@@ -14,7 +14,7 @@ class OwnerAdminForm(forms.ModelForm):
         owner = super().save(commit=False)
 
         if self.cleaned_data.get("image_upload"):
-            owner.image = self.cleaned_data["image_upload"].read()
+            owner.set_image(self.cleaned_data["image_upload"].read())
 
         if commit:
             owner.save()
@@ -0,0 +1,72 @@
+import mimetypes
+from io import BytesIO
+
+from PIL import Image, UnidentifiedImageError
+
+from accommodation.utils import upload_image_to_s3
+
+OWNER_IMAGES_S3_PREFIX = "owners"
+
+# max width and height, in pixels, of the resized variants uploaded next to the original owner image
+OWNER_IMAGE_VARIANTS = {
+    "small": 160,
+    "medium": 480,
+}
+
+IMAGE_SIGNATURES = (
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"<svg", "image/svg+xml"),
+    (b"<?xml", "image/svg+xml"),
+)
+
+# formats kept when resizing, the other ones (gif, bmp...) are converted to png
+RESIZED_FORMATS = ("JPEG", "PNG", "WEBP")
+
+
+def guess_image_content_type(image):
+    if image[:4] == b"RIFF" and image[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, content_type in IMAGE_SIGNATURES:
+        if image.startswith(signature):
+            return content_type
+    return "application/octet-stream"
+
+
+def guess_image_extension(image):
+    return mimetypes.guess_extension(guess_image_content_type(image)) or ".jpg"
+
+
+def resize_image(image, max_size):
+    """
+    Returns (image, extension) of the image downsized to fit in max_size x max_size, None if the image can't be
+    read (svg, corrupted file). Smaller images are re-encoded without being upscaled.
+    """
+    try:
+        with Image.open(BytesIO(image)) as picture:
+            image_format = picture.format if picture.format in RESIZED_FORMATS else "PNG"
+            picture.thumbnail((max_size, max_size))
+            if image_format == "JPEG" and picture.mode not in ("RGB", "L"):
+                picture = picture.convert("RGB")
+            output = BytesIO()
+            picture.save(output, format=image_format, optimize=True)
+    except (UnidentifiedImageError, OSError):
+        return None
+    return output.getvalue(), f".{image_format.lower()}".replace(".jpeg", ".jpg")
+
+
+def upload_owner_image(image):
+    """
+    Upload the original image and its resized variants to S3, returns their URLs by variant name ("original" and
+    the OWNER_IMAGE_VARIANTS keys). Variants of an image that can't be resized point to the original.
+    """
+    image = bytes(image)
+    original_url = upload_image_to_s3(image, guess_image_extension(image), prefix=OWNER_IMAGES_S3_PREFIX)
+    image_urls = {"original": original_url}
+    for variant, max_size in OWNER_IMAGE_VARIANTS.items():
+        resized = resize_image(image, max_size)
+        image_urls[variant] = (
+            upload_image_to_s3(*resized, prefix=OWNER_IMAGES_S3_PREFIX) if resized is not None else original_url
+        )
+    return image_urls
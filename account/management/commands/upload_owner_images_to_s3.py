@@ -0,0 +1,31 @@
+from botocore.exceptions import ClientError
+from django.core.management.base import BaseCommand
+from PIL import UnidentifiedImageError
+
+from account.models import Owner
+
+
+class Command(BaseCommand):
+    help = "Upload the owner images stored in database to S3, with their resized variants, and clear the blobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="List the owners to migrate without uploading")
+
+    def handle(self, *args, **options):
+        owners = Owner.objects.filter(image__isnull=False, image_urls__isnull=True).order_by("pk")
+        self.stdout.write(f"{owners.count()} owner images to upload")
+        if options["dry_run"]:
+            return
+
+        # the blobs are loaded one at a time
+        for pk in owners.values_list("pk", flat=True):
+            owner = Owner.objects.with_image().get(pk=pk)
+            try:
+                owner.set_image(owner.image)
+            except (ClientError, UnidentifiedImageError, OSError) as e:
+                self.stdout.write(self.style.ERROR(f"Error uploading the image of {owner.name}: {e}"))
+                continue
+            owner.save(update_fields=["image", "image_urls", "updated_at"])
+            self.stdout.write(f"Uploaded the image of {owner.name}: {owner.image_urls['original']}")
+
+        self.stdout.write(self.style.SUCCESS("Owner images uploaded"))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0006_owner_accept_dossier_facile_applications"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="owner",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
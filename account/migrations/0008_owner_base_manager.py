@@ -0,0 +1,16 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0007_owner_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="owner",
+            options={"base_manager_name": "objects", "verbose_name": "Owner", "verbose_name_plural": "Owners"},
+        ),
+    ]
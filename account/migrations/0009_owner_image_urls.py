@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0008_owner_base_manager"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="owner",
+            name="image_urls",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -3,8 +3,29 @@ from autoslug import AutoSlugField
 from django.contrib.auth.models import Group, User
 from django.contrib.gis.db import models
 from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.urls import reverse
 from django.utils.translation import gettext_lazy
 
+from account.images import upload_owner_image
+
+
+class OwnerQuerySet(models.QuerySet):
+    def with_image(self):
+        return self.defer(None)
+
+
+class OwnerManager(models.Manager.from_queryset(OwnerQuerySet)):
+    # the image blob, kept for the owners whose image is not uploaded to S3 yet, is served by the owner image
+    # endpoint, has_image is enough to build its URL
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .defer("image")
+            .annotate(has_image=ExpressionWrapper(~Q(image=None), output_field=BooleanField()))
+        )
+
 
 class Owner(models.Model):
     name = models.CharField(max_length=200)
@@ -12,15 +33,42 @@ class Owner(models.Model):
     url = models.URLField(max_length=500, blank=True, null=True)
     users = models.ManyToManyField(User, blank=True, related_name="owners")
     image = models.BinaryField(null=True, blank=True)
+    image_urls = models.JSONField(null=True, blank=True, editable=False)
     accept_dossier_facile_applications = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OwnerManager()
 
     class Meta:
         verbose_name = gettext_lazy("Owner")
         verbose_name_plural = gettext_lazy("Owners")
+        base_manager_name = "objects"
 
     def __str__(self):
         return self.name
 
+    def get_image_url(self, variant="original"):
+        """
+        S3 URL of the given variant of the owner image (see account.images.OWNER_IMAGE_VARIANTS), None without image.
+        Images not uploaded to S3 yet are served by the owner image endpoint, with a version parameter that changes
+        with the owner so that the image can be cached for long.
+        """
+        if self.image_urls:
+            return self.image_urls.get(variant) or self.image_urls["original"]
+
+        if "image" in self.get_deferred_fields() and hasattr(self, "has_image"):
+            has_image = self.has_image
+        else:
+            has_image = self.image is not None
+        if not has_image:
+            return None
+        version = int(self.updated_at.timestamp() * 1000)
+        return f"{reverse('owner-image', kwargs={'slug': self.slug})}?v={version}"
+
+    def set_image(self, image):
+        self.image_urls = upload_owner_image(image) if image else None
+        self.image = None
+
     @classmethod
     def get_or_create(cls, data):
         if not data:
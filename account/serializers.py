@@ -1,5 +1,3 @@
-import base64
-
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
@@ -12,16 +10,25 @@ User = get_user_model()
 
 
 class OwnerSerializer(serializers.ModelSerializer):
-    image_base64 = serializers.SerializerMethodField()
+    image_url = serializers.SerializerMethodField()
+    image_small_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Owner
-        fields = ("name", "slug", "url", "image_base64")
+        fields = ("name", "slug", "url", "image_url", "image_small_url")
+
+    def _build_image_url(self, obj, variant):
+        image_url = obj.get_image_url(variant)
+        request = self.context.get("request")
+        if image_url and request:
+            return request.build_absolute_uri(image_url)
+        return image_url
+
+    def get_image_url(self, obj) -> str:
+        return self._build_image_url(obj, "original")
 
-    def get_image_base64(self, obj) -> str:
-        if obj.image:
-            return f"data:image/jpeg;base64,{base64.b64encode(obj.image).decode('utf-8')}"
-        return
+    def get_image_small_url(self, obj) -> str:
+        return self._build_image_url(obj, "small")
 
 
 class UserSerializer(serializers.ModelSerializer):
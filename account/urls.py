@@ -3,6 +3,7 @@ from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
+    OwnerImageView,
     OwnerViewSet,
     StudentGetTokenView,
     StudentLogoutView,
@@ -14,6 +15,7 @@ from .views import (
 
 urlpatterns = [
     path("owners/", OwnerViewSet.as_view({"get": "list"}), name="owner-list"),
+    path("owners/<slug:slug>/image/", OwnerImageView.as_view(), name="owner-image"),
     path("students/register/", StudentRegistrationView.as_view(), name="student-register"),
     path("students/validate/", StudentRegistrationValidationView.as_view(), name="student-validate"),
     path("students/token/", StudentGetTokenView.as_view(), name="student-token"),
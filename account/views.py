@@ -4,16 +4,21 @@ from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
 from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_decode
-from drf_spectacular.utils import OpenApiResponse, extend_schema
+from drf_spectacular.utils import OpenApiResponse, OpenApiTypes, extend_schema
 from rest_framework import generics, permissions, status, viewsets
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from account.images import guess_image_content_type
 from account.serializers import UserSerializer
 from account.throttles import PasswordResetThrottle
+from common.views import ConditionalGetMixin, IgnoreClientContentNegotiation, queryset_version
 from notifications.exceptions import EmailDeliveryError
 from notifications.factories import get_email_gateway
 from notifications.services import send_account_validation
@@ -40,6 +45,33 @@ class OwnerViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = OwnerSerializer
 
 
+@extend_schema(
+    summary="Owner image",
+    description="Return the image of an owner not uploaded to S3 yet, redirect to the S3 URL otherwise. "
+    "The URL given by the owner serializers is versioned, the response can be cached for long.",
+    responses={(200, "image/*"): OpenApiTypes.BINARY},
+)
+class OwnerImageView(ConditionalGetMixin, generics.RetrieveAPIView):
+    queryset = Owner.objects.all()
+    renderer_classes = [JSONRenderer]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get_content_version(self):
+        return queryset_version(self.get_queryset().filter(slug=self.kwargs["slug"]))
+
+    def get_cache_max_age(self):
+        return settings.OWNER_IMAGE_CACHE_MAX_AGE
+
+    def retrieve(self, request, slug):
+        owner = get_object_or_404(Owner.objects.with_image(), slug=slug)
+        if owner.image_urls:
+            return HttpResponseRedirect(owner.image_urls["original"])
+        if owner.image is None:
+            raise Http404
+        image = bytes(owner.image)
+        return HttpResponse(image, content_type=guess_image_content_type(image))
+
+
 @extend_schema(
     summary="Register a new student",
     description="Register a new student with the given email, first name, last name and password.",
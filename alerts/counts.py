@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.contrib.gis.geos import Polygon
+from django.db.models import Count, Q
+
+from accommodation.filters import AccommodationFilter
+from accommodation.models import Accommodation
+from common.cache import ACCOMMODATIONS_NAMESPACE, get_or_set_many_namespaced
+
+
+def get_alert_criteria(alert):
+    """
+    Flat tuple of the criteria of an alert: (xmin, ymin, xmax, ymax, academy_id, has_coliving, is_accessible,
+    max_price). The territory is the bbox of the department or of the city, or else the academy.
+    """
+    bbox = None
+    academy_id = None
+    if alert.department_id:
+        bbox = alert.department.get_bbox()
+    elif alert.city_id:
+        bbox = alert.city.get_bbox()
+    elif alert.academy_id:
+        academy_id = alert.academy_id
+
+    return (
+        *((bbox["xmin"], bbox["ymin"], bbox["xmax"], bbox["ymax"]) if bbox else (None,) * 4),
+        academy_id,
+        alert.has_coliving is True,
+        alert.is_accessible is True,
+        alert.max_price,
+    )
+
+
+def get_criteria_q(criteria):
+    """
+    Q object of the accommodations matching the criteria, equivalent to the AccommodationFilter filters.
+    """
+    *bbox, academy_id, has_coliving, is_accessible, max_price = criteria
+    q = Q()
+    if bbox[0] is not None:
+        q &= Q(geom__within=Polygon.from_bbox(bbox))
+    if academy_id:
+        q &= Q(academy_id=academy_id)
+    if has_coliving:
+        q &= Q(nb_coliving_apartments__gt=0)
+    if is_accessible:
+        q &= Q(nb_accessible_apartments__gt=0)
+    if max_price is not None:
+        q &= Q(price_min__isnull=False, price_min__lte=max_price)
+    return q
+
+
+def count_criteria_matches(criteria_list):
+    """
+    Number of online accommodations matching each criteria, in one query with a filtered count per criteria.
+    """
+    # without any parameter, the filterset only applies its defaults (CROUS accommodations excluded)
+    queryset = AccommodationFilter(data={}, queryset=Accommodation.objects.online_with_availibility_first()).qs
+    aggregates = queryset.aggregate(
+        **{
+            f"criteria_{index}": Count("pk", filter=get_criteria_q(criteria))
+            for index, criteria in enumerate(criteria_list)
+        }
+    )
+    return {criteria: aggregates[f"criteria_{index}"] for index, criteria in enumerate(criteria_list)}
+
+
+def get_alert_counts(alerts):
+    """
+    Number of accommodations matching each alert, by alert id. The counts are cached by criteria, shared between
+    the alerts with the same criteria and invalidated on accommodation writes, the missing ones are computed together.
+    """
+    criteria_by_alert = {alert.pk: get_alert_criteria(alert) for alert in alerts}
+    if not criteria_by_alert:
+        return {}
+
+    counts = get_or_set_many_namespaced(
+        ACCOMMODATIONS_NAMESPACE,
+        [("alert-count", *criteria) for criteria in dict.fromkeys(criteria_by_alert.values())],
+        lambda keys: {
+            ("alert-count", *criteria): count
+            for criteria, count in count_criteria_matches([tuple(key[1:]) for key in keys]).items()
+        },
+        settings.ALERT_COUNTS_CACHE_TTL,
+    )
+    return {pk: counts[("alert-count", *criteria)] for pk, criteria in criteria_by_alert.items()}
@@ -0,0 +1,124 @@
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+
+from alerts.models import AlertNotification
+from notifications.exceptions import EmailDeliveryError
+from notifications.types import MAX_DIGESTS_PER_SEND, DigestEmail, EmailGateway
+
+logger = logging.getLogger(__name__)
+
+
+def get_pending_notifications():
+    return AlertNotification.objects.filter(sent_at=None, alert__receive_notifications=True)
+
+
+def render_digest(user, notifications):
+    """
+    Digest email of a student, with the accommodations of the pending notifications grouped by alert.
+    """
+    accommodations_by_alert = defaultdict(list)
+    for notification in notifications:
+        if notification.accommodation.published:
+            accommodations_by_alert[notification.alert].append(notification.accommodation)
+    if not accommodations_by_alert:
+        return None
+
+    return DigestEmail(
+        to_email=user.email,
+        to_name=user.get_full_name() or user.username,
+        params={
+            "FIRST_NAME": user.first_name,
+            "NB_ACCOMMODATIONS": sum(len(accommodations) for accommodations in accommodations_by_alert.values()),
+            "ALERTS": [
+                {
+                    "NAME": alert.name,
+                    "NB_ACCOMMODATIONS": len(accommodations),
+                    "ACCOMMODATIONS": [
+                        {
+                            "NAME": accommodation.name,
+                            "CITY": accommodation.city,
+                            "PRICE_MIN": accommodation.price_min,
+                            "URL": accommodation.get_absolute_url(),
+                        }
+                        for accommodation in accommodations[: settings.ALERT_DIGEST_MAX_ACCOMMODATIONS]
+                    ],
+                }
+                for alert, accommodations in accommodations_by_alert.items()
+            ],
+        },
+    )
+
+
+def send_digest_batch(student_ids, email_gateway: EmailGateway):
+    """
+    Render and send the digests of the given students in one call to the gateway, then mark their pending
+    notifications as sent. They stay pending if the gateway fails, for the next run, but the ones of the digests
+    rejected because of their recipient are marked as sent too, they would be rejected again. Returns the number of
+    emails.
+    """
+    notifications = list(
+        get_pending_notifications()
+        .filter(alert__student_id__in=student_ids)
+        .select_related("alert__student__user", "accommodation")
+        .only(
+            "alert__name",
+            "alert__student__user__email",
+            "alert__student__user__username",
+            "alert__student__user__first_name",
+            "alert__student__user__last_name",
+            "accommodation__name",
+            "accommodation__slug",
+            "accommodation__city",
+            "accommodation__price_min",
+            "accommodation__published",
+        )
+        .order_by("alert__student_id", "alert_id", "created_at")
+    )
+    notifications_by_user = defaultdict(list)
+    for notification in notifications:
+        notifications_by_user[notification.alert.student.user].append(notification)
+
+    digests = [render_digest(user, user_notifications) for user, user_notifications in notifications_by_user.items()]
+    digests = [digest for digest in digests if digest is not None]
+    rejected = []
+    if digests:
+        try:
+            rejected = email_gateway.send_alert_digests(digests=digests)
+        except EmailDeliveryError:
+            logger.exception("Failed to send %s alert digests", len(digests))
+            return 0
+    for digest in rejected:
+        logger.warning("Alert digest to %s rejected, its notifications are not sent", digest.to_email)
+
+    # the notifications of the accommodations unpublished since then are not sent later either
+    AlertNotification.objects.filter(pk__in=[notification.pk for notification in notifications]).update(
+        sent_at=timezone.now()
+    )
+    return len(digests) - len(rejected)
+
+
+def send_alert_digests(email_gateway: EmailGateway, batch_size=None):
+    """
+    Send a digest of their pending notifications to the students, by batches of students walked in id order.
+    A batch is capped at MAX_DIGESTS_PER_SEND, its notifications are only marked as sent when all its digests are
+    sent or rejected because of their recipient.
+    Returns the number of emails sent.
+    """
+    batch_size = min(batch_size or settings.ALERT_DIGEST_BATCH_SIZE, MAX_DIGESTS_PER_SEND)
+    nb_sent = 0
+    last_student_id = 0
+    while True:
+        student_ids = list(
+            get_pending_notifications()
+            .filter(alert__student_id__gt=last_student_id)
+            .order_by("alert__student_id")
+            .values_list("alert__student_id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not student_ids:
+            return nb_sent
+        nb_sent += send_digest_batch(student_ids, email_gateway)
+        last_student_id = student_ids[-1]
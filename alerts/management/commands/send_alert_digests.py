@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from alerts.digests import send_alert_digests
+from notifications.factories import get_email_gateway
+
+
+class Command(BaseCommand):
+    help = "Send to the students a digest of the accommodations matching their alerts since the last run"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Number of students per batch")
+
+    def handle(self, *args, **options):
+        if settings.EMAIL_GATEWAY == "brevo" and not settings.BREVO_TEMPLATES_ID["alert-digest"]:
+            # the notifications stay pending until the template is configured
+            self.stderr.write(self.style.ERROR("BREVO_ALERT_DIGEST_TEMPLATE_ID is not set, no alert digest sent"))
+            return
+
+        nb_sent = send_alert_digests(get_email_gateway(), batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Sent {nb_sent} alert digests"))
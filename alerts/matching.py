@@ -0,0 +1,77 @@
+from django.db import connection
+
+from accommodation.models import Accommodation, ExternalSource
+from alerts.models import ALL_TERRITORIES, NO_MAX_PRICE, AccommodationAlert, AlertNotification
+
+# Accommodation fields the matching depends on, directly or through the territories and price_min
+MATCH_DEPENDENCIES = {
+    "published",
+    "geom",
+    "city",
+    "postal_code",
+    "city_fk",
+    "city_fk_id",
+    "department",
+    "department_id",
+    "academy",
+    "academy_id",
+    "nb_coliving_apartments",
+    "nb_accessible_apartments",
+    "price_min",
+    "price_min_t1",
+    "price_min_t1_bis",
+    "price_min_t2",
+    "price_min_t3",
+    "price_min_t4",
+    "price_min_t5",
+    "price_min_t6",
+    "price_min_t7_more",
+}
+
+
+def queue_alert_notifications(accommodation_ids):
+    """
+    Queue a notification for every alert matched by the given accommodations, in one INSERT ... SELECT. Each
+    accommodation only looks up the alerts of its city, department, academy and those without territory, with a
+    maximum price above its minimum price, on alert_match_idx, so the cost doesn't depend on the number of alerts.
+    The criteria are those of the alert counts, except for the territories which are the ones of the accommodation
+    instead of their bbox. Returns the number of notifications queued, an accommodation is queued once per alert.
+    """
+    accommodation_ids = list(accommodation_ids)
+    if not accommodation_ids:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {AlertNotification._meta.db_table} (alert_id, accommodation_id, created_at)
+            SELECT alert.id, accommodation.id, NOW()
+            FROM {Accommodation._meta.db_table} AS accommodation
+            JOIN {AccommodationAlert._meta.db_table} AS alert
+                ON alert.receive_notifications
+                AND alert.match_territory IN (
+                    'city:' || accommodation.city_fk_id,
+                    'department:' || accommodation.department_id,
+                    'academy:' || accommodation.academy_id,
+                    %(all_territories)s
+                )
+                AND alert.match_max_price >= COALESCE(accommodation.price_min, %(no_max_price)s)
+                AND (alert.has_coliving IS NOT TRUE OR accommodation.nb_coliving_apartments > 0)
+                AND (alert.is_accessible IS NOT TRUE OR accommodation.nb_accessible_apartments > 0)
+            WHERE accommodation.id = ANY(%(accommodation_ids)s)
+                AND accommodation.published
+                AND accommodation.geom IS NOT NULL
+                AND NOT EXISTS (
+                    SELECT 1 FROM {ExternalSource._meta.db_table} AS source
+                    WHERE source.accommodation_id = accommodation.id AND source.source = %(crous)s
+                )
+            ON CONFLICT DO NOTHING
+            """,
+            {
+                "accommodation_ids": accommodation_ids,
+                "all_territories": ALL_TERRITORIES,
+                "no_max_price": NO_MAX_PRICE,
+                "crous": ExternalSource.SOURCE_CROUS,
+            },
+        )
+        return cursor.rowcount
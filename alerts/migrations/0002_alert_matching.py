@@ -0,0 +1,99 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# alerts.models.NO_MAX_PRICE at the time of this migration, the max price of the alerts without one
+NO_MAX_PRICE = 2147483647
+
+
+def get_match_territory(department_id, city_id, academy_id):
+    # copy of alerts.models.get_match_territory at the time of this migration
+    if department_id:
+        return f"department:{department_id}"
+    if city_id:
+        return f"city:{city_id}"
+    if academy_id:
+        return f"academy:{academy_id}"
+    return "all"
+
+
+def populate_match_keys(apps, schema_editor):
+    AccommodationAlert = apps.get_model("alerts", "AccommodationAlert")
+    alerts = []
+    for alert in AccommodationAlert.objects.only("pk", "department_id", "city_id", "academy_id", "max_price").iterator(
+        chunk_size=2000
+    ):
+        alert.match_territory = get_match_territory(alert.department_id, alert.city_id, alert.academy_id)
+        alert.match_max_price = NO_MAX_PRICE if alert.max_price is None else alert.max_price
+        alerts.append(alert)
+    AccommodationAlert.objects.bulk_update(alerts, ["match_territory", "match_max_price"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accommodation", "0063_geography_index"),
+        ("alerts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AlertNotification",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True, verbose_name="Sent at")),
+            ],
+            options={
+                "verbose_name": "Alert notification",
+                "verbose_name_plural": "Alert notifications",
+            },
+        ),
+        migrations.AddField(
+            model_name="accommodationalert",
+            name="match_max_price",
+            field=models.PositiveIntegerField(default=2147483647, editable=False),
+        ),
+        migrations.AddField(
+            model_name="accommodationalert",
+            name="match_territory",
+            field=models.CharField(default="all", editable=False, max_length=50),
+        ),
+        migrations.RunPython(populate_match_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="accommodationalert",
+            index=models.Index(
+                condition=models.Q(("receive_notifications", True)),
+                fields=["match_territory", "match_max_price"],
+                name="alert_match_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="alertnotification",
+            name="accommodation",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="alert_notifications",
+                to="accommodation.accommodation",
+            ),
+        ),
+        migrations.AddField(
+            model_name="alertnotification",
+            name="alert",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notifications",
+                to="alerts.accommodationalert",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="alertnotification",
+            index=models.Index(
+                condition=models.Q(("sent_at", None)), fields=["alert"], name="alert_notification_pending_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="alertnotification",
+            constraint=models.UniqueConstraint(fields=("alert", "accommodation"), name="unique_alert_notification"),
+        ),
+    ]
@@ -1,9 +1,27 @@
 from django.contrib.gis.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy
 
 from account.models import Student
 from territories.models import Academy, City, Department
 
+# match_max_price of the alerts without maximum price, the largest value of a PositiveIntegerField
+NO_MAX_PRICE = 2147483647
+ALL_TERRITORIES = "all"
+
+
+def get_match_territory(department_id=None, city_id=None, academy_id=None):
+    """
+    Territory key of an alert, the department first, then the city, then the academy, as in the alert counts.
+    """
+    if department_id:
+        return f"department:{department_id}"
+    if city_id:
+        return f"city:{city_id}"
+    if academy_id:
+        return f"academy:{academy_id}"
+    return ALL_TERRITORIES
+
 
 class AccommodationAlert(models.Model):
     name = models.CharField(max_length=255, verbose_name=gettext_lazy("Name"))
@@ -50,11 +68,55 @@ class AccommodationAlert(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     receive_notifications = models.BooleanField(default=True, verbose_name=gettext_lazy("Receive notifications"))
+    # keys of the alert matching index, set on save, see alerts.matching
+    match_territory = models.CharField(max_length=50, default=ALL_TERRITORIES, editable=False)
+    match_max_price = models.PositiveIntegerField(default=NO_MAX_PRICE, editable=False)
 
     class Meta:
         verbose_name = gettext_lazy("Accommodation alert")
         verbose_name_plural = gettext_lazy("Accommodation alerts")
+        indexes = [
+            models.Index(
+                fields=["match_territory", "match_max_price"],
+                condition=Q(receive_notifications=True),
+                name="alert_match_idx",
+            ),
+        ]
 
     def __str__(self):
         localisation = self.city or self.department or self.academy
         return f"{self.student} - {localisation} - {self.has_coliving} - {self.is_accessible} - {self.max_price}"
+
+    def save(self, *args, **kwargs):
+        self.match_territory = get_match_territory(self.department_id, self.city_id, self.academy_id)
+        self.match_max_price = NO_MAX_PRICE if self.max_price is None else self.max_price
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "match_territory", "match_max_price"}
+        super().save(*args, **kwargs)
+
+
+class AlertNotification(models.Model):
+    """
+    Accommodation matching an alert, queued until it is sent to the student. An accommodation is queued once per alert.
+    """
+
+    alert = models.ForeignKey(AccommodationAlert, on_delete=models.CASCADE, related_name="notifications")
+    accommodation = models.ForeignKey(
+        "accommodation.Accommodation", on_delete=models.CASCADE, related_name="alert_notifications"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name=gettext_lazy("Sent at"))
+
+    class Meta:
+        verbose_name = gettext_lazy("Alert notification")
+        verbose_name_plural = gettext_lazy("Alert notifications")
+        constraints = [
+            models.UniqueConstraint(fields=["alert", "accommodation"], name="unique_alert_notification"),
+        ]
+        indexes = [
+            models.Index(fields=["alert"], condition=Q(sent_at=None), name="alert_notification_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.alert} - {self.accommodation_id}"
@@ -1,12 +1,19 @@
 from rest_framework import serializers
 
-from accommodation.filters import AccommodationFilter
-from accommodation.models import Accommodation
+from .counts import get_alert_counts
 from .models import AccommodationAlert
 from territories.serializers import DepartmentSerializer, AcademySerializer, CitySerializer
 from territories.models import City, Department, Academy
 
 
+class AccommodationAlertListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # the counts of all the listed alerts are computed together, get_count reads them
+        alerts = list(data.all() if hasattr(data, "all") else data)
+        self.child.alert_counts = get_alert_counts(alerts)
+        return super().to_representation(alerts)
+
+
 class AccommodationAlertSerializer(serializers.ModelSerializer):
     city = CitySerializer(read_only=True)
     department = DepartmentSerializer(read_only=True)
@@ -48,27 +55,10 @@ class AccommodationAlertSerializer(serializers.ModelSerializer):
             "max_price",
             "count",
         )
+        list_serializer_class = AccommodationAlertListSerializer
 
-    def get_count(self, obj):
-        queryset = Accommodation.objects.online_with_availibility_first()
-        data = {}
-        # filter by department, city or academy
-        if obj.department:
-            bbox = obj.department.get_bbox()
-            if bbox:
-                data["bbox"] = f"{bbox['xmin']},{bbox['ymin']},{bbox['xmax']},{bbox['ymax']}"
-        elif obj.city:
-            bbox = obj.city.get_bbox()
-            if bbox:
-                data["bbox"] = f"{bbox['xmin']},{bbox['ymin']},{bbox['xmax']},{bbox['ymax']}"
-        elif obj.academy_id:
-            data["academy_id"] = obj.academy_id
-
-        if obj.has_coliving is True:
-            data["has_coliving"] = True
-        if obj.is_accessible is True:
-            data["is_accessible"] = True
-        if obj.max_price is not None:
-            data["price_max"] = str(obj.max_price)
-        filterset = AccommodationFilter(data=data, queryset=queryset)
-        return filterset.qs.count()
+    def get_count(self, obj) -> int:
+        alert_counts = getattr(self, "alert_counts", None)
+        if alert_counts is None or obj.pk not in alert_counts:
+            return get_alert_counts([obj])[obj.pk]
+        return alert_counts[obj.pk]
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accommodation.models import Accommodation
+from accommodation.signals import accommodations_bulk_updated, register_bulk_update_dependencies
+from alerts.matching import MATCH_DEPENDENCIES, queue_alert_notifications
+
+
+# The matching runs once the transaction is committed, after the territories of the accommodations are refreshed,
+# Accommodation.save() being atomic.
+# The owner changes published as AccommodationCreatedEvent and AccommodationUpdatedEvent, the imports and the admin
+# all go through these signals.
+@receiver(post_save, sender=Accommodation)
+def match_alerts_on_accommodation_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not MATCH_DEPENDENCIES.intersection(update_fields):
+        return
+    transaction.on_commit(lambda: queue_alert_notifications([instance.pk]))
+
+
+register_bulk_update_dependencies(MATCH_DEPENDENCIES)
+
+
+@receiver(accommodations_bulk_updated, sender=Accommodation)
+def match_alerts_on_accommodations_bulk_update(sender, pks, fields, **kwargs):
+    if not MATCH_DEPENDENCIES.intersection(fields):
+        return
+    transaction.on_commit(lambda: queue_alert_notifications(pks))
@@ -65,7 +65,12 @@ class AccommodationAlertViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.filter(student=self.request.user.student)
+        # select_related ignores the territory managers, the boundaries have to be deferred here
+        return (
+            self.queryset.filter(student=self.request.user.student)
+            .select_related("city__department", "department", "academy")
+            .defer("city__boundary", "city__department__boundary", "department__boundary", "academy__boundary")
+        )
 
     def perform_create(self, serializer):
         serializer.save(student=self.request.user.student)
@@ -2,3 +2,5 @@
 
 python manage.py migrate --settings=config.settings.production
 python manage.py sync_perms --settings=config.settings.production
+python manage.py link_accommodations_to_cities --settings=config.settings.production
+python manage.py refresh_city_accommodation_stats --settings=config.settings.production
@@ -0,0 +1,92 @@
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+# one namespace per resource type, each one with a version stamp changed on every write of the resource
+ACCOMMODATIONS_NAMESPACE = "accommodations"
+TERRITORIES_NAMESPACE = "territories"
+
+
+def _version_key(namespace):
+    return f"{namespace}:version"
+
+
+def get_namespace_version(namespace):
+    """
+    Current version stamp of the namespace, created on first use. A random stamp, rather than a counter,
+    can't collide with the keys of a previous stamp if the version key is evicted.
+    """
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def invalidate_namespace(*namespaces):
+    """
+    Change the version stamp of the namespaces: the keys built with the previous one are no longer read,
+    and expire by themselves.
+    """
+    cache.set_many({_version_key(namespace): uuid.uuid4().hex for namespace in namespaces}, None)
+
+
+def invalidate_namespace_on_commit(*namespaces):
+    """
+    Invalidate the namespaces now, for the reads of the current transaction, and again once it is committed,
+    so that a value computed by another process from the data before the commit doesn't outlive it.
+    """
+    invalidate_namespace(*namespaces)
+    transaction.on_commit(lambda: invalidate_namespace(*namespaces))
+
+
+def query_params_digest(query_params, ignored=()):
+    normalized_params = sorted(
+        (key, sorted(value.strip() for value in values)) for key, values in query_params.lists() if key not in ignored
+    )
+    return hashlib.sha256(repr(normalized_params).encode()).hexdigest()
+
+
+def _versioned_key(namespace, version, parts):
+    return ":".join([namespace, version, *map(str, parts)])
+
+
+def namespaced_key(namespace, *parts):
+    return _versioned_key(namespace, get_namespace_version(namespace), parts)
+
+
+def get_or_set_namespaced(namespace, parts, default, timeout):
+    """
+    Cached value of `default()` under the current version of the namespace, computed without cache when timeout is 0.
+    """
+    if not timeout:
+        return default()
+
+    key = namespaced_key(namespace, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = default()
+        cache.set(key, value, timeout)
+    return value
+
+
+def get_or_set_many_namespaced(namespace, keys, default, timeout):
+    """
+    Cached values of several keys, given as tuples of key parts, under the current version of the namespace.
+    `default(missing_keys)` computes the missing values at once and returns them by key. Computed without cache when
+    timeout is 0.
+    """
+    if not timeout:
+        return default(keys)
+
+    version = get_namespace_version(namespace)
+    cache_keys = {_versioned_key(namespace, version, parts): parts for parts in keys}
+    values = {cache_keys[cache_key]: value for cache_key, value in cache.get_many(cache_keys).items()}
+    missing = [parts for parts in keys if parts not in values]
+    if missing:
+        computed = default(missing)
+        cache.set_many({_versioned_key(namespace, version, parts): computed[parts] for parts in missing}, timeout)
+        values.update(computed)
+    return values
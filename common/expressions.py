@@ -0,0 +1,10 @@
+from django.contrib.gis.db.models import PointField
+from django.db.models.functions import Cast
+
+
+def as_geography(field_name):
+    """
+    Cast a SRID 4326 point column to geography, so that distances are in meters and ST_DWithin can use the
+    GiST index built on the same expression.
+    """
+    return Cast(field_name, output_field=PointField(geography=True, srid=4326))
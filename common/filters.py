@@ -1,12 +1,18 @@
+from django.contrib.gis.db.models.functions import Distance as DistanceFunc
 from django.contrib.gis.geos import Point, Polygon
 from django.contrib.gis.measure import Distance
 from django_filters.rest_framework import FilterSet, filters
 from rest_framework.exceptions import ValidationError
 
+from common.expressions import as_geography
+
 
 class BaseFilter(FilterSet):
     bbox = filters.CharFilter(method="filter_bbox", label="Bounding box")
     center = filters.CharFilter(method="filter_center", label="Center point for radius filtering (lon,lat)")
+    order_by_distance = filters.BooleanFilter(
+        method="filter_order_by_distance", label="Order by distance to the center point"
+    )
 
     def filter_bbox(self, queryset, name, value):
         try:
@@ -21,8 +27,21 @@ class BaseFilter(FilterSet):
     def filter_center(self, queryset, name, value):
         try:
             lon, lat = map(float, value.split(","))
-            point = Point(lon, lat)
+            point = Point(lon, lat, srid=4326)
             radius = float(self.data.get("radius") or 10)
-            return queryset.filter(geom__distance_lte=(point, Distance(km=radius)))
         except (ValueError, TypeError):
             raise ValidationError("Invalid center format. Should be 'longitude,latitude'.")
+
+        # ST_DWithin on the geography cast uses the GiST index on the same expression
+        queryset = (
+            queryset.alias(geog=as_geography("geom"))
+            .filter(geog__dwithin=(point, Distance(km=radius)))
+            .annotate(distance=DistanceFunc("geog", point))
+        )
+        if self.form.cleaned_data.get("order_by_distance"):
+            queryset = queryset.order_by("distance")
+        return queryset
+
+    def filter_order_by_distance(self, queryset, name, value):
+        # applied by filter_center, as the distance needs the center point
+        return queryset
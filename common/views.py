@@ -0,0 +1,70 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.negotiation import BaseContentNegotiation
+
+
+def queryset_version(queryset, *updated_at_fields):
+    """
+    (last modification, *row counts) of the queryset, from the max and count of the given updated_at columns
+    in one aggregate. The counts change on deletions, which the last modification alone would miss.
+    """
+    updated_at_fields = updated_at_fields or ("updated_at",)
+    aggregates = queryset.order_by().aggregate(
+        *[Max(field) for field in updated_at_fields], *[Count(field) for field in updated_at_fields]
+    )
+    last_modified = max(filter(None, (aggregates[f"{field}__max"] for field in updated_at_fields)), default=None)
+    return (last_modified, *(aggregates[f"{field}__count"] for field in updated_at_fields))
+
+
+# Conditional GET for public read endpoints: the ETag and Last-Modified headers are derived from the version
+# returned by get_content_version(), so that a client or a CDN revalidating an unchanged resource gets a 304
+# without the data being serialized again.
+class ConditionalGetMixin:
+    cache_max_age = None
+
+    def get_content_version(self):
+        """
+        Returns a (last_modified, *extra) tuple, cheap to compute, that changes whenever the response does.
+        None disables the conditional response. Defaults to the version of the view queryset, to override when the
+        response also depends on related rows.
+        """
+        return queryset_version(self.get_queryset())
+
+    def get_cache_max_age(self):
+        return self.cache_max_age if self.cache_max_age is not None else settings.PUBLIC_API_CACHE_MAX_AGE
+
+    def get_etag(self, version):
+        key = repr((self.__class__.__name__, self.request.get_full_path(), version))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        version = self.get_content_version()
+        if version is None:
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag(version)
+        last_modified = version[0].timestamp() if version[0] else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=self.get_cache_max_age())
+        return response
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    # for binary responses (map tiles, images), errors are still rendered with the first renderer
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
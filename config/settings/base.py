@@ -110,6 +110,14 @@ DATABASES = {
 }
 DATABASES["default"]["ENGINE"] = "django.contrib.gis.db.backends.postgis"
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# CACHE_URL=redis://... shares the cache (search summaries, tiles, throttles) and the namespace versions between the
+# gunicorn workers and the cron jobs, it is required in staging and production.
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -187,6 +195,23 @@ REST_FRAMEWORK = {
     },
 }
 
+# Count and price bounds of a public accommodation search are shared between its pages for this duration
+ACCOMMODATION_SEARCH_SUMMARY_CACHE_TTL = env.int("ACCOMMODATION_SEARCH_SUMMARY_CACHE_TTL", default=60)
+# Cache-Control max-age (seconds) of the accommodation vector tiles
+ACCOMMODATION_TILE_CACHE_MAX_AGE = env.int("ACCOMMODATION_TILE_CACHE_MAX_AGE", default=300)
+# Server side cache duration of the accommodation vector tiles, they are also invalidated on accommodation writes
+ACCOMMODATION_TILE_CACHE_TTL = env.int("ACCOMMODATION_TILE_CACHE_TTL", default=3600)
+# Cache-Control max-age (seconds) of the public read endpoints, revalidated with their ETag afterwards
+PUBLIC_API_CACHE_MAX_AGE = env.int("PUBLIC_API_CACHE_MAX_AGE", default=60)
+# Cache-Control max-age (seconds) of the owner images, their URL changes with the owner
+OWNER_IMAGE_CACHE_MAX_AGE = env.int("OWNER_IMAGE_CACHE_MAX_AGE", default=7 * 24 * 3600)
+# Server side cache duration of the accommodation counts of the alerts, also invalidated on accommodation writes
+ALERT_COUNTS_CACHE_TTL = env.int("ALERT_COUNTS_CACHE_TTL", default=600)
+# Server side cache duration of the territories snapshot the autocomplete index of each worker is built from
+TERRITORY_AUTOCOMPLETE_SNAPSHOT_TTL = env.int("TERRITORY_AUTOCOMPLETE_SNAPSHOT_TTL", default=24 * 3600)
+# Interval (seconds) between two checks of the territories version by the autocomplete index of a worker
+TERRITORY_AUTOCOMPLETE_CHECK_INTERVAL = env.int("TERRITORY_AUTOCOMPLETE_CHECK_INTERVAL", default=10)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -214,6 +239,23 @@ OMOGEN_API_AUTH_PATH = env("OMOGEN_API_AUTH_PATH")
 OMOGEN_API_CLEF_APP_NAME = env("OMOGEN_API_CLEF_APP_NAME")
 OMOGEN_API_RAMSESE_APP_NAME = env("OMOGEN_API_RAMSESE_APP_NAME")
 
+# GEOCODING
+# "ban", or "fake" to geocode every address in process to the same location
+GEOCODING_BACKEND = env("GEOCODING_BACKEND", default="ban")
+GEOCODING_TIMEOUT = env.int("GEOCODING_TIMEOUT", default=10)
+# Concurrent requests of the batch geocoding, the BAN API accepts up to 50 requests per second and IP
+GEOCODING_MAX_WORKERS = env.int("GEOCODING_MAX_WORKERS", default=8)
+# Geocode the batches through the CSV endpoint of the BAN API instead of concurrent requests
+GEOCODING_USE_CSV = env.bool("GEOCODING_USE_CSV", default=False)
+# Days during which the geocoded addresses, and the addresses not found, are read from the GeocodeCache table
+GEOCODE_CACHE_TTL_DAYS = env.int("GEOCODE_CACHE_TTL_DAYS", default=90)
+GEOCODE_CACHE_NEGATIVE_TTL_DAYS = env.int("GEOCODE_CACHE_NEGATIVE_TTL_DAYS", default=7)
+
+# GEO API (communes of geo.api.gouv.fr)
+GEO_API_TIMEOUT = env.int("GEO_API_TIMEOUT", default=10)
+# Days during which the communes looked up, and the lookups without result, are read from the GeoApiCache table
+GEO_API_CACHE_TTL_DAYS = env.int("GEO_API_CACHE_TTL_DAYS", default=30)
+
 # BREVO API
 BREVO_API_KEY = env("BREVO_API_KEY")
 BREVO_CONTACT_LIST_ID = 3
@@ -222,7 +264,19 @@ BREVO_TEMPLATES_ID = {
     "magic-link": 2,
     "student-validation": 21,
     "student-password-reset": 23,
+    "alert-digest": env.int("BREVO_ALERT_DIGEST_TEMPLATE_ID", default=0),
 }
+# Minimum delay between two bulk sends, and retries of the bulk sends rejected by the rate limit or a server error
+BREVO_BULK_MIN_INTERVAL = env.float("BREVO_BULK_MIN_INTERVAL", default=0.5)
+BREVO_BULK_MAX_RETRIES = env.int("BREVO_BULK_MAX_RETRIES", default=3)
+BREVO_BULK_RETRY_DELAY = env.float("BREVO_BULK_RETRY_DELAY", default=2.0)
+
+# "brevo", or "fake" to keep the emails in memory
+EMAIL_GATEWAY = env("EMAIL_GATEWAY", default="brevo")
+# Number of students whose alert digests are rendered and sent together, up to 1000 (MAX_DIGESTS_PER_SEND)
+ALERT_DIGEST_BATCH_SIZE = env.int("ALERT_DIGEST_BATCH_SIZE", default=1000)
+# Maximum number of accommodations listed per alert in a digest
+ALERT_DIGEST_MAX_ACCOMMODATIONS = 10
 
 # IBAIL API
 IBAIL_API_AUTH_KEY = env("IBAIL_API_AUTH_KEY")
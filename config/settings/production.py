@@ -7,6 +7,11 @@ ALLOWED_HOSTS = ["mle-back-prod.osc-secnum-fr1.scalingo.io"]
 
 ENVIRONMENT = "production"
 
+# a per process cache would not see the invalidations of the other workers and of the cron jobs
+CACHES = {
+    "default": env.cache("CACHE_URL"),  # noqa: F405
+}
+
 SECURE_HSTS_SECONDS = 3600
 SECURE_SSL_REDIRECT = True
 SESSION_COOKIE_SECURE = True
@@ -22,6 +22,11 @@ FRONT_SITE_URL = "https://test.monlogementetudiant.beta.gouv.fr"
 ADMIN_SITE_URL = "https://mle-back-staging.osc-secnum-fr1.scalingo.io"
 ENVIRONMENT = "staging"
 
+# a per process cache would not see the invalidations of the other workers and of the cron jobs
+CACHES = {
+    "default": env.cache("CACHE_URL"),  # noqa: F405
+}
+
 AWS_SUFFIX_DIR = "-staging"
 
 if SENTRY_DSN is not None:  # noqa: F405
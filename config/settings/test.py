@@ -15,6 +15,19 @@ ENVIRONMENT = "test"
 FRONT_SITE_URL = "http://127.0.0.1:8000"
 ADMIN_SITE_URL = "http://127.0.0.1:8000"
 
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+ACCOMMODATION_SEARCH_SUMMARY_CACHE_TTL = 0
+ACCOMMODATION_TILE_CACHE_TTL = 0
+TERRITORY_AUTOCOMPLETE_SNAPSHOT_TTL = 0
+ALERT_COUNTS_CACHE_TTL = 0
+GEOCODE_CACHE_TTL_DAYS = 0
+GEO_API_CACHE_TTL_DAYS = 0
+BREVO_BULK_MIN_INTERVAL = 0
+BREVO_BULK_RETRY_DELAY = 0
+TERRITORY_AUTOCOMPLETE_CHECK_INTERVAL = 0
+
 _gdal = env("GDAL_LIBRARY_PATH", default=None)
 _geos = env("GEOS_LIBRARY_PATH", default=None)
 if _gdal is not None:
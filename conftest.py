@@ -12,6 +12,7 @@ from django.db import connection
 
 from accommodation.models import Accommodation
 
+from territories.autocomplete import reset_territory_index
 from territories.services import FakeCityManagerService
 
 fake = faker.Faker()
@@ -95,3 +96,10 @@ def create_owners_group():
     owners_group.permissions.set([can_view_accommodation, can_change_accommodation])
 
     return owners_group
+
+
+@pytest.fixture(autouse=True)
+def reset_autocomplete_index():
+    # the index of the worker would outlive the rollback of the territories of the test
+    yield
+    reset_territory_index()
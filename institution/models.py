@@ -1,4 +1,7 @@
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GistIndex
+
+from common.expressions import as_geography
 
 
 class EducationalInstitution(models.Model):
@@ -12,3 +15,8 @@ class EducationalInstitution(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.city})"
+
+    class Meta:
+        indexes = [
+            GistIndex(as_geography("geom"), name="institution_geog_idx"),
+        ]
@@ -27,6 +27,12 @@ from institution.serializers import EducationalInstitutionGeoSerializer
             description="Radius in kilometers for filtering educational institutions around the center point.",
             required=False,
         ),
+        OpenApiParameter(
+            "order_by_distance",
+            OpenApiTypes.BOOL,
+            description="If true, order the educational institutions by distance to the center point.",
+            required=False,
+        ),
     ],
     responses=EducationalInstitutionGeoSerializer,
 )
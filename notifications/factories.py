@@ -1,6 +1,11 @@
+from django.conf import settings
+
 from notifications.gateways.brevo_email_gateway import BrevoEmailGateway
+from notifications.gateways.fake_email_gateway import FakeEmailGateway
 from notifications.types import EmailGateway
 
 
 def get_email_gateway() -> EmailGateway:
+    if settings.EMAIL_GATEWAY == "fake":
+        return FakeEmailGateway()
     return BrevoEmailGateway()
@@ -1,9 +1,12 @@
+import time
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 import sib_api_v3_sdk
 from sib_api_v3_sdk.rest import ApiException
 
 from notifications.exceptions import EmailDeliveryError
+from notifications.types import MAX_DIGESTS_PER_SEND, DigestEmail
 
 User = get_user_model()
 
@@ -20,6 +23,7 @@ class BrevoEmailGateway:
 
         api_client = sib_api_v3_sdk.ApiClient(configuration)
         self.api = sib_api_v3_sdk.TransactionalEmailsApi(api_client)
+        self._last_bulk_request_at = None
 
     def _send(
         self,
@@ -42,6 +46,78 @@ class BrevoEmailGateway:
         except ApiException as exc:
             raise EmailDeliveryError("Failed to send email via Brevo") from exc
 
+    def _wait_for_rate_limit(self) -> None:
+        if self._last_bulk_request_at is not None:
+            elapsed = time.monotonic() - self._last_bulk_request_at
+            if elapsed < settings.BREVO_BULK_MIN_INTERVAL:
+                time.sleep(settings.BREVO_BULK_MIN_INTERVAL - elapsed)
+        self._last_bulk_request_at = time.monotonic()
+
+    def _send_versions(
+        self,
+        *,
+        digests: list[DigestEmail],
+        template_id: int,
+        tags: list[str],
+    ) -> None:
+        """
+        One request for all the digests, spaced by BREVO_BULK_MIN_INTERVAL seconds from the previous one. The request
+        rejected because of the rate limit (429) or a server error is retried with an exponential backoff.
+        """
+        email = sib_api_v3_sdk.SendSmtpEmail(
+            template_id=template_id,
+            message_versions=[
+                sib_api_v3_sdk.SendSmtpEmailMessageVersions(
+                    to=[{"email": digest.to_email, "name": digest.to_name}],
+                    params=digest.params,
+                )
+                for digest in digests
+            ],
+            tags=tags,
+        )
+
+        for attempt in range(settings.BREVO_BULK_MAX_RETRIES + 1):
+            self._wait_for_rate_limit()
+            try:
+                self.api.send_transac_email(email)
+                return
+            except ApiException as exc:
+                retryable = exc.status == 429 or (exc.status or 0) >= 500
+                if not retryable or attempt == settings.BREVO_BULK_MAX_RETRIES:
+                    raise
+
+                time.sleep(settings.BREVO_BULK_RETRY_DELAY * 2**attempt)
+
+    def _send_bulk(
+        self,
+        *,
+        digests: list[DigestEmail],
+        template_id: int,
+        tags: list[str],
+    ) -> list[DigestEmail]:
+        """
+        One request per MAX_DIGESTS_PER_SEND recipients. A request rejected as invalid (400), e.g. because of a
+        malformed recipient address, is split in halves until the rejected digests are isolated, so that they don't
+        fail the others. Returns the rejected digests.
+        """
+        rejected = []
+        batches = [
+            digests[start : start + MAX_DIGESTS_PER_SEND] for start in range(0, len(digests), MAX_DIGESTS_PER_SEND)
+        ]
+        while batches:
+            batch = batches.pop(0)
+            try:
+                self._send_versions(digests=batch, template_id=template_id, tags=tags)
+            except ApiException as exc:
+                if exc.status != 400:
+                    raise EmailDeliveryError("Failed to send emails via Brevo") from exc
+                if len(batch) == 1:
+                    rejected += batch
+                else:
+                    middle = len(batch) // 2
+                    batches[:0] = [batch[:middle], batch[middle:]]
+        return rejected
+
     # ---- Public intent-based methods ----
 
     def send_magic_link(
@@ -89,3 +165,14 @@ class BrevoEmailGateway:
             params={"RESET_LINK": reset_link},
             tags=["student-password-reset"],
         )
+
+    def send_alert_digests(
+        self,
+        *,
+        digests: list[DigestEmail],
+    ) -> list[DigestEmail]:
+        return self._send_bulk(
+            digests=digests,
+            template_id=settings.BREVO_TEMPLATES_ID["alert-digest"],
+            tags=["alert-digest"],
+        )
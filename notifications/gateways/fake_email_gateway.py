@@ -0,0 +1,27 @@
+from notifications.types import DigestEmail
+
+
+class FakeEmailGateway:
+    """
+    Email gateway keeping the sent emails in memory, for the tests and the local environments.
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    def _send(self, kind: str, **kwargs) -> None:
+        self.sent.append((kind, kwargs))
+
+    def send_magic_link(self, *, to_user, magic_link: str) -> None:
+        self._send("magic-link", to_user=to_user, magic_link=magic_link)
+
+    def send_account_validation(self, *, to_user, validation_link: str) -> None:
+        self._send("student-validation", to_user=to_user, validation_link=validation_link)
+
+    def send_reset_password(self, *, to_user, reset_link: str) -> None:
+        self._send("student-password-reset", to_user=to_user, reset_link=reset_link)
+
+    def send_alert_digests(self, *, digests: list[DigestEmail]) -> list[DigestEmail]:
+        for digest in digests:
+            self._send("alert-digest", digest=digest)
+        return []
@@ -1,5 +1,17 @@
+from dataclasses import dataclass
 from typing import Protocol
 
+# Maximum number of digests of a send_alert_digests() call, the most Brevo accepts in a single request, so that the
+# call either sends all of them, but the rejected ones, or none
+MAX_DIGESTS_PER_SEND = 1000
+
+
+@dataclass(frozen=True)
+class DigestEmail:
+    to_email: str
+    to_name: str
+    params: dict
+
 
 class EmailGateway(Protocol):
     def send_magic_link(
@@ -25,3 +37,13 @@ class EmailGateway(Protocol):
         to_name: str,
         reset_link: str,
     ) -> None: ...
+
+    def send_alert_digests(
+        self,
+        *,
+        digests: list[DigestEmail],
+    ) -> list[DigestEmail]:
+        """
+        Returns the digests rejected because of their recipient, which won't be accepted later either.
+        """
+        ...
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("qa", "0002_base_qa_and_global"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="questionanswer",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="questionanswerglobal",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
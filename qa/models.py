@@ -8,6 +8,7 @@ class BaseQuestionAnswer(models.Model):
     title_en = models.CharField(max_length=200, null=True, blank=True)
     content_fr = models.TextField()
     content_en = models.TextField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
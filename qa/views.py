@@ -3,6 +3,8 @@ from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.exceptions import NotFound
 from rest_framework.generics import ListAPIView
 
+from common.views import ConditionalGetMixin
+
 from .models import QuestionAnswer, QuestionAnswerGlobal
 from .serializers import QuestionAnswerGlobalSerializer, QuestionAnswerSerializer
 
@@ -23,7 +25,7 @@ from .serializers import QuestionAnswerGlobalSerializer, QuestionAnswerSerialize
         ),
     ]
 )
-class QuestionAnswerListByTerritoryAPIView(ListAPIView):
+class QuestionAnswerListByTerritoryAPIView(ConditionalGetMixin, ListAPIView):
     serializer_class = QuestionAnswerSerializer
     queryset = QuestionAnswer.objects.none()
     pagination_class = None
@@ -43,7 +45,7 @@ class QuestionAnswerListByTerritoryAPIView(ListAPIView):
         return QuestionAnswer.objects.filter(content_type=content_type_instance, object_id=object_id)
 
 
-class QuestionAnswerGlobalListAPIView(ListAPIView):
+class QuestionAnswerGlobalListAPIView(ConditionalGetMixin, ListAPIView):
     serializer_class = QuestionAnswerGlobalSerializer
     queryset = QuestionAnswerGlobal.objects.all()
     pagination_class = None
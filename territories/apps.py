@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TerritoriesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "territories"
+
+    def ready(self):
+        import territories.signals  # noqa: F401
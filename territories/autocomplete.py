@@ -0,0 +1,236 @@
+import hashlib
+import heapq
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from common.cache import TERRITORIES_NAMESPACE, get_or_set_namespaced
+from common.views import queryset_version
+from territories.models import BBOX_FIELDS, Academy, City, CityAccommodationStats, Department, normalize_city_search
+from territories.search import CITY_SEARCH_LIMIT, TRIGRAM_MIN_LENGTH, build_combined_territory_queryset
+
+SNAPSHOT_CACHE_KEY = "autocomplete-snapshot"
+
+TERRITORY_KINDS = ("academies", "departments", "cities")
+
+# Shorter tokens match the beginning of the words, longer ones any part of the names
+PREFIX_MAX_LENGTH = TRIGRAM_MIN_LENGTH - 1
+
+
+# columns of the snapshot rows of each kind
+ACADEMY_FIELDS = ("id", "name", *BBOX_FIELDS)
+DEPARTMENT_FIELDS = ("id", "name", "code", *BBOX_FIELDS)
+CITY_FIELDS = ("id", "name", "slug", "postal_codes", "popular", "department__code", "search_name", *BBOX_FIELDS)
+
+
+def _bbox(values):
+    return dict(zip(("xmin", "ymin", "xmax", "ymax"), values)) if values[0] is not None else None
+
+
+def academy_result(pk, name, *bbox):
+    return {"id": pk, "name": name, "bbox": _bbox(bbox)}
+
+
+def department_result(pk, name, code, *bbox):
+    return {"id": pk, "name": name, "code": code, "bbox": _bbox(bbox)}
+
+
+def city_result(pk, name, slug, postal_codes, popular, department_code, search_name, *bbox):
+    return {
+        "id": pk,
+        "name": name,
+        "slug": slug,
+        "postal_codes": postal_codes,
+        "bbox": _bbox(bbox),
+        "popular": popular,
+        "nb_total_apartments": None,
+        "price_min": None,
+        "department_code": department_code,
+    }
+
+
+def build_snapshot():
+    """
+    Compact snapshot of the fields needed by the autocomplete, as plain tuples so that it can be shared through the
+    cache. The accommodation stats of the cities are not part of it, they change with every accommodation.
+    """
+    return {
+        "academies": list(Academy.objects.order_by("name").values_list(*ACADEMY_FIELDS)),
+        "departments": list(Department.objects.order_by("name").values_list(*DEPARTMENT_FIELDS)),
+        "cities": list(City.objects.order_by("name").values_list(*CITY_FIELDS)),
+    }
+
+
+def get_territories_version():
+    """
+    Version of the territories read by the autocomplete, from the database so that the writes of the other processes,
+    e.g. the sync_cities cron, are seen by every worker.
+    """
+    return tuple(queryset_version(model.objects.all()) for model in (Academy, Department, City))
+
+
+def _trigrams(term):
+    return {term[i : i + 3] for i in range(len(term) - 2)}
+
+
+class TerritoryKindIndex:
+    """
+    Trigram and word prefix postings of the normalized names of one kind of territory. A query matches the names
+    containing all its tokens, like build_city_queryset.
+    """
+
+    def __init__(self, entries):
+        # entries: (search_name, payload) tuples
+        self.entries = entries
+        self.trigrams = defaultdict(set)
+        self.prefixes = defaultdict(set)
+        for position, (search_name, _) in enumerate(entries):
+            for trigram in _trigrams(search_name):
+                self.trigrams[trigram].add(position)
+            for word in search_name.split():
+                for length in range(1, PREFIX_MAX_LENGTH + 1):
+                    self.prefixes[word[:length]].add(position)
+
+    def _candidates(self, token):
+        if len(token) <= PREFIX_MAX_LENGTH:
+            return self.prefixes.get(token, set())
+        postings = sorted((self.trigrams.get(trigram, set()) for trigram in _trigrams(token)), key=len)
+        return {position for position in set.intersection(*postings) if token in self.entries[position][0]}
+
+    def search(self, normalized, tokens, offset, limit):
+        """
+        Returns the (offset, offset + limit) slice of the ranked matches and the offset of the next slice, None after
+        the last one. Only the first offset + limit matches are sorted.
+        """
+        if not tokens:
+            positions = range(len(self.entries))
+            page = positions[offset : offset + limit]
+        else:
+            positions = set.intersection(*(self._candidates(token) for token in tokens))
+
+            def rank(position):
+                search_name = self.entries[position][0]
+                words = search_name.split()
+                return (
+                    not search_name.startswith(normalized),
+                    -sum(token in words for token in tokens),
+                    len(search_name),
+                    search_name,
+                )
+
+            page = heapq.nsmallest(offset + limit, positions, key=rank)[offset:]
+        next_offset = offset + limit if len(positions) > offset + limit else None
+        return [self.entries[position][1] for position in page], next_offset
+
+
+class TerritoryIndex:
+    def __init__(self, snapshot):
+        self.academies = TerritoryKindIndex(
+            [(normalize_city_search(row[1]), academy_result(*row)) for row in snapshot["academies"]]
+        )
+        self.departments = TerritoryKindIndex(
+            [(normalize_city_search(row[1]), department_result(*row)) for row in snapshot["departments"]]
+        )
+        # the normalized name is the search_name column
+        self.cities = TerritoryKindIndex([(row[6], city_result(*row)) for row in snapshot["cities"]])
+
+    def search(self, raw_query, limit=CITY_SEARCH_LIMIT, offsets=None):
+        """
+        Up to `limit` academies, departments and cities matching the query from their offset in `offsets`, best
+        matches first, in the layout of TerritoryCombinedSerializer without the city accommodation stats (see
+        add_city_stats). The offsets of the next results of each kind are returned under "next_offsets".
+        """
+        offsets = offsets or {}
+        normalized = normalize_city_search(raw_query or "")
+        tokens = [token for token in normalized.split() if len(token) >= 2]
+        if normalized and not tokens:
+            return {**{kind: [] for kind in TERRITORY_KINDS}, "next_offsets": dict.fromkeys(TERRITORY_KINDS)}
+
+        results = {"next_offsets": {}}
+        for kind in TERRITORY_KINDS:
+            results[kind], results["next_offsets"][kind] = getattr(self, kind).search(
+                normalized, tokens, offsets.get(kind, 0), limit
+            )
+        results["cities"] = [dict(city) for city in results["cities"]]
+        return results
+
+
+def search_database(raw_query, limit=CITY_SEARCH_LIMIT, offsets=None):
+    """
+    Results of TerritoryIndex.search from the indexed querysets of build_combined_territory_queryset, for the requests
+    served while the index of the worker is being built. The matches are ranked by the database.
+    """
+    offsets = offsets or {}
+    # one more row of each kind tells whether there is a next slice
+    querysets = build_combined_territory_queryset(raw_query, limit + 1, offsets)
+    results = {"next_offsets": {}}
+    for kind, fields, result in (
+        ("academies", ACADEMY_FIELDS, academy_result),
+        ("departments", DEPARTMENT_FIELDS, department_result),
+        ("cities", CITY_FIELDS, city_result),
+    ):
+        rows = list(querysets[kind].values_list(*fields))
+        results[kind] = [result(*row) for row in rows[:limit]]
+        results["next_offsets"][kind] = offsets.get(kind, 0) + limit if len(rows) > limit else None
+    return results
+
+
+def add_city_stats(cities):
+    stats = {
+        city_id: (nb_total_apartments, price_min)
+        for city_id, nb_total_apartments, price_min in CityAccommodationStats.objects.filter(
+            city_id__in=[city["id"] for city in cities]
+        ).values_list("city_id", "nb_total_apartments", "price_min")
+    }
+    for city in cities:
+        city["nb_total_apartments"], city["price_min"] = stats.get(city["id"], (None, None))
+    return cities
+
+
+_lock = threading.Lock()
+_state = {"index": None, "version": None, "checked_at": 0.0, "building": False}
+
+
+def reset_territory_index():
+    """
+    Forget the index of the worker, e.g. between tests whose territories are rolled back.
+    """
+    with _lock:
+        _state.update(index=None, version=None, checked_at=0.0, building=False)
+
+
+def get_territory_index():
+    """
+    Autocomplete index of the worker, built on first use and rebuilt when the territories version changes, checked
+    at most every TERRITORY_AUTOCOMPLETE_CHECK_INTERVAL seconds. The snapshot is shared between the workers.
+
+    A single request checks the version and rebuilds the index, outside the lock: meanwhile the other requests keep
+    the previous index, or get None before the first one is built and search the database (see search_database).
+    """
+    with _lock:
+        now = time.monotonic()
+        index, indexed_version = _state["index"], _state["version"]
+        if _state["building"] or (
+            index is not None and now - _state["checked_at"] < settings.TERRITORY_AUTOCOMPLETE_CHECK_INTERVAL
+        ):
+            return index
+        _state["building"] = True
+
+    try:
+        version = get_territories_version()
+        if index is None or version != indexed_version:
+            snapshot = get_or_set_namespaced(
+                TERRITORIES_NAMESPACE,
+                (SNAPSHOT_CACHE_KEY, hashlib.md5(repr(version).encode()).hexdigest()),
+                build_snapshot,
+                settings.TERRITORY_AUTOCOMPLETE_SNAPSHOT_TTL,
+            )
+            index = TerritoryIndex(snapshot)
+        with _lock:
+            _state.update(index=index, version=version, checked_at=now)
+    finally:
+        with _lock:
+            _state["building"] = False
+    return index
@@ -0,0 +1,170 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from territories.models import GeoApiCache, normalize_city_search
+
+logger = logging.getLogger(__name__)
+
+GEO_API_URL = "https://geo.api.gouv.fr"
+COMMUNE_FIELDS = "nom,code,codesPostaux,codeDepartement,contour,codeEpci,population"
+
+
+def get_department_code(postal_code):
+    if postal_code.startswith("20"):
+        return "2A" if postal_code.startswith("200") or postal_code.startswith("201") else "2B"
+    if postal_code.startswith("97") or postal_code.startswith("98"):
+        return postal_code[:3]
+    return postal_code[:2]
+
+
+def cache_key(field, code, name=None):
+    return f"{field}:{code.strip()}:{normalize_city_search(name or '')}"
+
+
+class GeoApiCacheStore:
+    """
+    GeoApiCache rows by lookup key, they expire after `ttl`.
+    """
+
+    def __init__(self, *, ttl):
+        self.ttl = ttl
+
+    def get_many(self, keys):
+        return dict(
+            GeoApiCache.objects.filter(key__in=keys, fetched_at__gte=timezone.now() - self.ttl).values_list(
+                "key", "communes"
+            )
+        )
+
+    def set_many(self, entries):
+        now = timezone.now()
+        GeoApiCache.objects.bulk_create(
+            [GeoApiCache(key=key, communes=communes, fetched_at=now) for key, communes in entries.items()],
+            update_conflicts=True,
+            unique_fields=["key"],
+            update_fields=["communes", "fetched_at"],
+            batch_size=1000,
+        )
+
+
+class GeoApiClient:
+    """
+    Communes of geo.api.gouv.fr, through a session reusing its connections. With a `cache`, the lookups are read
+    from it before calling the API, and all the communes of a department can be prefetched in one request.
+    """
+
+    def __init__(self, *, timeout, cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+
+    def _get(self, path, params):
+        try:
+            response = self.session.get(f"{GEO_API_URL}{path}", params=params, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            logger.error("GEO API request %s failed: %s", path, exc)
+            return None
+        return response.json()
+
+    def _search(self, field, code, name=None):
+        """
+        Communes whose `field` (codePostal or code) is `code`, filtered by name by the API. None if the API failed.
+        """
+        key = cache_key(field, code, name)
+        if self.cache:
+            code_key = cache_key(field, code)
+            department_key = cache_key("departement", get_department_code(code.strip()))
+            cached = self.cache.get_many([key, code_key, department_key])
+            if key in cached:
+                return cached[key]
+            # the communes of the code, e.g. prefetched with their department, are enough for an exact name
+            if name and (code_communes := cached.get(code_key)):
+                search_name = normalize_city_search(name)
+                if communes := [c for c in code_communes if normalize_city_search(c["nom"]) == search_name]:
+                    return communes
+            # all the communes of a prefetched department are cached
+            if code_key not in cached and department_key in cached:
+                return []
+
+        params = {field: code, "fields": COMMUNE_FIELDS, "format": "json"}
+        if name:
+            params["nom"] = name
+        communes = self._get("/communes/", params)
+        if communes is not None and self.cache:
+            self.cache.set_many({key: communes})
+        return communes
+
+    def fetch_commune(self, code, name=None, strict_mode=False):
+        if communes := self._search("codePostal", code, name):
+            return communes[0]
+
+        if strict_mode:
+            return
+
+        # NOTE: this is a dirty workaround, data stored in CLEF is not clean, we can have postal or insee code in same
+        # field
+        logger.error(f"Cannot found city with postal code {code}, assuming we have an insee code here.")
+
+        if communes := self._search("code", code, name):
+            return communes[0]
+
+        logger.error(f"Cannot found city with insee code {code}")
+        return
+
+    def prefetch_departments(self, department_codes):
+        """
+        Cache all the communes of the departments by postal code and by INSEE code, with one request per department
+        not prefetched since the TTL. Does nothing without cache. Returns the number of departments fetched.
+        """
+        if not self.cache:
+            return 0
+
+        department_codes = {code for code in department_codes if code}
+        prefetched = self.cache.get_many([cache_key("departement", code) for code in department_codes])
+        nb_fetched = 0
+        for department_code in sorted(department_codes):
+            if cache_key("departement", department_code) in prefetched:
+                continue
+            communes = self._get(
+                f"/departements/{department_code}/communes", {"fields": COMMUNE_FIELDS, "format": "json"}
+            )
+            if communes is None:
+                continue
+
+            entries = defaultdict(list)
+            for commune in communes:
+                entries[cache_key("code", commune["code"])].append(commune)
+                for postal_code in commune.get("codesPostaux", []):
+                    entries[cache_key("codePostal", postal_code)].append(commune)
+            # a postal code can be shared by communes of several departments, the cached ones of the others are kept
+            for key, cached_communes in self.cache.get_many(list(entries)).items():
+                entries[key] += [c for c in cached_communes if c.get("codeDepartement") != department_code]
+            # marks the department as prefetched
+            entries[cache_key("departement", department_code)] = []
+            self.cache.set_many(entries)
+            nb_fetched += 1
+        return nb_fetched
+
+
+_lock = threading.Lock()
+_state = {"client": None}
+
+
+def get_geo_api_client() -> GeoApiClient:
+    """
+    Geo API client shared by the callers of the process.
+    """
+    with _lock:
+        if _state["client"] is None:
+            cache = None
+            if settings.GEO_API_CACHE_TTL_DAYS:
+                cache = GeoApiCacheStore(ttl=timedelta(days=settings.GEO_API_CACHE_TTL_DAYS))
+            _state["client"] = GeoApiClient(timeout=settings.GEO_API_TIMEOUT, cache=cache)
+        return _state["client"]
@@ -0,0 +1,309 @@
+import csv
+import io
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Protocol
+
+import requests
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.db.models import Q
+from django.utils import timezone
+from geopy.location import Location
+from requests.adapters import HTTPAdapter
+
+from territories.models import GeocodeCache, normalize_city_search
+
+logger = logging.getLogger(__name__)
+
+BAN_API_URL = "https://api-adresse.data.gouv.fr"
+
+# result of a search that failed after the retries, as opposed to None for an address that was not found
+UNAVAILABLE = object()
+
+# Properties of the BAN features, the CSV endpoint returns them as result_<property> columns
+BAN_PROPERTIES = ("label", "score", "id", "type", "name", "housenumber", "street", "postcode", "city", "citycode")
+
+
+class GeocodingUnavailable(Exception):
+    """Raised when the geocoder cannot be reached or is overloaded, the request can be retried."""
+
+
+class GeocodingBackend(Protocol):
+    def search(self, address: str) -> Location | None: ...
+
+    def search_batch(self, addresses: list[str]) -> dict[str, Location | None]: ...
+
+
+def normalize_address(address):
+    return " ".join(re.sub(r"[^\w]", " ", normalize_city_search(address or "")).split())
+
+
+def ban_location(feature):
+    longitude, latitude = feature["geometry"]["coordinates"]
+    return Location(feature["properties"].get("label", ""), (latitude, longitude), feature)
+
+
+class BANGeocodingBackend:
+    """
+    Base Adresse Nationale API, through a session keeping a pool of connections for the concurrent requests.
+    The locations are the ones of geopy's BANFrance, the raw BAN feature is available under `raw`.
+    """
+
+    def __init__(self, *, timeout, pool_size):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    def _request(self, method, path, **kwargs):
+        try:
+            response = self.session.request(method, f"{BAN_API_URL}{path}", timeout=self.timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            raise GeocodingUnavailable(str(exc)) from exc
+        if response.status_code == 429 or response.status_code >= 500:
+            raise GeocodingUnavailable(f"BAN API answered {response.status_code}")
+        return response
+
+    def search(self, address):
+        response = self._request("GET", "/search", params={"q": address, "limit": 1})
+        if response.status_code != 200:
+            # invalid query, e.g. too short or too long
+            return None
+        features = response.json().get("features")
+        return ban_location(features[0]) if features else None
+
+    def search_batch(self, addresses):
+        """
+        Geocode the addresses with one request to the CSV endpoint, UNAVAILABLE for all of them if it is rejected.
+        """
+        data = io.StringIO()
+        writer = csv.writer(data)
+        writer.writerow(["address"])
+        writer.writerows([address] for address in addresses)
+        response = self._request(
+            "POST", "/search/csv/", files={"data": ("addresses.csv", data.getvalue())}, data={"columns": "address"}
+        )
+        if response.status_code != 200:
+            # the whole request was rejected, e.g. too large, which doesn't tell whether the addresses exist
+            logger.warning("BAN API answered %s to a batch of %s addresses", response.status_code, len(addresses))
+            return dict.fromkeys(addresses, UNAVAILABLE)
+
+        locations = {}
+        for row in csv.DictReader(io.StringIO(response.content.decode("utf-8"))):
+            if not row.get("latitude") or not row.get("longitude"):
+                locations[row["address"]] = None
+                continue
+            feature = {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [float(row["longitude"]), float(row["latitude"])]},
+                "properties": {
+                    key: row[f"result_{key}"] for key in BAN_PROPERTIES if row.get(f"result_{key}") not in (None, "")
+                },
+            }
+            feature["properties"]["score"] = float(feature["properties"].get("score", 0))
+            locations[row["address"]] = ban_location(feature)
+        return {address: locations.get(address) for address in addresses}
+
+
+class FakeGeocodingBackend:
+    """
+    In-process backend, the addresses are geocoded from the given BAN-like features or else to a default location.
+    """
+
+    def __init__(self, features=None, default=(48.85, 2.35)):
+        self.features = features or {}
+        self.default = default
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def search(self, address):
+        with self._lock:
+            self.queries.append(address)
+        if address in self.features:
+            return ban_location(self.features[address]) if self.features[address] else None
+        if self.default is None:
+            return None
+        latitude, longitude = self.default
+        return ban_location(
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+                "properties": {"label": address, "name": address, "postcode": "", "city": ""},
+            }
+        )
+
+    def search_batch(self, addresses):
+        return {address: self.search(address) for address in addresses}
+
+
+class GeocodeCacheStore:
+    """
+    GeocodeCache rows by normalized address, the locations expire after `ttl` and the addresses not found after
+    `negative_ttl`.
+    """
+
+    def __init__(self, *, ttl, negative_ttl):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def get_many(self, addresses):
+        """
+        Fresh cached results of the addresses by address, a location or None for the addresses not found.
+        """
+        keys = {address: normalize_address(address) for address in addresses}
+        now = timezone.now()
+        entries = {
+            key: (location, properties)
+            for key, location, properties in GeocodeCache.objects.filter(address__in=set(keys.values()))
+            .filter(
+                Q(location__isnull=False, fetched_at__gte=now - self.ttl)
+                | Q(location=None, fetched_at__gte=now - self.negative_ttl)
+            )
+            .values_list("address", "location", "properties")
+        }
+
+        results = {}
+        for address, key in keys.items():
+            if key not in entries:
+                continue
+            location, properties = entries[key]
+            results[address] = (
+                ban_location(
+                    {
+                        "type": "Feature",
+                        "geometry": {"type": "Point", "coordinates": [location.x, location.y]},
+                        "properties": properties,
+                    }
+                )
+                if location
+                else None
+            )
+        return results
+
+    def set_many(self, locations):
+        now = timezone.now()
+        entries = {}
+        for address, location in locations.items():
+            if key := normalize_address(address):
+                entries[key] = GeocodeCache(
+                    address=key,
+                    location=Point(location.longitude, location.latitude, srid=4326) if location else None,
+                    properties=location.raw.get("properties", {}) if location else {},
+                    fetched_at=now,
+                )
+        GeocodeCache.objects.bulk_create(
+            entries.values(),
+            update_conflicts=True,
+            unique_fields=["address"],
+            update_fields=["location", "properties", "fetched_at"],
+        )
+
+
+class GeocodingService:
+    """
+    Geocoding of single addresses or of batches, retried when the backend is unavailable. The batches are geocoded
+    by `max_workers` concurrent requests, or through the CSV endpoint of the backend by chunks of `csv_chunk_size`.
+    With a `cache`, only the addresses missing from it are sent to the backend. The addresses are cached when they
+    are geocoded or not found, not when the backend is unavailable.
+    """
+
+    def __init__(
+        self, backend, *, max_workers=1, retries=2, retry_delay=1, use_csv=False, csv_chunk_size=1000, cache=None
+    ):
+        self.backend = backend
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.use_csv = use_csv
+        self.csv_chunk_size = csv_chunk_size
+        self.cache = cache
+
+    def _with_retries(self, search, query, description):
+        for attempt in range(self.retries + 1):
+            try:
+                return search(query)
+            except GeocodingUnavailable as exc:
+                if attempt >= self.retries:
+                    logger.warning("Geocoding failed for %s after %s attempts: %s", description, attempt + 1, exc)
+                    raise
+                time.sleep(self.retry_delay * (attempt + 1))
+
+    def _search(self, address):
+        try:
+            return address, self._with_retries(self.backend.search, address, f"'{address}'")
+        except GeocodingUnavailable:
+            return address, UNAVAILABLE
+
+    def _search_many(self, addresses):
+        if self.use_csv:
+            results = {}
+            for start in range(0, len(addresses), self.csv_chunk_size):
+                chunk = addresses[start : start + self.csv_chunk_size]
+                try:
+                    results.update(self._with_retries(self.backend.search_batch, chunk, f"{len(chunk)} addresses"))
+                except GeocodingUnavailable:
+                    pass
+            return {address: location for address, location in results.items() if location is not UNAVAILABLE}
+
+        if len(addresses) <= 1 or self.max_workers <= 1:
+            results = map(self._search, addresses)
+        else:
+            # the cache is only read and written by the calling thread
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self._search, addresses))
+        return {address: location for address, location in results if location is not UNAVAILABLE}
+
+    def geocode(self, address):
+        """
+        Location of the address, None if it is not found or if the geocoder is still unavailable after the retries.
+        """
+        return self.geocode_many([address]).get(address)
+
+    def geocode_many(self, addresses):
+        """
+        Locations of the addresses by address, None for the ones that could not be geocoded.
+        """
+        unique_addresses = list(dict.fromkeys(address for address in addresses if address))
+        locations = self.cache.get_many(unique_addresses) if self.cache and unique_addresses else {}
+        missing = [address for address in unique_addresses if address not in locations]
+        if missing:
+            searched = self._search_many(missing)
+            if self.cache and searched:
+                self.cache.set_many(searched)
+            locations.update(searched)
+        return {address: locations.get(address) for address in unique_addresses}
+
+
+_lock = threading.Lock()
+_state = {"service": None}
+
+
+def get_geocoding_service() -> GeocodingService:
+    """
+    Geocoding service shared by the callers of the process, so that they reuse the connections of its pool.
+    """
+    with _lock:
+        if _state["service"] is None:
+            if settings.GEOCODING_BACKEND == "fake":
+                backend = FakeGeocodingBackend()
+            else:
+                backend = BANGeocodingBackend(
+                    timeout=settings.GEOCODING_TIMEOUT, pool_size=settings.GEOCODING_MAX_WORKERS
+                )
+            cache = None
+            if settings.GEOCODE_CACHE_TTL_DAYS:
+                cache = GeocodeCacheStore(
+                    ttl=timedelta(days=settings.GEOCODE_CACHE_TTL_DAYS),
+                    negative_ttl=timedelta(days=settings.GEOCODE_CACHE_NEGATIVE_TTL_DAYS),
+                )
+            _state["service"] = GeocodingService(
+                backend,
+                max_workers=settings.GEOCODING_MAX_WORKERS,
+                use_csv=settings.GEOCODING_USE_CSV,
+                cache=cache,
+            )
+        return _state["service"]
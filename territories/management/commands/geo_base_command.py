@@ -1,13 +1,12 @@
 import json
-from time import sleep
 
-import requests
 from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
 from django.core.management.base import BaseCommand
-from geopy.exc import GeocoderQueryError, GeocoderServiceError, GeocoderTimedOut, GeocoderUnavailable
-from geopy.geocoders import BANFrance
 
+from territories.geo_api import get_department_code, get_geo_api_client
+from territories.geocoding import get_geocoding_service
 from territories.models import City, Department
+from territories.services import find_city
 
 
 class GeoBaseCommand(BaseCommand):
@@ -16,22 +15,26 @@ class GeoBaseCommand(BaseCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.geolocator = BANFrance(timeout=10)
+        self.geocoding_service = get_geocoding_service()
 
-    def _geocode(self, address, retries=2, retry_delay=1):
-        for attempt in range(retries + 1):
-            try:
-                return self.geolocator.geocode(address)
-            except GeocoderQueryError:
-                return None
-            except (GeocoderTimedOut, GeocoderUnavailable, GeocoderServiceError) as exc:
-                if attempt >= retries:
-                    self.stderr.write(
-                        self.style.WARNING(f"Geocoding failed for '{address}' after {retries + 1} attempts: {exc}")
-                    )
-                    return None
-                sleep(retry_delay * (attempt + 1))
-        return None
+    def _geocode(self, address):
+        return self.geocoding_service.geocode(address)
+
+    def _geocode_many(self, addresses):
+        """
+        Locations of the addresses by address, geocoded concurrently (or in CSV batches, see GEOCODING_USE_CSV)
+        before the import loops.
+        """
+        return self.geocoding_service.geocode_many(addresses)
+
+    def _prefetch_communes(self, postal_codes):
+        """
+        Cache the communes of the departments of the postal codes before the import loops, so that
+        fetch_city_from_api doesn't call geo.api.gouv.fr for each city.
+        """
+        get_geo_api_client().prefetch_departments(
+            {get_department_code(postal_code.strip()) for postal_code in postal_codes if postal_code}
+        )
 
     def _get_or_create_city(self, city, postal_code):
         # normalize city name
@@ -39,16 +42,11 @@ class GeoBaseCommand(BaseCommand):
         if not response:
             return
         city = response["nom"] if response else city
-        city_db = City.objects.filter(name__iexact=city, postal_codes__contains=[postal_code]).first()
+        city_db = find_city(city, postal_code)
         if city_db:
             return city_db
 
-        department_code = postal_code[:2]
-
-        if postal_code.startswith("20"):
-            department_code = "2A" if postal_code.startswith("200") or postal_code.startswith("201") else "2B"
-        elif postal_code.startswith("97") or postal_code.startswith("98"):
-            department_code = postal_code[:3]
+        department_code = get_department_code(postal_code)
 
         try:
             department_code = Department.objects.get(code=department_code)
@@ -62,33 +60,7 @@ class GeoBaseCommand(BaseCommand):
 
     @staticmethod
     def fetch_city_from_api(code, name=None, strict_mode=False):
-        base_api_url = "https://geo.api.gouv.fr/communes/"
-        returned_fields = "&fields=nom,codesPostaux,codeDepartement,contour,codeEpci,population&format=json"
-        filters = ""
-        if name:
-            filters = f"&nom={name}"
-
-        try:
-            response = requests.get(f"{base_api_url}?codePostal={code}{filters}{returned_fields}")
-        except requests.exceptions.ConnectTimeout:
-            print("GEO API Timeout")
-            return
-
-        if response_json := response.json():
-            return response_json[0]
-
-        if strict_mode:
-            return
-
-        # NOTE: this is a dirty workaround, data stored in CLEF is not clean, we can have postal or insee code in same field
-        print(f"Cannot found city with postal code {code}, assuming we have an insee code here.")
-
-        response = requests.get(f"{base_api_url}?code={code}{filters}{returned_fields}")
-        if response_json := response.json():
-            return response_json[0]
-
-        print(f"Cannot found city with insee code {code}")
-        return
+        return get_geo_api_client().fetch_commune(code, name, strict_mode)
 
     def fill_city_from_api(self, city):
         response = self.fetch_city_from_api(city.postal_codes[0], city.name)
@@ -3,11 +3,13 @@ from django.contrib.gis.geos import MultiPolygon, Polygon
 from django.core.management.base import BaseCommand
 
 from territories.models import Academy
+from territories.signals import deferred_territories_invalidation
 
 
 class Command(BaseCommand):
     help = "Import academies from public dataset ; currently using https://www.data.gouv.fr/fr/datasets/contour-academies-2020/#/resources -> https://www.data.gouv.fr/fr/datasets/contour-academies-2020/#/resources/46417429-430c-4886-9a0d-6dd3a040391a"
 
+    @deferred_territories_invalidation()
     def handle(self, *args, **options):
         url = "https://www.data.gouv.fr/fr/datasets/r/46417429-430c-4886-9a0d-6dd3a040391a"
         self.stdout.write("Downloading GeoJSON file...")
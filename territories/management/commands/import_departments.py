@@ -3,11 +3,13 @@ from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
 from django.core.management.base import BaseCommand
 
 from territories.models import Academy, Department
+from territories.signals import deferred_territories_invalidation
 
 
 class Command(BaseCommand):
     help = "Import departments from public dataset and populate boundaries using GeoJSON data"
 
+    @deferred_territories_invalidation()
     def handle(self, *args, **options):
         departments_url = "https://www.data.gouv.fr/fr/datasets/r/a1475d8d-e4a4-48a6-8287-f79d21c57904"
         boundaries_url = "https://raw.githubusercontent.com/gregoiredavid/france-geojson/master/departements.geojson"
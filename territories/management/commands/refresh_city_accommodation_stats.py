@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from territories.stats import refresh_all_city_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the CityAccommodationStats table from the accommodations"
+
+    def handle(self, *args, **options):
+        nb_cities = refresh_all_city_stats()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed accommodation stats of {nb_cities} cities"))
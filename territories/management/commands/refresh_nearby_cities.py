@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from territories.nearby import refresh_nearby_cities
+
+
+class Command(BaseCommand):
+    help = "Rebuild the NearbyCity table from the city centroids"
+
+    def handle(self, *args, **options):
+        nb_links = refresh_nearby_cities()
+        self.stdout.write(self.style.SUCCESS(f"Created {nb_links} nearby city links"))
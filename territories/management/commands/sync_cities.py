@@ -1,11 +1,18 @@
+from django.core.management import call_command
+
 from accommodation.models import Accommodation
+from territories.geo_api import get_geo_api_client
 from territories.management.commands.geo_base_command import GeoBaseCommand
 from territories.models import City, Department
+from territories.nearby import refresh_nearby_cities
+from territories.signals import deferred_territories_invalidation
+from territories.stats import refresh_all_city_stats
 
 
 class Command(GeoBaseCommand):
     help = "Creates French cities with boroughs (Paris, Marseille, Lyon) including all old and new INSEE codes, and other details from the API."
 
+    @deferred_territories_invalidation()
     def handle(self, *args, **kwargs):
         cities_data = [
             {
@@ -47,6 +54,9 @@ class Command(GeoBaseCommand):
             },
         ]
 
+        # the cities are filled, and the missing ones looked up, from the cached communes of their department
+        get_geo_api_client().prefetch_departments(Department.objects.values_list("code", flat=True))
+
         main_cities = []
         for city_data in cities_data:
             self.stdout.write(self.style.SUCCESS(f"✅ Creating city {city_data['name']}"))
@@ -108,3 +118,11 @@ class Command(GeoBaseCommand):
                 continue
             self.stdout.write(self.style.SUCCESS(f"✅ Created city: {city} ({postal_code})"))
             self.fill_city_from_api(new_city)
+
+        call_command("link_accommodations_to_cities")
+
+        nb_cities = refresh_all_city_stats()
+        self.stdout.write(self.style.SUCCESS(f"✅ Refreshed accommodation stats of {nb_cities} cities"))
+
+        nb_links = refresh_nearby_cities()
+        self.stdout.write(self.style.SUCCESS(f"✅ Created {nb_links} nearby city links"))
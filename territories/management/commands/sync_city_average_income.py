@@ -26,7 +26,7 @@ class Command(BaseCommand):
                 if not ((average_income := row.get("Niveau de vie médian")) and (epci_code := row["EPCI"])):
                     continue
 
-                City.objects.filter(epci_code=epci_code).update(average_income=average_income)
+                City.objects.filter(epci_code=epci_code).update(average_income=average_income, touch=True)
                 self.stdout.write(f"Updated cities with EPCI: {epci_code} (Average Income: {average_income})")
 
         self.stdout.write("Average income data import completed!")
@@ -3,6 +3,7 @@ import requests
 from django.core.management.base import BaseCommand
 from territories.models import City
 from io import StringIO
+from territories.signals import deferred_territories_invalidation
 
 CSV_URL = "https://www.data.gouv.fr/fr/datasets/r/89956da9-5b9b-41d7-8703-18dbec4d54a2"
 
@@ -10,6 +11,7 @@ CSV_URL = "https://www.data.gouv.fr/fr/datasets/r/89956da9-5b9b-41d7-8703-18dbec
 class Command(BaseCommand):
     help = "Updates the average rent per m² for cities using data from a CSV file."
 
+    @deferred_territories_invalidation()
     def handle(self, *args, **options):
         self.stdout.write(f"Downloading CSV file from {CSV_URL}")
 
@@ -2,11 +2,13 @@ import json
 import requests
 from django.core.management.base import BaseCommand
 from territories.models import City
+from territories.signals import deferred_territories_invalidation
 
 
 class Command(BaseCommand):
     help = "Updates the number of students per city using data from a JSON file available online."
 
+    @deferred_territories_invalidation()
     def handle(self, *args, **options):
         url = "https://data.enseignementsup-recherche.gouv.fr/api/explore/v2.1/catalog/datasets/fr-esr-atlas_regional-effectifs-d-etudiants-inscrits_agregeables/exports/json"
         self.stdout.write(f"Downloading file from {url}")
@@ -27,7 +29,7 @@ class Command(BaseCommand):
             return
 
         self.stdout.write("Resetting student count for all cities.")
-        City.objects.update(nb_students=0)
+        City.objects.update(nb_students=0, touch=True)
 
         for entry in data:
             if entry.get("annee_universitaire") != "2023-24":
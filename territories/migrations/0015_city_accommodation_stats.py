@@ -0,0 +1,45 @@
+# Generated by Django 4.2.27 on 2026-10-17 20:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("territories", "0014_auto_20260209_0810"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CityAccommodationStats",
+            fields=[
+                (
+                    "city",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="accommodation_stats",
+                        serialize=False,
+                        to="territories.city",
+                    ),
+                ),
+                ("nb_accommodations", models.PositiveIntegerField(default=0)),
+                ("nb_total_apartments", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_coliving_apartments", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_t1", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_t1_bis", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_t2", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_t3", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_t4", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_t5", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_t6", models.PositiveIntegerField(blank=True, null=True)),
+                ("nb_t7_more", models.PositiveIntegerField(blank=True, null=True)),
+                ("price_min", models.PositiveIntegerField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "City accommodation stats",
+                "verbose_name_plural": "City accommodation stats",
+            },
+        ),
+    ]
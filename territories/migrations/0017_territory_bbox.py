@@ -0,0 +1,92 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:07
+
+from django.db import migrations, models
+from django.db.models import F, FloatField, Func
+
+BBOX_FUNCTIONS = {
+    "bbox_xmin": "ST_XMin",
+    "bbox_ymin": "ST_YMin",
+    "bbox_xmax": "ST_XMax",
+    "bbox_ymax": "ST_YMax",
+}
+
+
+def populate_bbox(apps, schema_editor):
+    for model_name in ("Academy", "Department", "City"):
+        model = apps.get_model("territories", model_name)
+        model.objects.exclude(boundary=None).update(
+            **{
+                field: Func(F("boundary"), function=function, output_field=FloatField())
+                for field, function in BBOX_FUNCTIONS.items()
+            }
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("territories", "0016_territory_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="academy",
+            name="bbox_xmax",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="academy",
+            name="bbox_xmin",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="academy",
+            name="bbox_ymax",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="academy",
+            name="bbox_ymin",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="bbox_xmax",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="bbox_xmin",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="bbox_ymax",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="bbox_ymin",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="department",
+            name="bbox_xmax",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="department",
+            name="bbox_xmin",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="department",
+            name="bbox_ymax",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="department",
+            name="bbox_ymin",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_bbox, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("territories", "0017_territory_bbox"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="academy",
+            options={"base_manager_name": "objects", "verbose_name": "Academy", "verbose_name_plural": "Academies"},
+        ),
+        migrations.AlterModelOptions(
+            name="city",
+            options={"base_manager_name": "objects", "verbose_name": "City", "verbose_name_plural": "Cities"},
+        ),
+        migrations.AlterModelOptions(
+            name="department",
+            options={
+                "base_manager_name": "objects",
+                "verbose_name": "Department",
+                "verbose_name_plural": "Departments",
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:13
+
+import re
+import unicodedata
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+# copy of territories.models.normalize_city_search at the time of this migration
+def normalize_city_search(term):
+    term = term.replace("œ", "oe").replace("æ", "ae")
+
+    term = unicodedata.normalize("NFKD", term)
+    term = "".join(c for c in term if not unicodedata.combining(c))
+    term = term.lower()
+    term = re.sub(r"\b(st|ste)\b", "saint", term)
+    term = re.sub(r"[-_]", " ", term)
+    term = re.sub(r"\s+", " ", term)
+    return term.strip()
+
+
+def populate_search_fields(apps, schema_editor):
+    City = apps.get_model("territories", "City")
+    cities = []
+    for city in City.objects.only("pk", "name").iterator(chunk_size=2000):
+        city.search_name = normalize_city_search(city.name)
+        cities.append(city)
+    City.objects.bulk_update(cities, ["search_name"], batch_size=2000)
+    City.objects.update(search_vector=django.contrib.postgres.search.SearchVector("search_name", config="simple"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("territories", "0018_territory_base_manager"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="city",
+            name="search_name",
+            field=models.CharField(default="", editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_search_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="city",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(models.F("search_name"), name="gin_trgm_ops"),
+                name="city_search_name_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="city",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(models.F("search_name"), name="varchar_pattern_ops"),
+                name="city_search_name_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="city",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="city_search_vector_idx"),
+        ),
+        # --- the city search no longer uses the unaccented name indexes of 0014 ---
+        migrations.RunSQL(
+            sql="""
+                DROP INDEX IF EXISTS city_name_fts_unaccent_idx;
+                DROP INDEX IF EXISTS city_name_trgm_idx;
+            """,
+            reverse_sql="""
+                CREATE INDEX IF NOT EXISTS city_name_fts_unaccent_idx
+                ON territories_city
+                USING gin (
+                    to_tsvector('simple', immutable_unaccent(name))
+                );
+                CREATE INDEX IF NOT EXISTS city_name_trgm_idx
+                ON territories_city
+                USING gin (immutable_unaccent(name) gin_trgm_ops);
+            """,
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:19
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.contrib.gis.db.models.functions import Centroid
+from django.db import migrations, models
+
+
+def populate_centroid(apps, schema_editor):
+    City = apps.get_model("territories", "City")
+    City.objects.exclude(boundary=None).update(centroid=Centroid("boundary"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("territories", "0019_city_search_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="city",
+            name="centroid",
+            field=django.contrib.gis.db.models.fields.PointField(editable=False, null=True, srid=4326),
+        ),
+        migrations.RunPython(populate_centroid, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="NearbyCity",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("rank", models.PositiveSmallIntegerField()),
+                (
+                    "city",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="nearby_links", to="territories.city"
+                    ),
+                ),
+                (
+                    "nearby_city",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="territories.city"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Nearby city",
+                "verbose_name_plural": "Nearby cities",
+                "unique_together": {("city", "rank")},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:30
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("territories", "0020_city_centroid_nearbycity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GeocodeCache",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("address", models.TextField(unique=True)),
+                ("location", django.contrib.gis.db.models.fields.PointField(blank=True, null=True, srid=4326)),
+                ("properties", models.JSONField(blank=True, default=dict)),
+                ("fetched_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Geocode cache",
+                "verbose_name_plural": "Geocode cache",
+            },
+        ),
+    ]
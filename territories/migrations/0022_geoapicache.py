@@ -0,0 +1,25 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("territories", "0021_geocodecache"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GeoApiCache",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.TextField(unique=True)),
+                ("communes", models.JSONField(blank=True, default=list)),
+                ("fetched_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Geo API cache",
+                "verbose_name_plural": "Geo API cache",
+            },
+        ),
+    ]
@@ -1,8 +1,10 @@
-from django.db.models import Min, Sum
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from accommodation.models import Accommodation
+from territories.models import CityAccommodationStats
+from territories.stats import STATS_SUM_FIELDS
+
+CITY_STATS_FIELDS = [*STATS_SUM_FIELDS, "price_min"]
 
 
 class BBoxMixin(serializers.ModelSerializer):
@@ -31,52 +33,12 @@ class CityMixin(serializers.ModelSerializer):
     price_min = serializers.SerializerMethodField()
 
     def _get_city_stats(self, obj):
-        if not hasattr(self, "_city_stats_cache"):
-            self._city_stats_cache = {}
-
-        if obj.id not in self._city_stats_cache:
-            qs = Accommodation.objects.filter(city__iexact=obj.name, postal_code__in=obj.postal_codes)
-
-            stats = qs.aggregate(
-                nb_total_apartments=Sum("nb_total_apartments"),
-                nb_coliving_apartments=Sum("nb_coliving_apartments"),
-                nb_t1=Sum("nb_t1"),
-                nb_t1_bis=Sum("nb_t1_bis"),
-                nb_t2=Sum("nb_t2"),
-                nb_t3=Sum("nb_t3"),
-                nb_t4=Sum("nb_t4"),
-                nb_t5=Sum("nb_t5"),
-                nb_t6=Sum("nb_t6"),
-                nb_t7_more=Sum("nb_t7_more"),
-                price_min_t1=Min("price_min_t1"),
-                price_min_t1_bis=Min("price_min_t1_bis"),
-                price_min_t2=Min("price_min_t2"),
-                price_min_t3=Min("price_min_t3"),
-                price_min_t4=Min("price_min_t4"),
-                price_min_t5=Min("price_min_t5"),
-                price_min_t6=Min("price_min_t6"),
-                price_min_t7_more=Min("price_min_t7_more"),
-            )
-
-            price_candidates = [
-                p
-                for p in [
-                    stats.get("price_min_t1"),
-                    stats.get("price_min_t1_bis"),
-                    stats.get("price_min_t2"),
-                    stats.get("price_min_t3"),
-                    stats.get("price_min_t4"),
-                    stats.get("price_min_t5"),
-                    stats.get("price_min_t6"),
-                    stats.get("price_min_t7_more"),
-                ]
-                if p is not None
-            ]
-
-            stats["price_min"] = min(price_candidates) if price_candidates else None
-            self._city_stats_cache[obj.id] = stats
-
-        return self._city_stats_cache[obj.id]
+        # stats are materialized in CityAccommodationStats, select_related("accommodation_stats") avoids N+1 queries
+        try:
+            stats = obj.accommodation_stats
+        except CityAccommodationStats.DoesNotExist:
+            stats = None
+        return {field: getattr(stats, field, None) for field in CITY_STATS_FIELDS}
 
     @extend_schema_field(serializers.IntegerField(help_text="Number of T1 apartments in the city"))
     def get_nb_t1(self, obj):
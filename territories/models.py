@@ -1,14 +1,79 @@
+import re
+import unicodedata
+
 from autoslug import AutoSlugField
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db.models import F, FloatField, Func, Value
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy
 
+BBOX_FIELDS = ("bbox_xmin", "bbox_ymin", "bbox_xmax", "bbox_ymax")
+
+
+def bbox_expressions():
+    """
+    SQL expressions of the bbox columns, computed from the boundary.
+    """
+    functions = ("ST_XMin", "ST_YMin", "ST_XMax", "ST_YMax")
+    return {
+        field: Func(F("boundary"), function=function, output_field=FloatField())
+        for field, function in zip(BBOX_FIELDS, functions)
+    }
+
+
+def normalize_city_search(term: str) -> str:
+    term = term.replace("œ", "oe").replace("æ", "ae")
+
+    term = unicodedata.normalize("NFKD", term)
+    term = "".join(c for c in term if not unicodedata.combining(c))
+    term = term.lower()
+    term = re.sub(r"\b(st|ste)\b", "saint", term)
+    term = re.sub(r"[-_]", " ", term)
+    term = re.sub(r"\s+", " ", term)
+    return term.strip()
+
+
+def search_vector_expression(search_name):
+    return SearchVector(Value(search_name), config="simple")
+
+
+class TerritoryQuerySet(models.QuerySet):
+    def with_boundary(self):
+        return self.defer(None)
+
+    def update(self, *, touch=False, **kwargs):
+        # auto_now is only applied by save(), the callers changing the served content pass touch=True, the
+        # conditional GET of the cities relies on updated_at
+        if touch:
+            kwargs.setdefault("updated_at", timezone.now())
+        return super().update(**kwargs)
+
+
+class TerritoryManager(models.Manager.from_queryset(TerritoryQuerySet)):
+    # boundaries weigh up to megabytes and are only needed by spatial queries, which use the column in SQL
+    def get_queryset(self):
+        return super().get_queryset().defer("boundary")
+
 
 class Territory(models.Model):
     name = models.CharField(max_length=200)
     boundary = models.MultiPolygonField(null=True)
+    # extent of the boundary, stored so that serializing a territory doesn't need to load its boundary
+    bbox_xmin = models.FloatField(null=True, editable=False)
+    bbox_ymin = models.FloatField(null=True, editable=False)
+    bbox_xmax = models.FloatField(null=True, editable=False)
+    bbox_ymax = models.FloatField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TerritoryManager()
+
+    # fields computed from the boundary by set_boundary_fields() when it is saved
+    boundary_fields = BBOX_FIELDS
 
     class Meta:
         abstract = True
@@ -18,23 +83,65 @@ class Territory(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_boundary = instance._get_boundary_key()
+        return instance
+
+    def _get_boundary_key(self):
+        if "boundary" in self.get_deferred_fields() or not self.boundary:
+            return None
+        return bytes(self.boundary.ewkb)
+
+    def boundary_changed(self):
+        """
+        Whether the boundary differs from the one loaded or last saved, False when it is deferred.
+        """
+        return self._get_boundary_key() != getattr(self, "_loaded_boundary", None)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        boundary_loaded = "boundary" not in self.get_deferred_fields()
+        if boundary_loaded and (update_fields is None or "boundary" in update_fields):
+            self.set_boundary_fields()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.boundary_fields}
+        super().save(*args, **kwargs)
+        # after post_save, whose receivers can check boundary_changed()
+        if update_fields is None or "boundary" in update_fields:
+            self._loaded_boundary = self._get_boundary_key()
+
+    def set_boundary_fields(self):
+        self.set_bbox()
+
     def get_content_type(self):
         return ContentType.objects.get_for_model(self.__class__)
 
+    def set_bbox(self):
+        extent = self.boundary.extent if self.boundary else (None, None, None, None)
+        for field, value in zip(BBOX_FIELDS, extent):
+            setattr(self, field, value)
+
     def get_bbox(self):
-        if self.boundary:
-            extent = self.boundary.extent
+        if self.bbox_xmin is not None:
             return {
-                "xmin": extent[0],
-                "ymin": extent[1],
-                "xmax": extent[2],
-                "ymax": extent[3],
+                "xmin": self.bbox_xmin,
+                "ymin": self.bbox_ymin,
+                "xmax": self.bbox_xmax,
+                "ymax": self.bbox_ymax,
             }
         return None
 
 
 class Country(Territory):
     boundary = None
+    bbox_xmin = None
+    bbox_ymin = None
+    bbox_xmax = None
+    bbox_ymax = None
+
+    objects = models.Manager()
 
     def __str__(self):
         return self.name
@@ -51,6 +158,7 @@ class Academy(Territory):
     class Meta:
         verbose_name = gettext_lazy("Academy")
         verbose_name_plural = gettext_lazy("Academies")
+        base_manager_name = "objects"
 
 
 class Department(Territory):
@@ -63,6 +171,7 @@ class Department(Territory):
     class Meta:
         verbose_name = gettext_lazy("Department")
         verbose_name_plural = gettext_lazy("Departments")
+        base_manager_name = "objects"
 
 
 class City(Territory):
@@ -79,13 +188,110 @@ class City(Territory):
     nb_students = models.PositiveIntegerField(null=True, blank=True)
     average_rent = models.FloatField(null=True, blank=True)
     slug = AutoSlugField(max_length=255, default="", unique=True, populate_from="name")
+    # name normalized with normalize_city_search and its tsvector, both indexed for the city search
+    search_name = models.CharField(max_length=200, default="", editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # centroid of the boundary, its spatial index serves the nearest cities (KNN) queries
+    centroid = models.PointField(null=True, editable=False)
+
+    boundary_fields = (*BBOX_FIELDS, "centroid")
 
     def __str__(self):
         return f"{self.name} ({', '.join(self.postal_codes)})"
 
+    def set_boundary_fields(self):
+        super().set_boundary_fields()
+        self.centroid = self.boundary.centroid if self.boundary else None
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "name" in update_fields:
+            self.search_name = normalize_city_search(self.name)
+            self.search_vector = search_vector_expression(self.search_name)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_name", "search_vector"}
+        super().save(*args, **kwargs)
+
     def get_absolute_detail_api_url(self):
         return reverse("city-detail", kwargs={"slug": self.slug})
 
     class Meta:
         verbose_name = gettext_lazy("City")
         verbose_name_plural = gettext_lazy("Cities")
+        base_manager_name = "objects"
+        indexes = [
+            GinIndex(OpClass(F("search_name"), name="gin_trgm_ops"), name="city_search_name_trgm_idx"),
+            models.Index(OpClass(F("search_name"), name="varchar_pattern_ops"), name="city_search_name_prefix_idx"),
+            GinIndex(fields=["search_vector"], name="city_search_vector_idx"),
+        ]
+
+
+class NearbyCity(models.Model):
+    # closest cities of each city by centroid distance, rebuilt by sync_cities, see territories.nearby
+    city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="nearby_links")
+    nearby_city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        return f"{self.nearby_city_id} is the #{self.rank} nearest city of {self.city_id}"
+
+    class Meta:
+        verbose_name = gettext_lazy("Nearby city")
+        verbose_name_plural = gettext_lazy("Nearby cities")
+        unique_together = ("city", "rank")
+
+
+class CityAccommodationStats(models.Model):
+    # denormalized aggregates of the accommodations located in the city, see territories.stats
+    city = models.OneToOneField(City, on_delete=models.CASCADE, primary_key=True, related_name="accommodation_stats")
+    nb_accommodations = models.PositiveIntegerField(default=0)
+    nb_total_apartments = models.PositiveIntegerField(null=True, blank=True)
+    nb_coliving_apartments = models.PositiveIntegerField(null=True, blank=True)
+    nb_t1 = models.PositiveIntegerField(null=True, blank=True)
+    nb_t1_bis = models.PositiveIntegerField(null=True, blank=True)
+    nb_t2 = models.PositiveIntegerField(null=True, blank=True)
+    nb_t3 = models.PositiveIntegerField(null=True, blank=True)
+    nb_t4 = models.PositiveIntegerField(null=True, blank=True)
+    nb_t5 = models.PositiveIntegerField(null=True, blank=True)
+    nb_t6 = models.PositiveIntegerField(null=True, blank=True)
+    nb_t7_more = models.PositiveIntegerField(null=True, blank=True)
+    price_min = models.PositiveIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for {self.city}"
+
+    class Meta:
+        verbose_name = gettext_lazy("City accommodation stats")
+        verbose_name_plural = gettext_lazy("City accommodation stats")
+
+
+class GeocodeCache(models.Model):
+    # geocoding results by normalized address, an empty location records an address the geocoder didn't find,
+    # see territories.geocoding
+    address = models.TextField(unique=True)
+    location = models.PointField(null=True, blank=True)
+    properties = models.JSONField(default=dict, blank=True)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.address
+
+    class Meta:
+        verbose_name = gettext_lazy("Geocode cache")
+        verbose_name_plural = gettext_lazy("Geocode cache")
+
+
+class GeoApiCache(models.Model):
+    # geo.api.gouv.fr communes by lookup key, e.g. "codePostal:75001:paris", an empty list records a lookup without
+    # result, see territories.geo_api
+    key = models.TextField(unique=True)
+    communes = models.JSONField(default=list, blank=True)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.key
+
+    class Meta:
+        verbose_name = gettext_lazy("Geo API cache")
+        verbose_name_plural = gettext_lazy("Geo API cache")
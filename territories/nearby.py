@@ -0,0 +1,64 @@
+from django.contrib.gis.db.models.functions import GeometryDistance
+from django.db import connection, transaction
+
+from common.cache import TERRITORIES_NAMESPACE, invalidate_namespace_on_commit
+from territories.models import City, NearbyCity
+
+NEARBY_CITIES_COUNT = 7
+
+
+def get_nearby_cities(city, count=NEARBY_CITIES_COUNT):
+    """
+    Nearest cities of the given one, from the NearbyCity table when it has been built, otherwise ordered by the
+    KNN operator (<->) on the indexed centroids.
+    """
+    if city.centroid is None:
+        return []
+
+    links = (
+        NearbyCity.objects.filter(city=city)
+        .select_related("nearby_city")
+        .only("nearby_city__name", "nearby_city__slug")
+        .order_by("rank")
+    )
+    nearby_cities = [link.nearby_city for link in links[:count]]
+    if nearby_cities:
+        return nearby_cities
+
+    return list(
+        City.objects.exclude(pk=city.pk)
+        .exclude(centroid=None)
+        .only("name", "slug")
+        .order_by(GeometryDistance("centroid", city.centroid))[:count]
+    )
+
+
+@transaction.atomic
+def refresh_nearby_cities(count=NEARBY_CITIES_COUNT):
+    """
+    Rebuild the whole NearbyCity table in one statement, with a lateral KNN query per city on the centroid index.
+    Returns the number of rows created.
+    """
+    NearbyCity.objects.all().delete()
+    city_table = City._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {NearbyCity._meta.db_table} (city_id, nearby_city_id, rank)
+            SELECT city.id, nearest.id, nearest.rank
+            FROM {city_table} AS city
+            CROSS JOIN LATERAL unnest(
+                ARRAY(
+                    SELECT other.id
+                    FROM {city_table} AS other
+                    WHERE other.id <> city.id AND other.centroid IS NOT NULL
+                    ORDER BY other.centroid <-> city.centroid
+                    LIMIT %s
+                )
+            ) WITH ORDINALITY AS nearest(id, rank)
+            WHERE city.centroid IS NOT NULL
+            """,
+            [count],
+        )
+        invalidate_namespace_on_commit(TERRITORIES_NAMESPACE)
+        return cursor.rowcount
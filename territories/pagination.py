@@ -0,0 +1,67 @@
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import replace_query_param
+
+from territories.autocomplete import TERRITORY_KINDS
+
+
+class TerritorySearchPagination(BasePagination):
+    """
+    Limit and opaque cursors, one per kind of territory, for the combined territory search. The limit applies to each
+    kind and is capped server side, whatever the client asks for.
+    """
+
+    limit_query_param = "limit"
+    default_limit = 20
+    max_limit = 50
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_cursor_query_param(self, kind):
+        return f"{kind}_cursor"
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(limit, self.max_limit) if limit > 0 else self.default_limit
+
+    def decode_cursor(self, request, kind):
+        encoded = request.query_params.get(self.get_cursor_query_param(kind))
+        if encoded is None:
+            return 0
+        try:
+            querystring = b64decode(encoded.encode("ascii"), validate=True).decode("ascii")
+            offset = int(parse.parse_qs(querystring)["o"][0])
+        except (UnicodeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if offset < 0:
+            raise NotFound(self.invalid_cursor_message)
+        return offset
+
+    def encode_cursor(self, offset):
+        return b64encode(parse.urlencode({"o": offset}).encode("ascii")).decode("ascii")
+
+    def paginate_search(self, search, raw_query, request):
+        """
+        Results of `search(raw_query, limit, offsets)`, TerritoryIndex.search or search_database, from the cursors
+        of the request.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        offsets = {kind: self.decode_cursor(request, kind) for kind in TERRITORY_KINDS}
+        results = search(raw_query, limit=self.limit, offsets=offsets)
+        self.next_offsets = results.pop("next_offsets")
+        return results
+
+    def get_next_link(self, kind):
+        if self.next_offsets[kind] is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.get_cursor_query_param(kind), self.encode_cursor(self.next_offsets[kind]))
+
+    def get_next_links(self):
+        return {kind: self.get_next_link(kind) for kind in TERRITORY_KINDS}
@@ -1,36 +1,31 @@
-from django.db.models import FloatField, Func, F, Value, When, Case
+from django.db.models import FloatField, Func, F, Q, Value, When, Case
 from django.db.models.functions import Greatest
 from django.contrib.postgres.search import (
-    SearchVector,
     SearchQuery,
     SearchRank,
 )
 
-import re
-import unicodedata
 from django.db.models import QuerySet
-from territories.models import Academy, City, Department
+from territories.models import Academy, City, Department, normalize_city_search
 from unidecode import unidecode
 
+# maximum number of cities returned by the city search
+CITY_SEARCH_LIMIT = 20
+
+# shorter queries match the beginning of the names only: trigram indexes can't serve them, the prefix index can
+TRIGRAM_MIN_LENGTH = 3
+
 
 class ImmutableUnaccent(Func):
     function = "immutable_unaccent"
     template = "%(function)s(%(expressions)s)"
 
 
-def normalize_city_search(term: str) -> str:
-    term = term.replace("œ", "oe").replace("æ", "ae")
-
-    term = unicodedata.normalize("NFKD", term)
-    term = "".join(c for c in term if not unicodedata.combining(c))
-    term = term.lower()
-    term = re.sub(r"\b(st|ste)\b", "saint", term)
-    term = re.sub(r"[-_]", " ", term)
-    term = re.sub(r"\s+", " ", term)
-    return term.strip()
-
-
-def build_city_queryset(raw_query: str) -> QuerySet:
+def rank_cities(raw_query: str) -> QuerySet:
+    """
+    Cities whose normalized name contains all the tokens of the query, best matches first. The filters and the
+    ranking use the stored search_name and search_vector columns and their indexes.
+    """
     if not raw_query or not raw_query.strip():
         return City.objects.none()
 
@@ -40,18 +35,23 @@ def build_city_queryset(raw_query: str) -> QuerySet:
     if not tokens:
         return City.objects.none()
 
+    if len(normalized) < TRIGRAM_MIN_LENGTH:
+        qs = City.objects.filter(search_name__startswith=normalized)
+    else:
+        # --- Accent-insensitive AND filtering, on the trigram index ---
+        qs = City.objects.filter(*[Q(search_name__contains=token) for token in tokens])
+
     # --- FTS for ranking only ---
-    vector = SearchVector(ImmutableUnaccent("name"), config="simple")
     query = SearchQuery(
         normalized,
         config="simple",
         search_type="plain",
     )
 
-    qs = City.objects.annotate(
-        fts_rank=SearchRank(vector, query),
+    qs = qs.annotate(
+        fts_rank=SearchRank(F("search_vector"), query),
         prefix_rank=Case(
-            When(name__istartswith=normalized, then=Value(1.0)),
+            When(search_name__startswith=normalized, then=Value(1.0)),
             default=Value(0.0),
             output_field=FloatField(),
         ),
@@ -61,26 +61,26 @@ def build_city_queryset(raw_query: str) -> QuerySet:
         ),
     )
 
-    # --- Accent-insensitive AND filtering ---
-    where_clauses = []
-    params = []
+    return qs.order_by("-rank", "name")
 
-    for token in tokens:
-        where_clauses.append("immutable_unaccent(name) ILIKE %s")
-        params.append(f"%{token}%")
 
-    qs = qs.extra(
-        where=where_clauses,
-        params=params,
-    )
-
-    return qs.order_by("-rank", "name")
+def build_city_queryset(raw_query: str, limit: int = CITY_SEARCH_LIMIT, offset: int = 0) -> QuerySet:
+    """
+    At most `limit` of the cities of rank_cities(), from `offset`.
+    """
+    return rank_cities(raw_query)[offset : offset + limit]
 
 
-def build_combined_territory_queryset(raw_query: str) -> dict[str, QuerySet]:
+def build_combined_territory_queryset(
+    raw_query: str, limit: int = CITY_SEARCH_LIMIT, offsets: dict[str, int] | None = None
+) -> dict[str, QuerySet]:
+    """
+    At most `limit` academies, departments and cities matching the query, each kind from its offset in `offsets`.
+    """
+    offsets = offsets or {}
     academies = Academy.objects.all()
     departments = Department.objects.all()
-    cities = City.objects.all()
+    cities = City.objects.order_by("name")
 
     if raw_query:
         decoded_query = unidecode(raw_query)
@@ -90,10 +90,12 @@ def build_combined_territory_queryset(raw_query: str) -> dict[str, QuerySet]:
         departments = Department.objects.annotate(name_unaccent=ImmutableUnaccent("name")).filter(
             name_unaccent__icontains=decoded_query
         )
-        cities = build_city_queryset(raw_query)
+        cities = rank_cities(raw_query)
 
-    return {
-        "academies": academies,
-        "departments": departments,
-        "cities": cities,
+    # the serializers use the stored bbox, the boundaries are not needed
+    querysets = {
+        "academies": academies.order_by("name").defer("boundary"),
+        "departments": departments.order_by("name").defer("boundary"),
+        "cities": cities.select_related("department", "accommodation_stats").defer("boundary", "department__boundary"),
     }
+    return {kind: queryset[offsets.get(kind, 0) : offsets.get(kind, 0) + limit] for kind, queryset in querysets.items()}
@@ -1,9 +1,9 @@
-from django.contrib.gis.db.models.functions import Distance
 from drf_spectacular.utils import OpenApiTypes, extend_schema_field
 from rest_framework import serializers
 
 from .mixins import BBoxMixin, CityMixin
 from .models import Academy, City, Department
+from .nearby import get_nearby_cities
 
 
 class NearbyCitySerializer(serializers.ModelSerializer):
@@ -17,14 +17,7 @@ class CityDetailSerializer(BBoxMixin, CityMixin):
 
     @extend_schema_field(NearbyCitySerializer(many=True))
     def get_nearby_cities(self, obj):
-        if not obj.boundary:
-            return []
-        cities = (
-            City.objects.exclude(pk=obj.pk)
-            .annotate(distance=Distance("boundary", obj.boundary.centroid))
-            .order_by("distance")
-        )
-        return NearbyCitySerializer(cities[:7], many=True).data
+        return NearbyCitySerializer(get_nearby_cities(obj), many=True).data
 
     class Meta:
         model = City
@@ -113,11 +106,34 @@ class TerritorySerializer(serializers.Serializer):
         return {}
 
 
+class CitySearchSerializer(serializers.Serializer):
+    # lean city of the territory search results, without the CityMixin stats methods
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    slug = serializers.SlugField()
+    postal_codes = serializers.ListField(child=serializers.CharField())
+    bbox = serializers.DictField(
+        child=serializers.FloatField(),
+        allow_null=True,
+        help_text="Bounding box with xmin, ymin, xmax, ymax coordinates",
+    )
+    popular = serializers.BooleanField()
+    nb_total_apartments = serializers.IntegerField(allow_null=True)
+    price_min = serializers.IntegerField(allow_null=True)
+    department_code = serializers.CharField()
+
+
+class TerritorySearchNextSerializer(serializers.Serializer):
+    academies = serializers.URLField(allow_null=True)
+    departments = serializers.URLField(allow_null=True)
+    cities = serializers.URLField(allow_null=True)
+
+
 class TerritoryCombinedSerializer(serializers.Serializer):
     academies = AcademySerializer(many=True)
     departments = DepartmentSerializer(many=True)
-    cities = CityListSerializer(many=True)
-    cities = CityListSerializer(many=True)
+    cities = CitySearchSerializer(many=True)
+    next = TerritorySearchNextSerializer(help_text="Links to the next results of each kind, null after the last ones")
 
 
 class NewsletterSubscriptionSerializer(serializers.Serializer):
@@ -1,5 +1,4 @@
 import logging
-import requests
 import sib_api_v3_sdk
 import json
 from django.conf import settings
@@ -8,6 +7,7 @@ from typing import Protocol
 
 from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
 
+from territories.geo_api import get_department_code, get_geo_api_client
 from territories.models import Academy, City, Department
 
 configuration = sib_api_v3_sdk.Configuration()
@@ -33,39 +33,29 @@ def sync_newsletter_subscription_to_brevo(email, territory_type, territory_name,
 
 
 class CityManagerServiceProtocol(Protocol):
-    def get_or_create_city(self, city, postal_code) -> City: ...
-
+    def find_city(self, city, postal_code) -> City | None: ...
 
-class CityManagerService:
-    @staticmethod
-    def fetch_city_from_api(code, name=None, strict_mode=False):
-        base_api_url = "https://geo.api.gouv.fr/communes/"
-        returned_fields = "&fields=nom,codesPostaux,codeDepartement,contour,codeEpci,population&format=json"
-        filters = ""
-        if name:
-            filters = f"&nom={name}"
+    def get_or_create_city(self, city, postal_code) -> City: ...
 
-        try:
-            response = requests.get(f"{base_api_url}?codePostal={code}{filters}{returned_fields}")
-        except requests.exceptions.ConnectTimeout:
-            logger.error("GEO API Timeout")
-            return
 
-        if response_json := response.json():
-            return response_json[0]
+def find_city(city, postal_code):
+    if not city or not postal_code:
+        return None
+    return (
+        City.objects.select_related("department")
+        .filter(name__iexact=city, postal_codes__contains=[postal_code])
+        .first()
+    )
 
-        if strict_mode:
-            return
 
-        # NOTE: this is a dirty workaround, data stored in CLEF is not clean, we can have postal or insee code in same field
-        logger.error(f"Cannot found city with postal code {code}, assuming we have an insee code here.")
-
-        response = requests.get(f"{base_api_url}?code={code}{filters}{returned_fields}")
-        if response_json := response.json():
-            return response_json[0]
+class CityManagerService:
+    @staticmethod
+    def find_city(city, postal_code):
+        return find_city(city, postal_code)
 
-        logger.error(f"Cannot found city with insee code {code}")
-        return
+    @staticmethod
+    def fetch_city_from_api(code, name=None, strict_mode=False):
+        return get_geo_api_client().fetch_commune(code, name, strict_mode)
 
     def get_or_create_city(self, city, postal_code):
         # normalize city name
@@ -73,16 +63,11 @@ class CityManagerService:
         if not response:
             return
         city = response["nom"] if response else city
-        city_db = City.objects.filter(name__iexact=city, postal_codes__contains=[postal_code]).first()
+        city_db = self.find_city(city, postal_code)
         if city_db:
             return city_db
 
-        department_code = postal_code[:2]
-
-        if postal_code.startswith("20"):
-            department_code = "2A" if postal_code.startswith("200") or postal_code.startswith("201") else "2B"
-        elif postal_code.startswith("97") or postal_code.startswith("98"):
-            department_code = postal_code[:3]
+        department_code = get_department_code(postal_code)
 
         try:
             department_code = Department.objects.get(code=department_code)
@@ -119,6 +104,10 @@ class CityManagerService:
 
 
 class FakeCityManagerService:
+    @staticmethod
+    def find_city(city, postal_code):
+        return find_city(city, postal_code)
+
     def get_or_create_city(self, city, postal_code) -> City:
         academy, _ = Academy.objects.get_or_create(name="Academy 1")
         department, _ = Department.objects.get_or_create(name="Department 1", academy=academy)
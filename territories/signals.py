@@ -0,0 +1,105 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accommodation.models import Accommodation
+from accommodation.signals import accommodations_bulk_updated, register_bulk_update_dependencies
+from common.cache import TERRITORIES_NAMESPACE, invalidate_namespace_on_commit
+from territories.models import Academy, City, Department
+from territories.stats import STATS_COLUMNS, STATS_DEPENDENCIES, refresh_city_stats
+
+# territory writes of the current thread whose invalidation is deferred, see deferred_territories_invalidation()
+_invalidation = threading.local()
+
+
+@receiver(pre_save, sender=Accommodation)
+def track_previous_accommodation_stats_values(sender, instance, update_fields=None, **kwargs):
+    instance._previous_stats_values = None
+    if instance.pk and (update_fields is None or STATS_DEPENDENCIES.intersection(update_fields)):
+        instance._previous_stats_values = Accommodation.objects.filter(pk=instance.pk).values(*STATS_COLUMNS).first()
+
+
+@receiver(post_save, sender=Accommodation)
+def refresh_stats_on_accommodation_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not STATS_DEPENDENCIES.intersection(update_fields):
+        return
+
+    # e.g. most of the imported rows, saved again with the same values
+    previous_values = getattr(instance, "_previous_stats_values", None)
+    if previous_values is not None:
+        # the deferred fields are not saved, so unchanged
+        loaded_values = {column: instance.__dict__[column] for column in STATS_COLUMNS if column in instance.__dict__}
+        if all(previous_values[column] == value for column, value in loaded_values.items()):
+            return
+
+    # once committed, after the territories refresh of Accommodation.save() which can set city_fk from geom
+    previous_city_id = previous_values["city_fk_id"] if previous_values else None
+    transaction.on_commit(lambda: refresh_city_stats({previous_city_id, instance.city_fk_id}))
+
+
+@receiver(post_delete, sender=Accommodation)
+def refresh_stats_on_accommodation_delete(sender, instance, **kwargs):
+    refresh_city_stats({instance.city_fk_id})
+
+
+register_bulk_update_dependencies(STATS_DEPENDENCIES)
+
+
+@receiver(accommodations_bulk_updated, sender=Accommodation)
+def refresh_stats_on_accommodations_bulk_update(sender, pks, fields, previous_city_ids, **kwargs):
+    if not STATS_DEPENDENCIES.intersection(fields):
+        return
+
+    city_ids = set(previous_city_ids)
+    if {"city_fk", "city_fk_id", "geom"}.intersection(fields):
+        city_ids |= set(Accommodation.objects.filter(pk__in=pks).values_list("city_fk_id", flat=True).distinct())
+    refresh_city_stats(city_ids)
+
+
+@receiver(post_save, sender=Academy)
+@receiver(post_save, sender=Department)
+def refresh_accommodation_territories_on_boundary_save(sender, instance, update_fields=None, **kwargs):
+    # e.g. the renames and the writes of the synced fields keep the boundary
+    if update_fields is not None and "boundary" not in update_fields:
+        return
+    if not instance.boundary_changed():
+        return
+
+    field_name = "academy" if sender is Academy else "department"
+    query = Q(**{field_name: instance})
+    if instance.boundary:
+        query |= Q(geom__within=instance.boundary)
+    Accommodation.objects.filter(query).refresh_territories()
+
+
+@receiver(post_save, sender=Academy)
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=Academy)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=City)
+def invalidate_territories_on_write(sender, instance, **kwargs):
+    # the territory sync commands and the admin go through save(), the autocomplete indexes are rebuilt afterwards
+    if getattr(_invalidation, "deferred", False):
+        return
+    invalidate_namespace_on_commit(TERRITORIES_NAMESPACE)
+
+
+@contextmanager
+def deferred_territories_invalidation():
+    """
+    Invalidate the territories namespace once at the end, rather than on each territory write, for the sync commands
+    which save thousands of territories. Also usable as a decorator of their handle().
+    """
+    previously_deferred = getattr(_invalidation, "deferred", False)
+    _invalidation.deferred = True
+    try:
+        yield
+    finally:
+        _invalidation.deferred = previously_deferred
+        if not previously_deferred:
+            invalidate_namespace_on_commit(TERRITORIES_NAMESPACE)
@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+
+from accommodation.models import Accommodation
+from territories.models import CityAccommodationStats
+
+STATS_SUM_FIELDS = [
+    "nb_total_apartments",
+    "nb_coliving_apartments",
+    "nb_t1",
+    "nb_t1_bis",
+    "nb_t2",
+    "nb_t3",
+    "nb_t4",
+    "nb_t5",
+    "nb_t6",
+    "nb_t7_more",
+]
+
+STATS_PRICE_FIELDS = [
+    "price_min_t1",
+    "price_min_t1_bis",
+    "price_min_t2",
+    "price_min_t3",
+    "price_min_t4",
+    "price_min_t5",
+    "price_min_t6",
+    "price_min_t7_more",
+]
+
+# Accommodation columns the city stats depend on, geom through the city_fk found from it when there is none
+STATS_COLUMNS = ["city_fk_id", "geom", *STATS_SUM_FIELDS, *STATS_PRICE_FIELDS]
+STATS_DEPENDENCIES = {"city_fk", *STATS_COLUMNS}
+
+
+def _stats_aggregates():
+    return {
+        "nb_accommodations": Count("pk"),
+        **{field: Sum(field) for field in STATS_SUM_FIELDS},
+        **{field: Min(field) for field in STATS_PRICE_FIELDS},
+    }
+
+
+def _build_stats(city_id, aggregates):
+    price_candidates = [aggregates[field] for field in STATS_PRICE_FIELDS if aggregates[field] is not None]
+    return CityAccommodationStats(
+        city_id=city_id,
+        nb_accommodations=aggregates["nb_accommodations"],
+        price_min=min(price_candidates) if price_candidates else None,
+        **{field: aggregates[field] for field in STATS_SUM_FIELDS},
+    )
+
+
+def _aggregate_by_city(queryset):
+    return queryset.order_by().values("city_fk_id").annotate(**_stats_aggregates())
+
+
+def refresh_city_stats(city_ids):
+    """
+    Refresh the stats of the given cities with one aggregate grouped by city_fk. None ids are ignored.
+    """
+    city_ids = {city_id for city_id in city_ids if city_id is not None}
+    if not city_ids:
+        return
+
+    stats = {
+        row["city_fk_id"]: _build_stats(row["city_fk_id"], row)
+        for row in _aggregate_by_city(Accommodation.objects.filter(city_fk_id__in=city_ids))
+    }
+    # cities without any accommodation have no stats row, serializers then return None values
+    CityAccommodationStats.objects.filter(city_id__in=city_ids - stats.keys()).delete()
+    for city_stats in stats.values():
+        city_stats.save()
+
+
+@transaction.atomic
+def refresh_all_city_stats():
+    """
+    Rebuild the whole CityAccommodationStats table with one aggregate grouped by city_fk.
+    Returns the number of cities with stats.
+    """
+    stats = [
+        _build_stats(row["city_fk_id"], row)
+        for row in _aggregate_by_city(Accommodation.objects.filter(city_fk__isnull=False))
+    ]
+    CityAccommodationStats.objects.exclude(city_id__in=[city_stats.city_id for city_stats in stats]).delete()
+    CityAccommodationStats.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=["city"],
+        update_fields=["nb_accommodations", "price_min", "updated_at", *STATS_SUM_FIELDS],
+    )
+    return len(stats)
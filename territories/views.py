@@ -2,19 +2,23 @@ from django.db.models import Func, F
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status
-from rest_framework.generics import RetrieveAPIView
+from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.cache import TERRITORIES_NAMESPACE, get_namespace_version
+from common.views import ConditionalGetMixin, queryset_version
 from territories.models import Academy, City, Department
 from territories.serializers import CityDetailSerializer, NewsletterSubscriptionSerializer
 from territories.services import sync_newsletter_subscription_to_brevo
-from territories.search import build_combined_territory_queryset
+from territories.autocomplete import TERRITORY_KINDS, add_city_stats, get_territory_index, search_database
+from territories.pagination import TerritorySearchPagination
 from .serializers import AcademySerializer, CityListSerializer, DepartmentSerializer, TerritoryCombinedSerializer
 
 
 class TerritoryCombinedListAPIView(APIView):
     serializer_class = TerritoryCombinedSerializer
+    pagination_class = TerritorySearchPagination
 
     @extend_schema(
         parameters=[
@@ -22,87 +26,115 @@ class TerritoryCombinedListAPIView(APIView):
                 name="q",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Term to filter academies, departments, and cities by name (case-insensitive, accent-insensitive).",
+                description="Term to filter academies, departments, and cities by name (case-insensitive, "
+                "accent-insensitive). Words of a single character are ignored, a term without a word of at least 2 "
+                "characters returns no results. Results are sorted by relevance.",
                 required=True,
             ),
+            OpenApiParameter(
+                name=TerritorySearchPagination.limit_query_param,
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description=f"Number of results of each kind, {TerritorySearchPagination.default_limit} by default, "
+                f"at most {TerritorySearchPagination.max_limit}.",
+                required=False,
+            ),
+            *(
+                OpenApiParameter(
+                    name=TerritorySearchPagination().get_cursor_query_param(kind),
+                    type=str,
+                    location=OpenApiParameter.QUERY,
+                    description=f"Cursor of the next {kind}, from the `next` links of the previous response.",
+                    required=False,
+                )
+                for kind in TERRITORY_KINDS
+            ),
         ]
     )
     def get(self, request, *args, **kwargs):
         raw_query = request.GET["q"]
 
-        combined_queryset = build_combined_territory_queryset(raw_query)
-        data = {
-            "academies": combined_queryset["academies"],
-            "departments": combined_queryset["departments"],
-            "cities": combined_queryset["cities"],
-        }
-
-        serializer = TerritoryCombinedSerializer(data)
-        return Response(serializer.data)
+        # served from the in-memory index, in the layout of TerritoryCombinedSerializer, or from the database while
+        # another request builds the first index of the worker
+        index = get_territory_index()
+        paginator = self.pagination_class()
+        data = paginator.paginate_search(index.search if index is not None else search_database, raw_query, request)
+        add_city_stats(data["cities"])
+        data["next"] = paginator.get_next_links()
+        return Response(data)
 
 
-class AcademyListAPIView(APIView):
+class AcademyListAPIView(ConditionalGetMixin, ListAPIView):
     serializer_class = AcademySerializer
+    pagination_class = None
 
-    def get(self, request, *args, **kwargs):
-        academies = Academy.objects.annotate(name_unaccent=Func(F("name"), function="unaccent")).order_by(
-            "name_unaccent"
+    def get_queryset(self):
+        return (
+            Academy.objects.defer("boundary")
+            .annotate(name_unaccent=Func(F("name"), function="unaccent"))
+            .order_by("name_unaccent")
         )
 
-        serializer = AcademySerializer(academies, many=True)
-        return Response(serializer.data)
+    def get_content_version(self):
+        return queryset_version(Academy.objects.all())
 
 
-class DepartmentListAPIView(APIView):
+class DepartmentListAPIView(ConditionalGetMixin, ListAPIView):
     serializer_class = DepartmentSerializer
-
-    def get(self, request, *args, **kwargs):
-        departments = Department.objects.all().order_by("name")
-
-        serializer = DepartmentSerializer(departments, many=True)
-        return Response(serializer.data)
-
-
-class CityListAPIView(APIView):
+    pagination_class = None
+
+    def get_queryset(self):
+        return Department.objects.defer("boundary").order_by("name")
+
+    def get_content_version(self):
+        return queryset_version(Department.objects.all())
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="department",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Department code to filter cities (for example: 75).",
+            required=False,
+        ),
+        OpenApiParameter(
+            name="popular",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description="Filter popular cities. Use true/false.",
+            required=False,
+        ),
+    ]
+)
+class CityListAPIView(ConditionalGetMixin, ListAPIView):
     serializer_class = CityListSerializer
+    pagination_class = None
 
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name="department",
-                type=str,
-                location=OpenApiParameter.QUERY,
-                description="Department code to filter cities (for example: 75).",
-                required=False,
-            ),
-            OpenApiParameter(
-                name="popular",
-                type=bool,
-                location=OpenApiParameter.QUERY,
-                description="Filter popular cities. Use true/false.",
-                required=False,
-            ),
-        ]
-    )
-    def get(self, request, *args, **kwargs):
-        cities = City.objects.all()
+    def get_queryset(self):
+        cities = City.objects.select_related("department", "accommodation_stats").defer(
+            "boundary", "department__boundary"
+        )
 
-        if department := (request.GET.get("department") or None):
+        if department := (self.request.GET.get("department") or None):
             cities = cities.filter(department__code=department)
 
-        if popular := (request.GET.get("popular") or None):
+        if popular := (self.request.GET.get("popular") or None):
             if popular.lower() == "true":
                 cities = cities.filter(popular=True)
             elif popular.lower() == "false":
                 cities = cities.filter(popular=False)
 
         cities.order_by("name")
-        serializer = CityListSerializer(cities, many=True)
-        return Response(serializer.data)
+        return cities
 
+    def get_content_version(self):
+        return queryset_version(self.get_queryset(), "updated_at", "accommodation_stats__updated_at")
 
-class CityDetailView(RetrieveAPIView):
-    queryset = City.objects.all()
+
+class CityDetailView(ConditionalGetMixin, RetrieveAPIView):
+    queryset = City.objects.select_related("accommodation_stats")
     serializer_class = CityDetailSerializer
     lookup_field = "slug"
 
@@ -110,6 +142,15 @@ class CityDetailView(RetrieveAPIView):
         slug = self.kwargs.get(self.lookup_field)
         return get_object_or_404(self.queryset, slug=slug)
 
+    def get_content_version(self):
+        city = City.objects.filter(slug=self.kwargs.get(self.lookup_field))
+        # nearby_cities depends on the other cities, their writes and refresh_nearby_cities change the territories
+        # namespace version
+        return (
+            *queryset_version(city, "updated_at", "accommodation_stats__updated_at"),
+            get_namespace_version(TERRITORIES_NAMESPACE),
+        )
+
 
 class NewsletterSubscriptionAPIView(APIView):
     @extend_schema(
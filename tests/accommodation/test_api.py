@@ -1,9 +1,10 @@
-import base64
 from contextlib import contextmanager
 from unittest.mock import ANY, patch
 
 from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -50,9 +51,11 @@ class AccommodationDetailAPITests(APITestCase):
         assert result["description"] == self.accommodation_published.description
         assert result["geom"]["coordinates"] == [2.35, 48.85]
         assert result["owner"]["name"] == "Bailleur1"
-        assert result["owner"]["image_base64"] == "data:image/jpeg;base64,{}".format(
-            base64.b64encode(b"Bailleur1 logo").decode("utf-8")
+        owner = self.accommodation_published.owner
+        assert result["owner"]["image_url"].startswith(
+            f"http://testserver{reverse('owner-image', kwargs={'slug': owner.slug})}?v="
         )
+        assert "image_base64" not in result["owner"]
         assert result["external_url"] == "https://bailleur1.com/residence"
         assert result["available"] is True
         assert result["nb_total_apartments"] == self.accommodation_published.nb_total_apartments
@@ -70,6 +73,32 @@ class AccommodationDetailAPITests(APITestCase):
         assert result["accept_waiting_list"] is False
         assert result["scholarship_holders_priority"] is False
 
+    def test_accommodation_detail_conditional_get(self):
+        url = reverse("accommodation-detail", kwargs={"slug": self.accommodation_published.slug})
+        response = self.client.get(url)
+
+        assert response.status_code == 200
+        assert "public" in response["Cache-Control"]
+        etag = response["ETag"]
+        assert response["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert not response.content
+
+        Accommodation.objects.filter(pk=self.accommodation_published.pk).update(nb_t1_available=0, touch=True)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert response.json()["nb_t1_available"] == 0
+
+        etag = response["ETag"]
+        self.accommodation_published.owner.name = "Bailleur renommé"
+        self.accommodation_published.owner.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["owner"]["name"] == "Bailleur renommé"
+
     def test_accommodation_detail_not_found_if_unpublished(self):
         response = self.client.get(
             reverse("accommodation-detail", kwargs={"slug": self.accommodation_unpublished.slug})
@@ -82,6 +111,20 @@ class AccommodationDetailAPITests(APITestCase):
 
         assert response.status_code == 404
 
+    def test_accommodation_detail_price_range(self):
+        # price_max is the highest of all the min and max prices, so a residence with a single price has a range
+        accommodation = AccommodationFactory(price_min_t1=300, price_min_t2=450, price_max_t2=0)
+        result = self.client.get(reverse("accommodation-detail", kwargs={"slug": accommodation.slug})).json()
+        assert (result["price_min"], result["price_max"]) == (300, 450)
+
+        accommodation = AccommodationFactory(price_min_t1=300)
+        result = self.client.get(reverse("accommodation-detail", kwargs={"slug": accommodation.slug})).json()
+        assert (result["price_min"], result["price_max"]) == (300, 300)
+
+        accommodation = AccommodationFactory()
+        result = self.client.get(reverse("accommodation-detail", kwargs={"slug": accommodation.slug})).json()
+        assert (result["price_min"], result["price_max"]) == (None, None)
+
 
 class AccommodationListAPITests(APITestCase):
     def setUp(self):
@@ -263,6 +306,34 @@ class AccommodationListAPITests(APITestCase):
         assert "page=2" in next_url
         assert "page_size=30" in next_url
 
+    @override_settings(ACCOMMODATION_SEARCH_SUMMARY_CACHE_TTL=60)
+    def test_accommodation_list_search_summary_shared_between_pages(self):
+        cache.clear()
+        for _ in range(40):
+            AccommodationFactory(geom=Point(2.0, 48.0), published=True, price_min_t1=100)
+
+        response = self.client.get(reverse("accommodation-list"), {"price_max": 500})
+        assert response.json()["count"] == 42
+
+        with patch("accommodation.pagination.PricingAggregates") as mock_pricing_aggregates:
+            response = self.client.get(reverse("accommodation-list"), {"price_max": 500, "page": 2})
+
+        mock_pricing_aggregates.assert_not_called()
+        data = response.json()
+        assert data["count"] == 42
+        assert data["min_price"] == 100
+        assert len(data["results"]["features"]) == 12
+
+        # writing an accommodation invalidates the cached summaries
+        AccommodationFactory(geom=Point(2.0, 48.0), published=True, price_min_t1=100)
+        response = self.client.get(reverse("accommodation-list"), {"price_max": 500, "page": 2})
+        assert response.json()["count"] == 43
+
+        Accommodation.objects.filter(price_min_t1=100).update(published=False)
+        response = self.client.get(reverse("accommodation-list"), {"price_max": 500})
+        assert response.json()["count"] == 2
+        cache.clear()
+
     def test_accommodation_list_center_radius(self):
         center = "-1.5536,47.2184"  # Nantes (near the accessible accommodation)
 
@@ -297,6 +368,101 @@ class AccommodationListAPITests(APITestCase):
         assert self.accommodation_nantes_accessible_w_coliving_cheap.id not in returned_ids
         assert self.accommodation_nantes_non_accessible_expensive.id not in returned_ids
 
+    def test_accommodation_list_slim_view(self):
+        full = self.client.get(reverse("accommodation-list")).json()
+        response = self.client.get(reverse("accommodation-list"), {"view": "slim"})
+
+        assert response.status_code == 200
+        results = response.json()
+        assert results["count"] == full["count"]
+        assert results["min_price"] == full["min_price"]
+        assert results["max_price"] == full["max_price"]
+
+        features = results["results"]["features"]
+        assert [feature["id"] for feature in features] == [feature["id"] for feature in full["results"]["features"]]
+        cheap = next(f for f in features if f["id"] == self.accommodation_nantes_accessible_w_coliving_cheap.id)
+        assert cheap["type"] == "Feature"
+        assert cheap["geometry"] == {"type": "Point", "coordinates": [-1.5536, 47.2184]}
+        assert cheap["properties"]["price_min"] == 300
+        assert cheap["properties"]["total_available"] == 2
+        assert "nb_t1_available" not in cheap["properties"]
+
+    def test_accommodation_list_slim_fields(self):
+        response = self.client.get(reverse("accommodation-list"), {"fields": "name,price_min"})
+
+        assert response.status_code == 200
+        feature = response.json()["results"]["features"][0]
+        assert set(feature["properties"]) == {"name", "price_min"}
+
+        response = self.client.get(reverse("accommodation-list"), {"fields": "name,description"})
+        assert response.status_code == 400
+        assert "description" in response.json()["fields"]
+
+    def test_accommodation_list_center_order_by_distance(self):
+        for center, expected_ids in (
+            (
+                "-1.5536,47.2184",
+                [
+                    self.accommodation_nantes_accessible_w_coliving_cheap.id,
+                    self.accommodation_nantes_non_accessible_expensive.id,
+                ],
+            ),
+            (
+                "-1.5530,47.2150",
+                [
+                    self.accommodation_nantes_non_accessible_expensive.id,
+                    self.accommodation_nantes_accessible_w_coliving_cheap.id,
+                ],
+            ),
+        ):
+            response = self.client.get(
+                reverse("accommodation-list"), {"center": center, "radius": 2, "order_by_distance": True}
+            )
+            returned_ids = [feature["id"] for feature in response.json()["results"]["features"]]
+            assert returned_ids == expected_ids
+
+    def test_accommodation_clusters(self):
+        url = reverse("accommodation-clusters")
+        bbox = "-1.60,47.20,-1.50,47.30"  # Nantes
+
+        response = self.client.get(url, {"bbox": bbox, "zoom": 5})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"count": 2, "longitude": ANY, "latitude": ANY, "min_price": 300}]
+        cluster = response.json()[0]
+        assert -1.5536 <= cluster["longitude"] <= -1.5530
+        assert 47.2150 <= cluster["latitude"] <= 47.2184
+
+        response = self.client.get(url, {"bbox": bbox, "zoom": 22})
+        assert sorted(cluster["min_price"] for cluster in response.json()) == [300, 800]
+
+        response = self.client.get(url, {"bbox": bbox, "zoom": 5, "is_accessible": True})
+        assert response.json() == [{"count": 1, "longitude": -1.5536, "latitude": 47.2184, "min_price": 300}]
+
+        response = self.client.get(url, {"bbox": bbox})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = self.client.get(url, {"zoom": 5})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_accommodation_tile(self):
+        url = reverse("accommodation-tile", kwargs={"z": 10, "x": 518, "y": 352})
+
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/vnd.mapbox-vector-tile"
+        assert "public" in response["Cache-Control"]
+        assert len(response.content) > 0
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = self.client.get(url, {"price_max": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b""
+
+        response = self.client.get(reverse("accommodation-tile", kwargs={"z": 1, "x": 2, "y": 0}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_accommodations_sorting_nominal(self):
         accommodation_with_availibility = AccommodationFactory(geom=Point(2.35, 48.85), nb_t1_bis_available=1)
 
@@ -492,6 +658,15 @@ class MyAccommodationListAPITests(APITestCase):
         assert self.my_accommodation_1.slug in slugs
         assert self.my_accommodation_2.slug not in slugs
 
+    def test_my_accommodation_list_slim_view(self):
+        response = self.client.get(reverse("my-accommodation-list"), {"view": "slim", "search": "paris"})
+        assert response.status_code == status.HTTP_200_OK
+
+        results = response.json()["results"]["features"]
+        assert len(results) == 1
+        assert "paris" in results[0]["properties"]["name"].lower()
+        assert "description" not in results[0]["properties"]
+
 
 class MyAccommodationDetailAPITests(APITestCase):
     @contextmanager
@@ -601,6 +776,9 @@ class MyAccommodationDetailAPITests(APITestCase):
         assert acc.geom.y == 48.85
         assert acc.owner == self.owner
         assert acc.images_urls == ["https://cdn.example.com/fake-image.jpg"]
+        assert acc.city_fk.name == "Paris"
+        assert acc.department_id == acc.city_fk.department_id
+        assert acc.academy_id == acc.city_fk.department.academy_id
 
     def test_get_my_accommodation(self):
         url = reverse("my-accommodation-detail", args=[self.my_accommodation.slug])
@@ -867,6 +1045,19 @@ class FavoriteAccommodationViewSetTests(APITestCase):
         assert len(results) == 1
         assert results[0]["accommodation"]["id"] == self.accommodation.id
 
+    def test_list_favorite_accommodations_slim_view(self):
+        url = reverse("favorite-accommodation-list")
+        self.client.post(url, {"accommodation_slug": self.accommodation.slug}, format="json")
+
+        response = self.client.get(url, {"view": "slim"})
+        assert response.status_code == status.HTTP_200_OK
+
+        results = response.json()["results"]
+        assert len(results) == 1
+        assert results[0]["accommodation"]["id"] == self.accommodation.id
+        assert results[0]["accommodation"]["properties"]["name"] == "My Favorite Accommodation"
+        assert results[0]["geom"] == {"type": "Point", "coordinates": [2.35, 48.85]}
+
     def test_delete_favorite_accommodation(self):
         url = reverse("favorite-accommodation-list")
         payload = {"accommodation_slug": self.accommodation.slug}
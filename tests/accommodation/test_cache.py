@@ -0,0 +1,56 @@
+from unittest.mock import Mock, patch
+
+from django.contrib.gis.geos import Point
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accommodation.admin import unpublish_accommodations
+from accommodation.models import Accommodation
+from common.cache import ACCOMMODATIONS_NAMESPACE, get_namespace_version, get_or_set_namespaced
+
+from .factories import AccommodationFactory
+
+
+class AccommodationsCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.accommodation = AccommodationFactory(geom=Point(2.35, 48.85), published=True)
+
+    def tearDown(self):
+        cache.clear()
+
+    def assert_invalidated(self, write):
+        version = get_namespace_version(ACCOMMODATIONS_NAMESPACE)
+        write()
+        self.assertNotEqual(get_namespace_version(ACCOMMODATIONS_NAMESPACE), version)
+
+    def test_namespaced_values_follow_the_version(self):
+        self.assertEqual(get_or_set_namespaced(ACCOMMODATIONS_NAMESPACE, ("key",), lambda: 1, 60), 1)
+        self.assertEqual(get_or_set_namespaced(ACCOMMODATIONS_NAMESPACE, ("key",), lambda: 2, 60), 1)
+
+        self.accommodation.save()
+        self.assertEqual(get_or_set_namespaced(ACCOMMODATIONS_NAMESPACE, ("key",), lambda: 3, 60), 3)
+        self.assertEqual(get_or_set_namespaced(ACCOMMODATIONS_NAMESPACE, ("key",), lambda: 4, 0), 4)
+
+    def test_writes_invalidate_the_namespace(self):
+        queryset = Accommodation.objects.filter(pk=self.accommodation.pk)
+
+        self.assert_invalidated(self.accommodation.save)
+        self.assert_invalidated(lambda: queryset.update(name="Résidence"))
+        self.assert_invalidated(lambda: queryset.update(nb_t1_available=3))
+        self.assert_invalidated(lambda: unpublish_accommodations(Mock(), None, queryset))
+        self.assert_invalidated(self.accommodation.delete)
+
+    @override_settings(ACCOMMODATION_TILE_CACHE_TTL=60)
+    def test_tile_cached_until_accommodations_change(self):
+        url = reverse("accommodation-tile", kwargs={"z": 10, "x": 518, "y": 352})
+        tile = self.client.get(url).content
+        self.assertTrue(tile)
+
+        with patch("accommodation.views.build_accommodation_tile") as mock_build_tile:
+            self.assertEqual(self.client.get(url).content, tile)
+        mock_build_tile.assert_not_called()
+
+        Accommodation.objects.filter(pk=self.accommodation.pk).update(published=False)
+        self.assertEqual(self.client.get(url).content, b"")
@@ -0,0 +1,23 @@
+import pytest
+from django.core.management import call_command
+
+from tests.accommodation.factories import AccommodationFactory
+from tests.territories.factories import CityFactory
+
+
+@pytest.mark.django_db
+def test_link_accommodations_to_cities():
+    city = CityFactory(name="Lyon", postal_codes=["69001", "69002"])
+    linked = AccommodationFactory(city="lyon", postal_code="69002")
+    unknown = AccommodationFactory(city="Lyon", postal_code="75001")
+
+    call_command("link_accommodations_to_cities")
+
+    linked.refresh_from_db()
+    assert linked.city_fk == city
+    assert linked.department_id == city.department_id
+    assert linked.academy_id == city.department.academy_id
+
+    unknown.refresh_from_db()
+    assert unknown.city_fk is None
+    assert unknown.department_id is None
@@ -1,9 +1,16 @@
+from unittest import mock
+
 import pytest
-from django.contrib.gis.geos import Point
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
 from django.core.exceptions import ValidationError
 
 from accommodation.models import Accommodation
+from accommodation.queryset import AccommodationQuerySet
+from territories.models import Department
 from tests.account.factories import OwnerFactory
+from tests.territories.factories import AcademyFactory, DepartmentFactory
+
+from .factories import AccommodationFactory
 
 
 @pytest.mark.django_db
@@ -70,3 +77,110 @@ class TestAccommodation:
             "Un objet Résidence avec ces champs Owner et External reference existe déjà." in msg
             for msg in e.value.messages
         )
+
+    def test_save_computes_availability_priority(self):
+        acc = AccommodationFactory(nb_t1=5, nb_t1_available=2, nb_t2=3, nb_t2_available=1, accept_waiting_list=False)
+        assert acc.total_available == 3
+        assert acc.unknown_availibility is False
+        assert acc.priority == 1
+
+        acc.nb_t1_available = 0
+        acc.nb_t2_available = None
+        acc.accept_waiting_list = True
+        acc.save()
+        assert acc.total_available == 0
+        assert acc.unknown_availibility is False
+        assert acc.priority == 2
+
+        acc.nb_t1_available = None
+        acc.save()
+        assert acc.unknown_availibility is True
+        assert acc.priority == 3
+
+    def test_queryset_update_refreshes_availability_priority(self):
+        acc = AccommodationFactory(nb_t1=5, nb_t1_available=2, accept_waiting_list=False)
+        assert acc.priority == 1
+
+        Accommodation.objects.filter(nb_t1_available__gt=0).update(nb_t1_available=0)
+        acc.refresh_from_db()
+        assert acc.total_available == 0
+        assert acc.unknown_availibility is False
+        assert acc.priority == 5
+
+        Accommodation.objects.filter(pk=acc.pk).update(nb_t1_available=None, accept_waiting_list=False)
+        acc.refresh_from_db()
+        assert acc.unknown_availibility is True
+        assert acc.priority == 4
+
+    def test_queryset_update_of_fields_without_dependents_is_a_single_query(self, django_assert_num_queries):
+        AccommodationFactory.create_batch(2)
+        with django_assert_num_queries(1):
+            Accommodation.objects.update(name="Résidence")
+
+    def test_queryset_update_only_bumps_updated_at_when_touching(self):
+        acc = AccommodationFactory()
+        Accommodation.objects.filter(pk=acc.pk).update(images_count=2)
+        assert Accommodation.objects.get(pk=acc.pk).updated_at == acc.updated_at
+
+        Accommodation.objects.filter(pk=acc.pk).update(name="Résidence", touch=True)
+        assert Accommodation.objects.get(pk=acc.pk).updated_at > acc.updated_at
+
+    def test_save_computes_price_max_ignoring_zeros_and_nulls(self):
+        acc = AccommodationFactory(price_min_t1=300, price_max_t1=450, price_min_t2=0, price_max_t2=0)
+        assert acc.price_max == 450
+
+        acc.price_max_t1 = None
+        acc.save()
+        assert acc.price_max == 300
+
+        acc.price_min_t1 = 0
+        acc.save()
+        assert acc.price_max is None
+
+    def test_queryset_update_refreshes_price_max(self):
+        acc = AccommodationFactory(price_min_t1=300, price_max_t1=450)
+
+        Accommodation.objects.filter(pk=acc.pk).update(price_max_t1=600)
+        acc.refresh_from_db()
+        assert acc.price_max == 600
+
+        Accommodation.objects.filter(pk=acc.pk).update(price_min_t1=0, price_max_t1=0)
+        acc.refresh_from_db()
+        assert acc.price_max is None
+
+    def test_territories_follow_geom_and_boundaries(self):
+        paris_boundary = MultiPolygon(Polygon(((2.3, 48.8), (2.4, 48.8), (2.4, 48.9), (2.3, 48.9), (2.3, 48.8))))
+        acc = AccommodationFactory(geom=Point(2.35, 48.85))
+        assert acc.academy_id is None
+
+        academy = AcademyFactory(name="Académie de Paris", boundary=paris_boundary)
+        department = DepartmentFactory(code="75", academy=academy, boundary=paris_boundary)
+        acc.refresh_from_db()
+        assert acc.academy_id == academy.id
+        assert acc.department_id == department.id
+
+        acc.geom = Point(5.0, 45.0)
+        acc.save()
+        assert acc.academy_id is None
+        assert acc.department_id is None
+
+        Accommodation.objects.filter(pk=acc.pk).update(geom=Point(2.36, 48.86))
+        acc.refresh_from_db()
+        assert acc.academy_id == academy.id
+
+    def test_territories_only_refreshed_when_a_boundary_changes(self):
+        paris_boundary = MultiPolygon(Polygon(((2.3, 48.8), (2.4, 48.8), (2.4, 48.9), (2.3, 48.9), (2.3, 48.8))))
+        department = DepartmentFactory(code="75", boundary=paris_boundary)
+
+        with mock.patch.object(AccommodationQuerySet, "refresh_territories") as refresh_territories:
+            department.name = "Paris"
+            department.save()
+            department.save(update_fields=["name"])
+            # the boundary is deferred by default
+            Department.objects.get(pk=department.pk).save()
+            Department.objects.with_boundary().get(pk=department.pk).save()
+            refresh_territories.assert_not_called()
+
+            department.boundary = MultiPolygon(Polygon(((2.3, 48.8), (2.5, 48.8), (2.5, 48.9), (2.3, 48.8))))
+            department.save()
+            refresh_territories.assert_called_once()
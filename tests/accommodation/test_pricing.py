@@ -55,3 +55,15 @@ def test_price_bounds_returns_none_when_prices_are_zero():
 
     assert bounds["min_price"] is None
     assert bounds["max_price"] is None
+
+
+@pytest.mark.django_db
+def test_price_bounds_with_count_counts_accommodations_without_prices():
+    AccommodationFactory(price_min_t1=300, price_max_t1=450)
+    AccommodationFactory(price_min_t2=200, price_max_t2=700)
+    AccommodationFactory()
+
+    aggregates = PricingAggregates(AccommodationFactory._meta.model.objects.all())
+    summary = aggregates.price_bounds_with_count()
+
+    assert summary == {"count": 3, "min_price": 200, "max_price": 700}
@@ -0,0 +1,21 @@
+import pytest
+
+from accommodation.tiles import is_valid_tile, tile_bounds
+
+
+def test_tile_bounds():
+    assert tile_bounds(0, 0, 0) == pytest.approx((-180.0, -85.0511, 180.0, 85.0511), abs=1e-4)
+
+    xmin, ymin, xmax, ymax = tile_bounds(10, 518, 352)
+    assert xmin < 2.35 < xmax
+    assert ymin < 48.85 < ymax
+
+    buffered = tile_bounds(10, 518, 352, buffer=64)
+    assert buffered[0] < xmin and buffered[2] > xmax
+
+
+def test_is_valid_tile():
+    assert is_valid_tile(0, 0, 0)
+    assert is_valid_tile(10, 1023, 1023)
+    assert not is_valid_tile(1, 2, 0)
+    assert not is_valid_tile(23, 0, 0)
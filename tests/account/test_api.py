@@ -5,7 +5,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
-from account.models import Student, StudentRegistrationToken
+from account.models import Owner, Student, StudentRegistrationToken
 from account.services import build_password_reset_link
 from sesame.utils import get_token
 
@@ -20,6 +20,31 @@ class AccountAPITests(APITestCase):
         assert response.status_code == 200
         assert len(response.json()) == 5
 
+    def test_owner_image_view(self):
+        owner = OwnerFactory(image=b"\x89PNG\r\n\x1a\nlogo")
+        url = reverse("owner-image", kwargs={"slug": owner.slug})
+
+        response = self.client.get(url)
+        assert response.status_code == 200
+        assert response.content == b"\x89PNG\r\n\x1a\nlogo"
+        assert response["Content-Type"] == "image/png"
+        assert "max-age" in response["Cache-Control"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304
+
+    def test_owner_image_view_without_image(self):
+        owner = OwnerFactory(image=None)
+        response = self.client.get(reverse("owner-image", kwargs={"slug": owner.slug}))
+        assert response.status_code == 404
+
+    def test_owner_image_deferred_by_default(self):
+        owner = OwnerFactory()
+        loaded = Owner.objects.get(pk=owner.pk)
+        assert "image" in loaded.get_deferred_fields()
+        assert loaded.get_image_url().startswith(reverse("owner-image", kwargs={"slug": owner.slug}))
+        assert bytes(Owner.objects.with_image().get(pk=owner.pk).image) == b"fake_image_data"
+
     @patch("sib_api_v3_sdk.TransactionalEmailsApi.send_transac_email")
     def test_request_magic_link(self, mock_send_email):
         mock_send_email.return_value = None
@@ -0,0 +1,92 @@
+import uuid
+from io import BytesIO
+from unittest import mock
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+
+from account.forms import OwnerAdminForm
+from account.images import OWNER_IMAGE_VARIANTS, resize_image, upload_owner_image
+from account.models import Owner
+from account.serializers import OwnerSerializer
+
+from .factories import OwnerFactory
+
+
+def build_image(size, image_format="PNG"):
+    output = BytesIO()
+    Image.new("RGB", size, "red").save(output, format=image_format)
+    return output.getvalue()
+
+
+def fake_upload(binary_data, file_extension=".jpg", prefix="accommodations"):
+    return f"https://cdn.example.com/{prefix}/{uuid.uuid4().hex}{file_extension}"
+
+
+def test_resize_image():
+    resized, extension = resize_image(build_image((1000, 500), "JPEG"), 160)
+
+    assert extension == ".jpg"
+    with Image.open(BytesIO(resized)) as picture:
+        assert picture.size == (160, 80)
+
+
+def test_resize_image_not_an_image():
+    assert resize_image(b"<svg></svg>", 160) is None
+
+
+@mock.patch("account.images.upload_image_to_s3", side_effect=fake_upload)
+def test_upload_owner_image(mock_upload_image_to_s3):
+    image_urls = upload_owner_image(build_image((1000, 1000)))
+
+    assert set(image_urls) == {"original", *OWNER_IMAGE_VARIANTS}
+    assert len(set(image_urls.values())) == len(image_urls)
+    assert all(
+        url.startswith("https://cdn.example.com/owners/") and url.endswith(".png") for url in image_urls.values()
+    )
+
+
+@mock.patch("account.images.upload_image_to_s3", side_effect=fake_upload)
+def test_upload_owner_image_svg(mock_upload_image_to_s3):
+    image_urls = upload_owner_image(b"<svg></svg>")
+
+    assert mock_upload_image_to_s3.call_count == 1
+    assert image_urls["original"].endswith(".svg")
+    assert image_urls["small"] == image_urls["original"]
+
+
+@pytest.mark.django_db
+@mock.patch("account.images.upload_image_to_s3", side_effect=fake_upload)
+def test_admin_form_uploads_the_image(mock_upload_image_to_s3, client):
+    image = SimpleUploadedFile("logo.png", build_image((600, 300)), content_type="image/png")
+    form = OwnerAdminForm(data={"name": "Bailleur"}, files={"image_upload": image})
+    assert form.is_valid()
+    owner = Owner.objects.with_image().get(pk=form.save().pk)
+
+    assert owner.image is None
+    assert owner.image_urls["original"].startswith("https://cdn.example.com/owners/")
+
+    data = OwnerSerializer(owner).data
+    assert data["image_url"] == owner.image_urls["original"]
+    assert data["image_small_url"] == owner.image_urls["small"]
+
+    response = client.get(reverse("owner-image", kwargs={"slug": owner.slug}))
+    assert response.status_code == 302
+    assert response["Location"] == owner.image_urls["original"]
+
+
+@pytest.mark.django_db
+@mock.patch("account.images.upload_image_to_s3", side_effect=fake_upload)
+def test_upload_owner_images_to_s3_command(mock_upload_image_to_s3):
+    owner = OwnerFactory(image=build_image((300, 300)))
+    owner_without_image = OwnerFactory(image=None)
+
+    call_command("upload_owner_images_to_s3")
+
+    owner = Owner.objects.with_image().get(pk=owner.pk)
+    assert owner.image is None
+    assert set(owner.image_urls) == {"original", *OWNER_IMAGE_VARIANTS}
+    assert Owner.objects.get(pk=owner_without_image.pk).image_urls is None
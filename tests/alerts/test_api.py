@@ -1,4 +1,6 @@
 from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -323,3 +325,25 @@ class AccommodationAlertAPITests(APITestCase):
         response = self.client.post(url, payload, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "name" in response.json()
+
+    def test_list_counts_all_the_alerts_together(self):
+        department_boundary = MultiPolygon(Polygon(((20, 20), (20, 21), (21, 21), (21, 20), (20, 20))))
+        department = DepartmentFactory.create(boundary=department_boundary)
+        AccommodationFactory.create(geom=Point(20.5, 20.5), price_min_t1=400, nb_coliving_apartments=0)
+        AccommodationFactory.create(geom=Point(20.2, 20.8), price_min_t1=700, nb_coliving_apartments=3)
+        AccommodationFactory.create(geom=Point(22, 22), price_min_t1=400)
+        url = reverse("accommodation-alert-list")
+
+        alert_options = {"student": self.student, "department": department, "city": None, "academy": None}
+        AccommodationAlertFactory(**alert_options, has_coliving=None, is_accessible=None, max_price=None)
+        AccommodationAlertFactory(**alert_options, has_coliving=None, is_accessible=None, max_price=500)
+        with CaptureQueriesContext(connection) as two_alerts_queries:
+            response = self.client.get(url)
+        assert sorted(alert["count"] for alert in response.json()["results"]) == [1, 2]
+
+        AccommodationAlertFactory(**alert_options, has_coliving=True, is_accessible=None, max_price=None)
+        AccommodationAlertFactory(**alert_options, has_coliving=True, is_accessible=None, max_price=500)
+        with CaptureQueriesContext(connection) as four_alerts_queries:
+            response = self.client.get(url)
+        assert sorted(alert["count"] for alert in response.json()["results"]) == [0, 1, 1, 2]
+        assert len(four_alerts_queries) == len(two_alerts_queries)
@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from alerts.digests import send_alert_digests
+from alerts.models import AlertNotification
+from notifications.exceptions import EmailDeliveryError
+from notifications.gateways.fake_email_gateway import FakeEmailGateway
+from tests.accommodation.factories import AccommodationFactory
+from tests.account.factories import StudentFactory, UserFactory
+from tests.alerts.factories import AccommodationAlertFactory
+
+
+class AlertDigestTests(TestCase):
+    def setUp(self):
+        self.gateway = FakeEmailGateway()
+        self.student = StudentFactory(user=UserFactory(first_name="Ada", last_name="Lovelace"))
+        self.alert = AccommodationAlertFactory(student=self.student, name="Lyon")
+
+    def notify(self, alert, **kwargs):
+        accommodation = AccommodationFactory.create(**kwargs)
+        return AlertNotification.objects.create(alert=alert, accommodation=accommodation)
+
+    def digests(self):
+        return [kwargs["digest"] for kind, kwargs in self.gateway.sent if kind == "alert-digest"]
+
+    def test_pending_notifications_grouped_per_student_and_alert(self):
+        other_alert = AccommodationAlertFactory(student=self.student, name="Paris")
+        first = self.notify(self.alert, name="Résidence A", price_min_t1=400)
+        self.notify(self.alert, name="Résidence B")
+        self.notify(other_alert, name="Résidence C")
+        self.notify(AccommodationAlertFactory(), name="Résidence D")
+
+        self.assertEqual(send_alert_digests(self.gateway), 2)
+
+        digest = next(digest for digest in self.digests() if digest.to_email == self.student.user.email)
+        self.assertEqual(digest.to_name, "Ada Lovelace")
+        self.assertEqual(digest.params["NB_ACCOMMODATIONS"], 3)
+        self.assertEqual(
+            [(alert["NAME"], [a["NAME"] for a in alert["ACCOMMODATIONS"]]) for alert in digest.params["ALERTS"]],
+            [("Lyon", ["Résidence A", "Résidence B"]), ("Paris", ["Résidence C"])],
+        )
+        self.assertEqual(
+            digest.params["ALERTS"][0]["ACCOMMODATIONS"][0],
+            {
+                "NAME": "Résidence A",
+                "CITY": first.accommodation.city,
+                "PRICE_MIN": 400,
+                "URL": first.accommodation.get_absolute_url(),
+            },
+        )
+        self.assertFalse(AlertNotification.objects.filter(sent_at=None).exists())
+
+        # the notifications are only sent once
+        self.assertEqual(send_alert_digests(self.gateway), 0)
+
+    def test_one_gateway_call_per_batch_of_students(self):
+        for _ in range(3):
+            self.notify(AccommodationAlertFactory())
+
+        with mock.patch.object(self.gateway, "send_alert_digests", wraps=self.gateway.send_alert_digests) as send:
+            self.assertEqual(send_alert_digests(self.gateway, batch_size=2), 3)
+        self.assertEqual([len(call.kwargs["digests"]) for call in send.call_args_list], [2, 1])
+
+    def test_batches_capped_at_the_digests_of_one_request(self):
+        for _ in range(3):
+            self.notify(AccommodationAlertFactory())
+
+        with (
+            mock.patch("alerts.digests.MAX_DIGESTS_PER_SEND", 2),
+            mock.patch.object(self.gateway, "send_alert_digests", wraps=self.gateway.send_alert_digests) as send,
+        ):
+            self.assertEqual(send_alert_digests(self.gateway, batch_size=10), 3)
+        self.assertEqual([len(call.kwargs["digests"]) for call in send.call_args_list], [2, 1])
+
+    @override_settings(EMAIL_GATEWAY="brevo", BREVO_TEMPLATES_ID={"alert-digest": 0})
+    def test_command_skipped_without_template(self):
+        self.notify(self.alert)
+        with mock.patch("alerts.management.commands.send_alert_digests.send_alert_digests") as send:
+            call_command("send_alert_digests", stderr=mock.MagicMock())
+        send.assert_not_called()
+        self.assertEqual(AlertNotification.objects.filter(sent_at=None).count(), 1)
+
+    def test_notifications_skipped(self):
+        self.notify(self.alert, published=False)
+        self.notify(AccommodationAlertFactory(receive_notifications=False))
+
+        self.assertEqual(send_alert_digests(self.gateway), 0)
+        self.assertEqual(self.digests(), [])
+        self.assertEqual(AlertNotification.objects.filter(sent_at=None).count(), 1)
+
+    def test_notifications_stay_pending_when_the_gateway_fails(self):
+        self.notify(self.alert)
+        with mock.patch.object(self.gateway, "send_alert_digests", side_effect=EmailDeliveryError):
+            self.assertEqual(send_alert_digests(self.gateway), 0)
+        self.assertEqual(AlertNotification.objects.filter(sent_at=None).count(), 1)
+
+        self.assertEqual(send_alert_digests(self.gateway), 1)
+
+    def test_notifications_of_rejected_digests_not_retried(self):
+        other_student = StudentFactory(user=UserFactory(email="invalid"))
+        self.notify(self.alert)
+        self.notify(AccommodationAlertFactory(student=other_student))
+
+        def reject_invalid(*, digests):
+            self.gateway.sent += [("alert-digest", {"digest": d}) for d in digests if d.to_email != "invalid"]
+            return [d for d in digests if d.to_email == "invalid"]
+
+        with mock.patch.object(self.gateway, "send_alert_digests", side_effect=reject_invalid):
+            self.assertEqual(send_alert_digests(self.gateway), 1)
+        self.assertEqual([digest.to_email for digest in self.digests()], [self.student.user.email])
+        self.assertFalse(AlertNotification.objects.filter(sent_at=None).exists())
@@ -0,0 +1,137 @@
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.test import TestCase, TransactionTestCase
+
+from accommodation.models import Accommodation, ExternalSource
+from alerts.matching import queue_alert_notifications
+from alerts.models import NO_MAX_PRICE, AlertNotification
+from tests.accommodation.factories import AccommodationFactory
+from tests.alerts.factories import AccommodationAlertFactory
+from tests.territories.factories import AcademyFactory, CityFactory, DepartmentFactory
+
+
+class AlertMatchingTests(TestCase):
+    def setUp(self):
+        self.academy = AcademyFactory.create(name="Académie de La Réunion")
+        self.department = DepartmentFactory.create(name="La Réunion", code="974", academy=self.academy)
+        self.city = CityFactory.create(name="Saint-Denis", postal_codes=["97400"], department=self.department)
+        self.other_city = CityFactory.create(name="Saint-Pierre", postal_codes=["97410"], department=self.department)
+
+    def create_accommodation(self, **kwargs):
+        kwargs = {
+            "city_fk": self.city,
+            "geom": Point(-50, -50),
+            "price_min_t1": 400,
+            "nb_coliving_apartments": 0,
+            "nb_accessible_apartments": 0,
+            **kwargs,
+        }
+        return AccommodationFactory.create(**kwargs)
+
+    def create_alert(self, **kwargs):
+        kwargs = {
+            "city": None,
+            "department": None,
+            "academy": None,
+            "has_coliving": None,
+            "is_accessible": None,
+            "max_price": None,
+            **kwargs,
+        }
+        return AccommodationAlertFactory.create(**kwargs)
+
+    def matched_alerts(self, accommodation):
+        queue_alert_notifications([accommodation.pk])
+        return set(AlertNotification.objects.filter(accommodation=accommodation).values_list("alert", flat=True))
+
+    def test_match_keys(self):
+        alert = self.create_alert(city=self.city, department=self.department, max_price=500)
+        self.assertEqual((alert.match_territory, alert.match_max_price), (f"department:{self.department.pk}", 500))
+
+        alert.department = None
+        alert.max_price = None
+        alert.save(update_fields=["department", "max_price"])
+        alert.refresh_from_db()
+        self.assertEqual((alert.match_territory, alert.match_max_price), (f"city:{self.city.pk}", NO_MAX_PRICE))
+
+    def test_match_territories(self):
+        matching = {
+            self.create_alert(city=self.city).pk,
+            self.create_alert(department=self.department).pk,
+            self.create_alert(academy=self.academy).pk,
+            self.create_alert().pk,
+        }
+        self.create_alert(city=self.other_city)
+        self.create_alert(department=DepartmentFactory.create(code="976"))
+
+        self.assertEqual(self.matched_alerts(self.create_accommodation()), matching)
+
+    def test_match_criteria(self):
+        matching = {
+            self.create_alert(max_price=400).pk,
+            self.create_alert(has_coliving=True).pk,
+            self.create_alert(has_coliving=False, is_accessible=False).pk,
+        }
+        self.create_alert(max_price=399)
+        self.create_alert(is_accessible=True)
+        self.create_alert(receive_notifications=False)
+
+        self.assertEqual(self.matched_alerts(self.create_accommodation(nb_coliving_apartments=2)), matching)
+
+    def test_accommodation_without_price_only_matches_alerts_without_max_price(self):
+        alert = self.create_alert()
+        self.create_alert(max_price=1000)
+        self.assertEqual(self.matched_alerts(self.create_accommodation(price_min_t1=None)), {alert.pk})
+
+    def test_offline_and_crous_accommodations_are_not_matched(self):
+        self.create_alert()
+        self.assertEqual(self.matched_alerts(self.create_accommodation(published=False)), set())
+        self.assertEqual(self.matched_alerts(self.create_accommodation(geom=None)), set())
+
+        accommodation = self.create_accommodation()
+        ExternalSource.objects.create(accommodation=accommodation, source=ExternalSource.SOURCE_CROUS)
+        self.assertEqual(self.matched_alerts(accommodation), set())
+
+    def test_accommodation_queued_once_per_alert(self):
+        self.create_alert()
+        accommodation = self.create_accommodation()
+        self.assertEqual(queue_alert_notifications([accommodation.pk]), 1)
+        self.assertEqual(queue_alert_notifications([accommodation.pk]), 0)
+        self.assertEqual(AlertNotification.objects.filter(sent_at=None).count(), 1)
+
+    def test_matching_on_accommodation_writes(self):
+        alert = self.create_alert(city=self.city, max_price=500)
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation = self.create_accommodation(price_min_t1=600)
+        self.assertFalse(AlertNotification.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Accommodation.objects.filter(pk=accommodation.pk).update(price_min_t1=450)
+        self.assertEqual(
+            list(AlertNotification.objects.values_list("alert", "accommodation")), [(alert.pk, accommodation.pk)]
+        )
+
+
+class AlertMatchingAutocommitTests(TransactionTestCase):
+    def test_matching_after_the_territories_refresh(self):
+        # without transaction, the on_commit callbacks run as soon as they are registered
+        def boundary(x):
+            return MultiPolygon(Polygon(((x, 0), (x + 1, 0), (x + 1, 1), (x, 1), (x, 0))))
+
+        first_department = DepartmentFactory.create(code="01", boundary=boundary(0))
+        second_department = DepartmentFactory.create(code="02", boundary=boundary(10))
+        first_alert = AccommodationAlertFactory.create(
+            department=first_department, has_coliving=None, is_accessible=None, max_price=None
+        )
+        second_alert = AccommodationAlertFactory.create(
+            department=second_department, has_coliving=None, is_accessible=None, max_price=None
+        )
+
+        accommodation = AccommodationFactory.create(geom=Point(0.5, 0.5), city_fk=None)
+        self.assertEqual(accommodation.department_id, first_department.pk)
+        self.assertEqual(list(AlertNotification.objects.values_list("alert", flat=True)), [first_alert.pk])
+
+        accommodation.geom = Point(10.5, 0.5)
+        accommodation.save()
+        self.assertEqual(
+            set(AlertNotification.objects.values_list("alert", flat=True)), {first_alert.pk, second_alert.pk}
+        )
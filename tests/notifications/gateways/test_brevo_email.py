@@ -5,6 +5,7 @@ from sib_api_v3_sdk.rest import ApiException
 
 from notifications.exceptions import EmailDeliveryError
 from notifications.gateways.brevo_email_gateway import BrevoEmailGateway
+from notifications.types import DigestEmail
 from tests.account.factories import UserFactory
 
 
@@ -15,6 +16,7 @@ def brevo_settings(settings):
         "magic-link": 101,
         "student-validation": 202,
         "student-password-reset": 303,
+        "alert-digest": 404,
     }
     return settings
 
@@ -112,3 +114,62 @@ def test_send_raises_email_delivery_error_on_api_failure(brevo_settings):
     ):
         with pytest.raises(EmailDeliveryError):
             gateway.send_magic_link(to_user=user, magic_link="https://example.com/magic")
+
+
+@pytest.mark.django_db
+def test_send_alert_digests_one_request_per_batch_with_retries(brevo_settings):
+    brevo_settings.BREVO_BULK_MAX_RETRIES = 1
+    digests = [DigestEmail(to_email=f"{i}@example.com", to_name=f"Student {i}", params={"I": i}) for i in range(1001)]
+    gateway = BrevoEmailGateway()
+
+    with mock.patch(
+        "notifications.gateways.brevo_email_gateway.sib_api_v3_sdk.TransactionalEmailsApi.send_transac_email",
+        side_effect=[ApiException(status=429, reason="Too Many Requests"), None, None],
+    ) as mock_send:
+        gateway.send_alert_digests(digests=digests)
+
+    emails = [call.args[0] for call in mock_send.call_args_list]
+    assert [len(email.message_versions) for email in emails] == [1000, 1000, 1]
+    assert emails[0] is emails[1]
+    assert emails[2].template_id == 404
+    assert emails[2].message_versions[0].to == [{"email": "1000@example.com", "name": "Student 1000"}]
+    assert emails[2].message_versions[0].params == {"I": 1000}
+
+
+@pytest.mark.django_db
+def test_send_alert_digests_raises_after_the_retries(brevo_settings):
+    brevo_settings.BREVO_BULK_MAX_RETRIES = 2
+    gateway = BrevoEmailGateway()
+
+    with mock.patch(
+        "notifications.gateways.brevo_email_gateway.sib_api_v3_sdk.TransactionalEmailsApi.send_transac_email",
+        side_effect=ApiException(status=503, reason="Unavailable"),
+    ) as mock_send:
+        with pytest.raises(EmailDeliveryError):
+            gateway.send_alert_digests(digests=[DigestEmail(to_email="a@example.com", to_name="A", params={})])
+    assert mock_send.call_count == 3
+
+
+@pytest.mark.django_db
+def test_send_alert_digests_isolates_the_rejected_recipients(brevo_settings):
+    digests = [DigestEmail(to_email=f"{i}@example.com", to_name=f"Student {i}", params={}) for i in range(4)]
+    gateway = BrevoEmailGateway()
+
+    def reject_invalid(email):
+        if any(version.to[0]["email"] == "2@example.com" for version in email.message_versions):
+            raise ApiException(status=400, reason="Bad Request")
+
+    with mock.patch(
+        "notifications.gateways.brevo_email_gateway.sib_api_v3_sdk.TransactionalEmailsApi.send_transac_email",
+        side_effect=reject_invalid,
+    ) as mock_send:
+        assert gateway.send_alert_digests(digests=digests) == [digests[2]]
+
+    emails = [call.args[0] for call in mock_send.call_args_list]
+    assert [[version.to[0]["email"] for version in email.message_versions] for email in emails] == [
+        ["0@example.com", "1@example.com", "2@example.com", "3@example.com"],
+        ["0@example.com", "1@example.com"],
+        ["2@example.com", "3@example.com"],
+        ["2@example.com"],
+        ["3@example.com"],
+    ]
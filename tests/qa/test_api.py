@@ -32,6 +32,17 @@ class QuestionAnswerAPITests(APITestCase):
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["title_fr"], self.qa_global.title_fr)
 
+    def test_list_question_answers_global_conditional_get(self):
+        etag = self.client.get(reverse("questionanswers-global"))["ETag"]
+
+        response = self.client.get(reverse("questionanswers-global"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.qa_global.delete()
+        response = self.client.get(reverse("questionanswers-global"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [])
+
     def test_list_question_answers_by_territory(self):
         response = self.client.get(
             reverse("questionanswers-by-territory"), {"content_type": "city", "object_id": self.city.id}
@@ -4,11 +4,14 @@ from unittest.mock import patch
 import sib_api_v3_sdk
 from django.conf import settings
 from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from territories.models import Academy, City, Department
+from territories.pagination import TerritorySearchPagination
 from tests.accommodation.factories import AccommodationFactory
 from tests.territories.factories import AcademyFactory, CityFactory, DepartmentFactory
 
@@ -47,7 +50,10 @@ class TerritoryCombinedListAPITests(APITestCase):
                 name="Lyon", postal_codes=["69001", "69002", "69003"], department=self.department, average_income=30000
             )
 
-        AccommodationFactory.create(city=self.city.name, postal_code="69001", nb_total_apartments=12, price_min_t1=123)
+        with self.captureOnCommitCallbacks(execute=True):
+            AccommodationFactory.create(
+                city=self.city.name, city_fk=self.city, postal_code="69001", nb_total_apartments=12, price_min_t1=123
+            )
 
     def test_get_territory_combined_list_filtered(self):
         for search_term in ("rh", "rhone", "rhône", "Rhône"):
@@ -83,9 +89,31 @@ class TerritoryCombinedListAPITests(APITestCase):
                         }
                     ],
                     "cities": [],
+                    "next": {"academies": None, "departments": None, "cities": None},
                 },
             )
 
+    def test_get_territory_combined_list_limits_cities(self):
+        for index in range(TerritorySearchPagination.max_limit + 1):
+            CityFactory.create(name=f"Villeneuve-{index}", department=self.department)
+        url = reverse("territory-combined-list")
+
+        response = self.client.get(url + "?q=villeneuve")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["cities"]), TerritorySearchPagination.default_limit)
+
+        response = self.client.get(url + "?q=villeneuve&limit=1000")
+        self.assertEqual(len(response.json()["cities"]), TerritorySearchPagination.max_limit)
+        self.assertIsNone(response.json()["next"]["departments"])
+
+        response = self.client.get(response.json()["next"]["cities"])
+        self.assertEqual(len(response.json()["cities"]), 1)
+        self.assertIsNone(response.json()["next"]["cities"])
+
+    def test_get_territory_combined_list_invalid_cursor(self):
+        response = self.client.get(reverse("territory-combined-list") + "?q=lyon&cities_cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_get_academies_list(self):
         response = self.client.get(reverse("academies-list"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -118,6 +146,26 @@ class TerritoryCombinedListAPITests(APITestCase):
             ),
         )
 
+    def test_bbox_stored_on_boundary_change(self):
+        academy = AcademyFactory.create(name="Académie de test")
+        self.assertIsNone(academy.get_bbox())
+
+        academy.boundary = MultiPolygon(Polygon(((1, 2), (1, 4), (3, 4), (3, 2), (1, 2))))
+        academy.save(update_fields=["boundary"])
+        academy = Academy.objects.defer("boundary").get(pk=academy.pk)
+        self.assertEqual(academy.get_bbox(), {"xmin": 1.0, "ymin": 2.0, "xmax": 3.0, "ymax": 4.0})
+
+        academy.name = "Académie renommée"
+        academy.save()
+        self.assertEqual(Academy.objects.get(pk=academy.pk).get_bbox()["xmax"], 3.0)
+
+    def test_territory_lists_do_not_load_boundaries(self):
+        for url in (reverse("academies-list"), reverse("departments-list"), reverse("cities-list")):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertFalse(any("boundary" in query["sql"].split(" FROM ")[0] for query in context.captured_queries))
+
     def test_get_departments_list(self):
         response = self.client.get(reverse("departments-list"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -132,6 +180,16 @@ class TerritoryCombinedListAPITests(APITestCase):
             "Rhône not found in response",
         )
 
+    def test_get_departments_list_conditional_get(self):
+        response = self.client.get(reverse("departments-list"))
+        self.assertIn("max-age", response["Cache-Control"])
+
+        response = self.client.get(reverse("departments-list"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(reverse("departments-list"), {"unused": 1}, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_get_cities_list(self):
         response = self.client.get(reverse("cities-list"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -303,28 +361,32 @@ class CityDetailAPITest(APITestCase):
         else:
             self.saint_etienne = City.objects.get(slug="saint-etienne")
 
-        AccommodationFactory.create(
-            city=self.city.name,
-            postal_code="69001",
-            nb_total_apartments=15,
-            nb_coliving_apartments=2,
-            nb_t1=12,
-            nb_t1_bis=3,
-            nb_t2=6,
-            nb_t3=3,
-            nb_t4=1,
-            nb_t5=0,
-            nb_t6=0,
-            nb_t7_more=0,
-            price_min_t1=235,
-            price_min_t2=236,
-            price_min_t3=237,
-            price_min_t4=238,
-            price_min_t5=239,
-            price_min_t6=240,
-            price_min_t7_more=242,
-        )
-        AccommodationFactory.create(city=self.city.name, postal_code="69001", nb_total_apartments=12, price_min_t3=234)
+        with self.captureOnCommitCallbacks(execute=True):
+            AccommodationFactory.create(
+                city=self.city.name,
+                city_fk=self.city,
+                postal_code="69001",
+                nb_total_apartments=15,
+                nb_coliving_apartments=2,
+                nb_t1=12,
+                nb_t1_bis=3,
+                nb_t2=6,
+                nb_t3=3,
+                nb_t4=1,
+                nb_t5=0,
+                nb_t6=0,
+                nb_t7_more=0,
+                price_min_t1=235,
+                price_min_t2=236,
+                price_min_t3=237,
+                price_min_t4=238,
+                price_min_t5=239,
+                price_min_t6=240,
+                price_min_t7_more=242,
+            )
+            AccommodationFactory.create(
+                city=self.city.name, city_fk=self.city, postal_code="69001", nb_total_apartments=12, price_min_t3=234
+            )
 
     def tearDown(self):
         self.city.delete()
@@ -383,6 +445,31 @@ class CityDetailAPITest(APITestCase):
             },
         )
 
+    def test_get_city_details_conditional_get(self):
+        url = reverse("city-detail", kwargs={"slug": self.city.slug})
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.saint_etienne.name = "Saint-Étienne Métropole"
+        self.saint_etienne.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["nearby_cities"][0]["name"], "Saint-Étienne Métropole")
+
+        # the sync commands update the cities in bulk
+        etag = response["ETag"]
+        City.objects.filter(pk=self.city.pk).update(average_income=25000, touch=True)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["average_income"], 25000)
+
+    def test_boundaries_deferred_by_default(self):
+        self.assertIn("boundary", City.objects.get(pk=self.city.pk).get_deferred_fields())
+        self.assertIn("boundary", Department.objects.get(pk=self.city.department.pk).get_deferred_fields())
+        self.assertEqual(City.objects.with_boundary().get(pk=self.city.pk).get_deferred_fields(), set())
+
     def test_get_city_details_not_found(self):
         url = reverse("city-detail", kwargs={"slug": "unknown-city"})
         response = self.client.get(url)
@@ -0,0 +1,179 @@
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.cache import TERRITORIES_NAMESPACE, get_namespace_version
+from territories import autocomplete
+from territories.autocomplete import TerritoryIndex, get_territory_index, search_database
+from territories.models import City
+from territories.serializers import CitySearchSerializer, TerritoryCombinedSerializer
+from territories.signals import deferred_territories_invalidation
+from tests.territories.factories import AcademyFactory, CityFactory, DepartmentFactory
+
+BBOX = (1.0, 2.0, 3.0, 4.0)
+
+
+def city_row(pk, name, search_name, department_code="42"):
+    return (pk, name, f"city-{pk}", ["42000"], False, department_code, search_name, *BBOX)
+
+
+class TerritoryIndexTests(TestCase):
+    def setUp(self):
+        self.index = TerritoryIndex(
+            {
+                "academies": [(1, "Académie de Lyon", *BBOX), (2, "Académie de Paris", None, None, None, None)],
+                "departments": [(1, "Loire", "42", *BBOX), (2, "Rhône", "69", *BBOX)],
+                "cities": [
+                    city_row(1, "Saint-Étienne", "saint etienne"),
+                    city_row(2, "Saint-Étienne-de-Fontbellon", "saint etienne de fontbellon", "07"),
+                    city_row(3, "Saint-Malo", "saint malo", "35"),
+                    city_row(4, "Marseille", "marseille", "13"),
+                    city_row(5, "Famars", "famars", "59"),
+                    city_row(6, "Œuilly", "oeuilly", "02"),
+                ],
+            }
+        )
+
+    def city_names(self, query):
+        return [city["name"] for city in self.index.search(query)["cities"]]
+
+    def test_search_matches_all_tokens_whatever_the_spelling(self):
+        for query in ("Saint Etienne", "st-étienne", "SAINT ETIE", "st etie"):
+            self.assertEqual(self.city_names(query), ["Saint-Étienne", "Saint-Étienne-de-Fontbellon"])
+        self.assertEqual(self.city_names("oeuilly"), ["Œuilly"])
+        self.assertEqual(self.city_names("saint inconnu"), [])
+
+    def test_search_ranks_prefixes_first(self):
+        self.assertEqual(self.city_names("mars"), ["Marseille", "Famars"])
+
+    def test_short_tokens_match_word_prefixes(self):
+        self.assertEqual(self.city_names("ma"), ["Marseille", "Saint-Malo"])
+        self.assertEqual(
+            self.index.search("rh")["departments"],
+            [{"id": 2, "name": "Rhône", "code": "69", "bbox": {"xmin": 1.0, "ymin": 2.0, "xmax": 3.0, "ymax": 4.0}}],
+        )
+
+    def test_single_character_words_ignored(self):
+        self.assertEqual(self.city_names("m"), [])
+        self.assertEqual(self.city_names("m a"), [])
+        self.assertEqual(self.city_names("oeuilly a"), ["Œuilly"])
+
+    def test_search_layout(self):
+        result = self.index.search("academie")
+        self.assertEqual(
+            result["academies"],
+            [
+                {"id": 1, "name": "Académie de Lyon", "bbox": {"xmin": 1.0, "ymin": 2.0, "xmax": 3.0, "ymax": 4.0}},
+                {"id": 2, "name": "Académie de Paris", "bbox": None},
+            ],
+        )
+        self.assertEqual(result["next_offsets"], {"academies": None, "departments": None, "cities": None})
+
+    def test_search_layout_is_the_one_of_the_combined_serializer(self):
+        self.assertIsInstance(TerritoryCombinedSerializer().fields["cities"].child, CitySearchSerializer)
+        city = self.index.search("marseille")["cities"][0]
+        self.assertEqual(set(city), set(CitySearchSerializer().fields))
+
+    def test_search_limit_and_offsets(self):
+        result = self.index.search("saint", limit=2)
+        self.assertEqual([city["id"] for city in result["cities"]], [3, 1])
+        self.assertEqual(result["next_offsets"]["cities"], 2)
+
+        result = self.index.search("saint", limit=2, offsets={"cities": 2})
+        self.assertEqual([city["id"] for city in result["cities"]], [2])
+        self.assertIsNone(result["next_offsets"]["cities"])
+
+        result = self.index.search("", limit=2, offsets={"cities": 4})
+        self.assertEqual([city["slug"] for city in result["cities"]], ["city-5", "city-6"])
+        self.assertIsNone(result["next_offsets"]["cities"])
+
+
+class TerritoryAutocompleteAPITests(APITestCase):
+    def setUp(self):
+        academy = AcademyFactory.create(name="Académie de Clermont-Ferrand")
+        self.department = DepartmentFactory.create(
+            name="Haute-Loire",
+            code="43",
+            academy=academy,
+            boundary=MultiPolygon(Polygon(((4, 45), (4, 46), (5, 46), (5, 45), (4, 45)))),
+        )
+        self.city = CityFactory.create(name="Le Puy-en-Velay", department=self.department)
+
+    @override_settings(TERRITORY_AUTOCOMPLETE_CHECK_INTERVAL=60)
+    def test_search_without_sql_once_the_index_is_built(self):
+        url = reverse("territory-combined-list")
+        self.client.get(url + "?q=haute-loire")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url + "?q=haute-loire")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["departments"],
+            [{"id": self.department.id, "name": "Haute-Loire", "code": "43", "bbox": self.department.get_bbox()}],
+        )
+
+        # only the accommodation stats of the returned cities are read
+        with self.assertNumQueries(1):
+            response = self.client.get(url + "?q=puy velay")
+        self.assertEqual(
+            response.json()["cities"],
+            [
+                {
+                    "id": self.city.id,
+                    "name": "Le Puy-en-Velay",
+                    "slug": self.city.slug,
+                    "postal_codes": self.city.postal_codes,
+                    "bbox": self.city.get_bbox(),
+                    "popular": self.city.popular,
+                    "nb_total_apartments": None,
+                    "price_min": None,
+                    "department_code": "43",
+                }
+            ],
+        )
+
+    def test_index_rebuilt_on_territory_writes(self):
+        index = get_territory_index()
+        self.assertIs(get_territory_index(), index)
+
+        CityFactory.create(name="Yssingeaux", department=self.department)
+        self.assertEqual(
+            [city["name"] for city in get_territory_index().search("yssing")["cities"]],
+            ["Yssingeaux"],
+        )
+
+        City.objects.get(name="Yssingeaux").delete()
+        self.assertEqual(get_territory_index().search("yssing")["cities"], [])
+
+    def test_index_rebuilt_from_the_database_version(self):
+        get_territory_index()
+        # the namespace version is shared through the cache, the index doesn't depend on it
+        with deferred_territories_invalidation():
+            version = get_namespace_version(TERRITORIES_NAMESPACE)
+            CityFactory.create(name="Yssingeaux", department=self.department)
+            self.assertEqual(get_namespace_version(TERRITORIES_NAMESPACE), version)
+            self.assertEqual(
+                [city["name"] for city in get_territory_index().search("yssing")["cities"]],
+                ["Yssingeaux"],
+            )
+        self.assertNotEqual(get_namespace_version(TERRITORIES_NAMESPACE), version)
+
+    def test_search_database_while_the_first_index_is_built(self):
+        autocomplete._state["building"] = True
+        self.assertIsNone(get_territory_index())
+
+        response = self.client.get(reverse("territory-combined-list") + "?q=puy velay")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([city["id"] for city in response.json()["cities"]], [self.city.id])
+
+    def test_search_database_has_the_layout_of_the_index(self):
+        CityFactory.create(name="Le Puy-Notre-Dame", department=self.department)
+        index = get_territory_index()
+        for query in ("haute-loire", "velay", "clermont"):
+            self.assertEqual(search_database(query), index.search(query))
+
+        result = search_database("puy", limit=1)
+        self.assertEqual(len(result["cities"]), 1)
+        self.assertEqual(result["next_offsets"], {"academies": None, "departments": None, "cities": 1})
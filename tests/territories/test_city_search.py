@@ -1,5 +1,5 @@
 import pytest
-from territories.search import build_combined_territory_queryset, normalize_city_search
+from territories.search import build_city_queryset, build_combined_territory_queryset, normalize_city_search
 from tests.territories.factories import AcademyFactory, CityFactory, DepartmentFactory
 from territories.models import Academy, Department, City
 
@@ -145,9 +145,37 @@ class TestCityFTSSearch:
             City.objects.get(name="Famars")
         except City.DoesNotExist:
             CityFactory.create(name="Famars", department=territory_seed["department"])
-        result = build_combined_territory_queryset("mars")
+        cities = list(build_combined_territory_queryset("mars")["cities"])
 
-        assert result["cities"].first().rank == 1.0
-        assert result["cities"].first().name == "Marseille"
-        assert result["cities"].last().rank == 0.0
-        assert result["cities"].last().name == "Famars"
+        assert cities[0].rank == 1.0
+        assert cities[0].name == "Marseille"
+        assert cities[-1].rank == 0.0
+        assert cities[-1].name == "Famars"
+
+    def test_city_search_fields_follow_the_name(self, territory_seed):
+        city = CityFactory.create(name="Ste-Œuvre", department=territory_seed["department"])
+        assert City.objects.get(pk=city.pk).search_name == "saint oeuvre"
+
+        city.name = "Saint-Étienne-de-Œuvre"
+        city.save(update_fields=["name"])
+        assert City.objects.get(pk=city.pk).search_name == "saint etienne de oeuvre"
+        assert list(build_city_queryset("oeuvre").values_list("pk", flat=True)) == [city.pk]
+
+    def test_city_search_short_query_matches_prefixes(self, territory_seed):
+        CityFactory.create(name="Sainghin", department=territory_seed["department"])
+        CityFactory.create(name="Issy", department=territory_seed["department"])
+
+        names = list(build_city_queryset("sa").values_list("name", flat=True))
+
+        assert "Sainghin" in names
+        assert "Issy" not in names
+
+    def test_city_search_is_limited(self, territory_seed):
+        for name in ("Saint-Chamond", "Saint-Genest-Lerpt", "Saint-Just-Saint-Rambert"):
+            CityFactory.create(name=name, department=territory_seed["department"])
+
+        first_page = list(build_city_queryset("saint", limit=2).values_list("name", flat=True))
+        second_page = list(build_city_queryset("saint", limit=2, offset=2).values_list("name", flat=True))
+
+        assert len(first_page) == 2
+        assert first_page + second_page == list(build_city_queryset("saint").values_list("name", flat=True))[:4]
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import pytest
+
+from territories.geo_api import GeoApiCacheStore, GeoApiClient, get_department_code
+from territories.models import GeoApiCache
+
+pytestmark = pytest.mark.django_db
+
+MELUN = {"nom": "Melun", "code": "77288", "codesPostaux": ["77000"], "codeDepartement": "77", "population": 40000}
+VAUX = {"nom": "Vaux-le-Pénil", "code": "77487", "codesPostaux": ["77000"], "codeDepartement": "77"}
+
+
+@pytest.fixture
+def client():
+    return GeoApiClient(timeout=1, cache=GeoApiCacheStore(ttl=timedelta(days=30)))
+
+
+def test_department_code():
+    assert [get_department_code(code) for code in ("77000", "20000", "20200", "97400")] == ["77", "2A", "2B", "974"]
+
+
+def test_lookups_cached(client, mock_requests):
+    communes = mock_requests.get("https://geo.api.gouv.fr/communes/?codePostal=77000&nom=Melun", json=[MELUN])
+    nowhere = mock_requests.get("https://geo.api.gouv.fr/communes/?codePostal=00000", json=[])
+
+    for _ in range(2):
+        assert client.fetch_commune("77000", "Melun", strict_mode=True) == MELUN
+        assert client.fetch_commune("00000", "Nowhere", strict_mode=True) is None
+
+    assert (communes.call_count, nowhere.call_count) == (1, 1)
+    assert GeoApiCache.objects.get(key="codePostal:00000:nowhere").communes == []
+
+
+def test_departments_prefetched(client, mock_requests):
+    department = mock_requests.get("https://geo.api.gouv.fr/departements/77/communes", json=[MELUN, VAUX])
+
+    assert client.prefetch_departments(["77"]) == 1
+    assert client.prefetch_departments(["77"]) == 0
+    assert department.call_count == 1
+
+    calls = mock_requests.call_count
+    assert client.fetch_commune("77000", "VAUX LE PENIL", strict_mode=True) == VAUX
+    assert client.fetch_commune("77288") == MELUN
+    assert client.fetch_commune("77999", "Nowhere", strict_mode=True) is None
+    assert mock_requests.call_count == calls
+
+
+def test_failures_not_cached(client, mock_requests):
+    mock_requests.get("https://geo.api.gouv.fr/communes/", status_code=503)
+
+    assert client.fetch_commune("77000", "Melun", strict_mode=True) is None
+    assert not GeoApiCache.objects.exists()
+
+
+def test_postal_codes_shared_by_departments(client, mock_requests):
+    other = {"nom": "Autre", "code": "91001", "codesPostaux": ["77000"], "codeDepartement": "91"}
+    mock_requests.get("https://geo.api.gouv.fr/departements/77/communes", json=[MELUN])
+    mock_requests.get("https://geo.api.gouv.fr/departements/91/communes", json=[other])
+
+    assert client.prefetch_departments(["77", "91"]) == 2
+    assert GeoApiCache.objects.get(key="codePostal:77000:").communes == [other, MELUN]
@@ -1,38 +1,48 @@
 import pytest
-from geopy.exc import GeocoderServiceError, GeocoderTimedOut
 
+from territories.geocoding import FakeGeocodingBackend, GeocodingService, GeocodingUnavailable
 from territories.management.commands.geo_base_command import GeoBaseCommand
 
 pytestmark = pytest.mark.django_db
 
 
-def test_geocode_retries_then_succeeds(monkeypatch):
+def test_geocode_retries_then_succeeds():
     command = GeoBaseCommand()
-    monkeypatch.setattr("territories.management.commands.geo_base_command.sleep", lambda *_: None)
 
     attempts = {"count": 0}
 
-    class StubGeolocator:
-        def geocode(self, _address):
+    class StubBackend:
+        def search(self, _address):
             attempts["count"] += 1
             if attempts["count"] < 3:
-                raise GeocoderTimedOut("504 timeout")
+                raise GeocodingUnavailable("504 timeout")
             return {"ok": True}
 
-    command.geolocator = StubGeolocator()
+    command.geocoding_service = GeocodingService(StubBackend(), retry_delay=0)
 
     assert command._geocode("10 rue de la paix") == {"ok": True}
     assert attempts["count"] == 3
 
 
-def test_geocode_returns_none_after_retries(monkeypatch):
+def test_geocode_returns_none_after_retries():
     command = GeoBaseCommand()
-    monkeypatch.setattr("territories.management.commands.geo_base_command.sleep", lambda *_: None)
 
-    class StubGeolocator:
-        def geocode(self, _address):
-            raise GeocoderServiceError("service unavailable")
+    class StubBackend:
+        def search(self, _address):
+            raise GeocodingUnavailable("service unavailable")
 
-    command.geolocator = StubGeolocator()
+    command.geocoding_service = GeocodingService(StubBackend(), retries=2, retry_delay=0)
 
-    assert command._geocode("10 rue de la paix", retries=2) is None
+    assert command._geocode("10 rue de la paix") is None
+
+
+def test_geocode_many_geocodes_each_address_once():
+    command = GeoBaseCommand()
+    backend = FakeGeocodingBackend(features={"nowhere": None})
+    command.geocoding_service = GeocodingService(backend, max_workers=4)
+
+    locations = command._geocode_many(["10 rue de la paix", "nowhere", "10 rue de la paix", "1 place d'Italie"])
+
+    assert sorted(backend.queries) == ["1 place d'Italie", "10 rue de la paix", "nowhere"]
+    assert locations["nowhere"] is None
+    assert (locations["10 rue de la paix"].latitude, locations["10 rue de la paix"].longitude) == (48.85, 2.35)
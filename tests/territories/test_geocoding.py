@@ -0,0 +1,133 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from territories.geocoding import (
+    BANGeocodingBackend,
+    FakeGeocodingBackend,
+    GeocodeCacheStore,
+    GeocodingService,
+    GeocodingUnavailable,
+)
+from territories.models import GeocodeCache
+
+pytestmark = pytest.mark.django_db
+
+FEATURE = {
+    "type": "Feature",
+    "geometry": {"type": "Point", "coordinates": [2.6604, 48.5396]},
+    "properties": {
+        "label": "53 Rue Louis Charles Vernin 77000 Melun",
+        "score": 0.9,
+        "name": "53 Rue Louis Charles Vernin",
+        "postcode": "77000",
+        "city": "Melun",
+    },
+}
+
+
+def test_ban_search(mock_requests):
+    mock_requests.get(
+        "https://api-adresse.data.gouv.fr/search?q=53+Rue+Louis+Charles+Vernin%2C+Melun",
+        json={"type": "FeatureCollection", "features": [FEATURE]},
+    )
+    mock_requests.get("https://api-adresse.data.gouv.fr/search?q=nowhere", json={"features": []})
+    service = GeocodingService(BANGeocodingBackend(timeout=1, pool_size=2), max_workers=2)
+
+    locations = service.geocode_many(["53 Rue Louis Charles Vernin, Melun", "nowhere"])
+
+    location = locations["53 Rue Louis Charles Vernin, Melun"]
+    assert (location.latitude, location.longitude) == (48.5396, 2.6604)
+    assert location.raw["properties"]["postcode"] == "77000"
+    assert locations["nowhere"] is None
+
+
+def test_ban_search_retried_when_unavailable(mock_requests):
+    mock_requests.get(
+        "https://api-adresse.data.gouv.fr/search",
+        [{"status_code": 503}, {"json": {"type": "FeatureCollection", "features": [FEATURE]}}],
+    )
+    service = GeocodingService(BANGeocodingBackend(timeout=1, pool_size=1), retry_delay=0)
+
+    assert service.geocode("53 Rue Louis Charles Vernin, Melun").raw["properties"]["city"] == "Melun"
+    assert mock_requests.call_count == 2
+
+
+def test_ban_csv_batch(mock_requests):
+    mock_requests.post(
+        "https://api-adresse.data.gouv.fr/search/csv/",
+        text=(
+            "address,latitude,longitude,result_label,result_score,result_name,result_postcode,result_city\n"
+            '"53 Rue Louis Charles Vernin, Melun",48.5396,2.6604,53 Rue Louis Charles Vernin 77000 Melun,0.9,'
+            "53 Rue Louis Charles Vernin,77000,Melun\n"
+            "nowhere,,,,,,,\n"
+        ),
+    )
+    service = GeocodingService(BANGeocodingBackend(timeout=1, pool_size=1), use_csv=True)
+
+    locations = service.geocode_many(["53 Rue Louis Charles Vernin, Melun", "nowhere"])
+
+    assert mock_requests.call_count == 1
+    assert locations["53 Rue Louis Charles Vernin, Melun"].raw == FEATURE
+    assert locations["nowhere"] is None
+
+
+def cached_service(backend):
+    return GeocodingService(
+        backend, retry_delay=0, cache=GeocodeCacheStore(ttl=timedelta(days=90), negative_ttl=timedelta(days=7))
+    )
+
+
+def test_cached_addresses_not_geocoded_again():
+    backend = FakeGeocodingBackend(features={"nowhere": None})
+    service = cached_service(backend)
+
+    locations = service.geocode_many(["53 Rue Louis Charles Vernin, Melun", "nowhere"])
+    assert locations["nowhere"] is None
+    assert GeocodeCache.objects.get(address="53 rue louis charles vernin melun").properties["name"] == (
+        "53 Rue Louis Charles Vernin, Melun"
+    )
+
+    locations = service.geocode_many(["53 rue Louis-Charles Vernin Melun", "nowhere", "Lyon"])
+    assert backend.queries == ["53 Rue Louis Charles Vernin, Melun", "nowhere", "Lyon"]
+    location = locations["53 rue Louis-Charles Vernin Melun"]
+    assert (location.latitude, location.longitude) == (48.85, 2.35)
+    assert location.raw["properties"]["name"] == "53 Rue Louis Charles Vernin, Melun"
+    assert locations["nowhere"] is None
+
+
+def test_cache_expiry():
+    backend = FakeGeocodingBackend(features={"nowhere": None})
+    service = cached_service(backend)
+    service.geocode_many(["Melun", "nowhere"])
+
+    GeocodeCache.objects.filter(address="nowhere").update(fetched_at=timezone.now() - timedelta(days=8))
+    service.geocode_many(["Melun", "nowhere"])
+    assert backend.queries == ["Melun", "nowhere", "nowhere"]
+
+    GeocodeCache.objects.update(fetched_at=timezone.now() - timedelta(days=91))
+    service.geocode("Melun")
+    assert backend.queries == ["Melun", "nowhere", "nowhere", "Melun"]
+
+
+def test_unavailable_geocoder_not_cached():
+    class UnavailableBackend(FakeGeocodingBackend):
+        def search(self, address):
+            super().search(address)
+            raise GeocodingUnavailable("down")
+
+    assert cached_service(UnavailableBackend()).geocode("Melun") is None
+    assert not GeocodeCache.objects.exists()
+
+
+def test_rejected_csv_batch_not_cached(mock_requests):
+    mock_requests.post("https://api-adresse.data.gouv.fr/search/csv/", status_code=413)
+    service = GeocodingService(
+        BANGeocodingBackend(timeout=1, pool_size=1),
+        use_csv=True,
+        cache=GeocodeCacheStore(ttl=timedelta(days=90), negative_ttl=timedelta(days=7)),
+    )
+
+    assert service.geocode_many(["Melun", "nowhere"]) == {"Melun": None, "nowhere": None}
+    assert not GeocodeCache.objects.exists()
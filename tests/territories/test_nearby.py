@@ -0,0 +1,45 @@
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.core.management import call_command
+from django.test import TestCase
+
+from territories.models import City, NearbyCity
+from territories.nearby import get_nearby_cities, refresh_nearby_cities
+
+from .factories import CityFactory
+
+
+def square(x, y, size=2):
+    return MultiPolygon(Polygon(((x, y), (x + size, y), (x + size, y + size), (x, y + size), (x, y))))
+
+
+class NearbyCitiesTests(TestCase):
+    def setUp(self):
+        self.center = CityFactory.create(name="Centre", boundary=square(10, 10))
+        self.near = CityFactory.create(name="Proche", department=self.center.department, boundary=square(13, 10))
+        self.far = CityFactory.create(name="Lointaine", department=self.center.department, boundary=square(30, 10))
+        self.without_boundary = CityFactory.create(name="Sans contour", department=self.center.department)
+
+    def test_centroid_follows_the_boundary(self):
+        self.assertEqual(City.objects.get(pk=self.center.pk).centroid, Point(11, 11, srid=4326))
+
+        self.center.boundary = square(20, 20)
+        self.center.save(update_fields=["boundary"])
+        self.assertEqual(City.objects.get(pk=self.center.pk).centroid, Point(21, 21, srid=4326))
+        self.assertIsNone(City.objects.get(pk=self.without_boundary.pk).centroid)
+
+    def test_nearby_cities_from_the_centroids(self):
+        self.assertEqual(get_nearby_cities(self.center, count=2), [self.near, self.far])
+        self.assertEqual(get_nearby_cities(self.without_boundary), [])
+
+    def test_nearby_cities_from_the_table(self):
+        self.assertEqual(refresh_nearby_cities(count=2), 6)
+        self.assertEqual(
+            list(NearbyCity.objects.filter(city=self.far).order_by("rank").values_list("nearby_city", "rank")),
+            [(self.near.pk, 1), (self.center.pk, 2)],
+        )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_nearby_cities(self.center), [self.near, self.far])
+
+        call_command("refresh_nearby_cities")
+        self.assertEqual(NearbyCity.objects.count(), 6)
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from accommodation.models import Accommodation
+from territories.models import CityAccommodationStats
+from territories.stats import refresh_all_city_stats
+from tests.accommodation.factories import AccommodationFactory
+from tests.territories.factories import CityFactory
+
+
+class CityAccommodationStatsTests(TestCase):
+    def setUp(self):
+        self.city = CityFactory.create(name="Lyon", postal_codes=["69001", "69002"])
+        self.other_city = CityFactory.create(name="Paris", postal_codes=["75001"])
+
+    def test_stats_refreshed_on_accommodation_save_and_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation = AccommodationFactory.create(
+                city_fk=self.city, nb_t1=4, nb_t2=2, price_min_t1=300, price_min_t2=250
+            )
+            AccommodationFactory.create(city_fk=self.city, nb_t1=1, price_min_t1=200)
+            AccommodationFactory.create(city_fk=self.other_city, nb_t1=10, price_min_t1=100)
+
+        stats = CityAccommodationStats.objects.get(city=self.city)
+        self.assertEqual(stats.nb_accommodations, 2)
+        self.assertEqual(stats.nb_t1, 5)
+        self.assertEqual(stats.price_min, 200)
+
+        accommodation.city_fk = self.other_city
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation.save()
+        stats.refresh_from_db()
+        self.assertEqual(stats.nb_accommodations, 1)
+        self.assertEqual(stats.nb_t1, 1)
+        self.assertEqual(CityAccommodationStats.objects.get(city=self.other_city).nb_t1, 14)
+
+        Accommodation.objects.filter(city_fk=self.city).delete()
+        self.assertFalse(CityAccommodationStats.objects.filter(city=self.city).exists())
+
+    def test_stats_not_refreshed_when_unchanged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation = AccommodationFactory.create(city_fk=self.city, nb_t1=4, price_min_t1=300)
+
+        with mock.patch("territories.signals.refresh_city_stats") as refresh_city_stats:
+            accommodation.name = "Résidence renommée"
+            accommodation.nb_t1 = 4
+            with self.captureOnCommitCallbacks(execute=True):
+                accommodation.save()
+            refresh_city_stats.assert_not_called()
+
+            accommodation.price_min_t1 = 250
+            with self.captureOnCommitCallbacks(execute=True):
+                accommodation.save()
+            refresh_city_stats.assert_called_once_with({self.city.id})
+
+    def test_stats_refreshed_on_queryset_update(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            AccommodationFactory.create(city_fk=self.city, nb_t1=4, price_min_t1=300)
+
+        Accommodation.objects.filter(city_fk=self.city).update(price_min_t1=150)
+        self.assertEqual(CityAccommodationStats.objects.get(city=self.city).price_min, 150)
+
+        Accommodation.objects.filter(city_fk=self.city).update(city_fk=self.other_city)
+        self.assertFalse(CityAccommodationStats.objects.filter(city=self.city).exists())
+        self.assertEqual(CityAccommodationStats.objects.get(city=self.other_city).price_min, 150)
+
+    def test_refresh_all_city_stats(self):
+        AccommodationFactory.create(city_fk=self.city, nb_t1=4, price_min_t1=300)
+        AccommodationFactory.create(city_fk=self.city, nb_t1=2, price_min_t1=280)
+        AccommodationFactory.create(city_fk=None, nb_t1=1, price_min_t1=100)
+        CityAccommodationStats.objects.create(city=self.other_city, nb_accommodations=1)
+
+        self.assertEqual(refresh_all_city_stats(), 1)
+
+        stats = CityAccommodationStats.objects.get(city=self.city)
+        self.assertEqual(stats.nb_accommodations, 2)
+        self.assertEqual(stats.nb_t1, 6)
+        self.assertEqual(stats.price_min, 280)
+        self.assertFalse(CityAccommodationStats.objects.filter(city=self.other_city).exists())